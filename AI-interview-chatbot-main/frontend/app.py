@@ -11,9 +11,11 @@ import json
 import os
 import sys
 from datetime import datetime
-from src.sentiment_analysis import analyze_sentiment
 from src.human_handoff import handle_human_handoff
-from src.evaluation import evaluate_answer
+# Served by the shared scoring service when SCORING_SERVICE_URL is set
+from src.scoring_client import (
+    analyze_sentiment, evaluate_answer, evaluate_answers, precompute_model_answer_embeddings
+)
 from src.data_loader import load_questions
 
 # Add components directory to path
@@ -53,6 +55,8 @@ def main():
 
     show_header()
     questions = load_questions()
+    # Cheap after the first run: only new or edited model answers are encoded
+    precompute_model_answer_embeddings(questions)
 
     # Stage 1: Candidate Form
     if st.session_state['interview_state']['current_stage'] == 'form':
@@ -89,7 +93,8 @@ def handle_interview_flow(questions):
             # Evaluate answer
             score, feedback = evaluate_answer(
                 answer=answer,
-                model_answer=question['model_answer']
+                model_answer=question['model_answer'],
+                question_id=question.get('id')
             )
 
             # Sentiment analysis
@@ -108,6 +113,7 @@ def handle_interview_flow(questions):
             # Store results
             st.session_state['interview_state']['scores'].append(score)
             st.session_state['interview_state']['conversation_history'].append({
+                "question_id": question.get('id'),
                 "question": question['text'],
                 "category": question['category'],
                 "model_answer": question['model_answer'],
@@ -138,7 +144,15 @@ def handle_interview_flow(questions):
         st.experimental_rerun()
 
 def show_final_feedback():
-    scores = st.session_state['interview_state']['scores']
+    history = st.session_state['interview_state']['conversation_history']
+    # One batched call; answers scored during the interview come back from the memo
+    results = evaluate_answers(
+        [(entry['candidate_answer'], entry['model_answer']) for entry in history],
+        question_ids=[entry.get('question_id') for entry in history]
+    )
+    for entry, (score, feedback) in zip(history, results):
+        entry['score'], entry['feedback'] = score, feedback
+    scores = [score for score, _ in results]
     total_score = sum(scores)
     avg_score = total_score / len(scores) if scores else 0
 
@@ -174,7 +188,7 @@ def show_final_feedback():
 
     # Optionally, show conversation history for review
     with st.expander("View Your Interview Transcript"):
-        for entry in st.session_state['interview_state']['conversation_history']:
+        for entry in history:
             st.markdown(f"**Q:** {entry['question']}")
             st.markdown(f"**Your Answer:** {entry['candidate_answer']}")
             st.markdown(f"**Score:** {entry['score']}  |  **Feedback:** {entry['feedback']}  |  **Sentiment:** {entry['sentiment']}")
@@ -2,6 +2,7 @@
 
 import pandas as pd
 from datetime import datetime
+from src.evaluation import EVAL_BATCH_SIZE, evaluate_answers
 
 def load_interaction_data(data_path="data/interaction_logs.csv"):
     """
@@ -90,6 +91,36 @@ def time_per_question_type(df):
         return df.groupby('question_type')['duration_seconds'].mean().reset_index()
     return pd.DataFrame()
 
+def rescore_interactions(df, questions, batch_size=EVAL_BATCH_SIZE):
+    """
+    Re-score logged answers against the current model answers in one batched pass.
+    Rows whose question is not in the catalog keep their logged score and feedback.
+
+    Args:
+        df (DataFrame): Interaction log, as returned by load_interaction_data.
+        questions (list): Question catalog, as returned by load_questions.
+
+    Returns:
+        DataFrame: Copy of ``df`` with updated 'score' and 'feedback' columns.
+    """
+    catalog = {q['text']: q for q in questions}
+    df = df.copy()
+    rows = [i for i, question in df['question'].items() if question in catalog]
+    if not rows:
+        return df
+    results = evaluate_answers(
+        [(str(df.at[i, 'answer']) if pd.notna(df.at[i, 'answer']) else "", catalog[df.at[i, 'question']]['model_answer'])
+         for i in rows],
+        batch_size=batch_size,
+        question_ids=[catalog[df.at[i, 'question']].get('id') for i in rows]
+    )
+    df['score'] = df['score'].astype(float) if 'score' in df else float('nan')
+    df['feedback'] = df['feedback'].astype(object) if 'feedback' in df else None
+    for i, (score, feedback) in zip(rows, results):
+        df.at[i, 'score'] = score
+        df.at[i, 'feedback'] = feedback
+    return df
+
 # Example usage (for testing/demo)
 if __name__ == "__main__":
     df = load_interaction_data()
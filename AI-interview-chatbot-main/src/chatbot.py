@@ -1,7 +1,6 @@
 # src/chatbot.py
 
-from src.evaluation import evaluate_answer
-from src.sentiment_analysis import analyze_sentiment
+from src.scoring_client import analyze_sentiment, evaluate_answer
 from src.human_handoff import handle_human_handoff
 from src.analytics import log_interaction  # Optional: for analytics logging
 import streamlit as st
@@ -19,7 +18,7 @@ def run_chatbot(
     Orchestrates the chatbot interview flow.
 
     Args:
-        questions (list): List of dicts with keys: 'text', 'category', 'model_answer'
+        questions (list): List of dicts with keys: 'id', 'text', 'category', 'model_answer'
         candidate_data (dict): Candidate info
         current_index (int): Current question index
         scores (list): List of previous scores
@@ -45,7 +44,7 @@ def run_chatbot(
 
     if submitted and answer.strip():
         # Evaluate answer
-        score, feedback = evaluate_answer(answer, question['model_answer'])
+        score, feedback = evaluate_answer(answer, question['model_answer'], question_id=question.get('id'))
         sentiment_result = analyze_sentiment(answer)
         sentiment = sentiment_result['label']
 
@@ -85,6 +84,7 @@ def run_chatbot(
         # Update state
         scores.append(score)
         conversation_history.append({
+            "question_id": question.get('id'),
             "question": question['text'],
             "category": question['category'],
             "model_answer": question['model_answer'],
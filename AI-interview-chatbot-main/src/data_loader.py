@@ -1,8 +1,13 @@
 # src/data_loader.py
 
+import hashlib
 import json
 import os
 
+def question_id(category, text):
+    """Stable id of a catalog question, derived from its category and text."""
+    return f"{category.lower()}-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}"
+
 def load_questions(
     technical_path="data/technical_questions.json",
     behavioral_path="data/behavioral_questions.json",
@@ -12,7 +17,7 @@ def load_questions(
     Load and combine technical, behavioral, and HR questions from JSON files.
 
     Returns:
-        questions (list): List of dicts with keys: 'category', 'text', 'model_answer'
+        questions (list): List of dicts with keys: 'id', 'category', 'text', 'model_answer'
     """
     questions = []
 
@@ -23,12 +28,16 @@ def load_questions(
             return []
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        # Assume each entry has 'question' and 'model_answer' keys
+        # Some banks wrap the list, e.g. {"questions": [...]}
+        if isinstance(data, dict):
+            data = next(iter(data.values()), [])
+        # Each entry has a 'question' and a 'model_answer' (or 'answer') key
         return [
             {
+                "id": question_id(category_name, q.get("question", "")),
                 "category": category_name,
                 "text": q.get("question", ""),
-                "model_answer": q.get("model_answer", "")
+                "model_answer": q.get("model_answer") or q.get("answer", "")
             }
             for q in data
         ]
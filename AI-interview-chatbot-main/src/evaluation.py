@@ -1,41 +1,193 @@
 # src/evaluation.py
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
+MODEL_NAME = 'all-MiniLM-L6-v2'
+# "torch" (SentenceTransformer) or "onnx" (int8-quantized ONNX Runtime, see src/onnx_encoder.py)
+ENCODER_BACKEND = os.getenv("EVAL_ENCODER_BACKEND", "torch").lower()
+ENCODER_BACKENDS = ("torch", "onnx")
+if ENCODER_BACKEND not in ENCODER_BACKENDS:
+    raise ValueError(f"EVAL_ENCODER_BACKEND must be one of {ENCODER_BACKENDS}, not {ENCODER_BACKEND!r}")
+# Keys stored embeddings, so vectors from different backends are never mixed
+ENCODER_NAME = f"{MODEL_NAME}-onnx-int8" if ENCODER_BACKEND == "onnx" else MODEL_NAME
+# Model-answer embeddings persist here, one file per encoder
+EMBEDDING_CACHE_DIR = os.getenv("EVAL_EMBEDDING_CACHE_DIR", os.path.join("data", ".embedding_cache"))
+# Scored submissions kept in memory, so Streamlit reruns never re-score
+SCORE_CACHE_SIZE = int(os.getenv("EVAL_SCORE_CACHE_SIZE", "4096"))
+# Texts per SentenceTransformer forward pass
+EVAL_BATCH_SIZE = int(os.getenv("EVAL_BATCH_SIZE", "32"))
+
+def prepare_encoder():
+    """
+    Export the ONNX encoder if it is selected and not exported yet.
+    Call before starting workers or serving; get_model never exports.
+    """
+    if ENCODER_BACKEND == "onnx":
+        from src.onnx_encoder import ensure_exported
+        ensure_exported(MODEL_NAME)
+
 # Efficient model loading (singleton pattern)
 _model = None
 def get_model():
     global _model
     if _model is None:
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
+        if ENCODER_BACKEND == "onnx":
+            from src.onnx_encoder import load_encoder
+            _model = load_encoder(MODEL_NAME)
+        else:
+            # torch is only imported when the PyTorch backend is used
+            from sentence_transformers import SentenceTransformer
+            _model = SentenceTransformer(MODEL_NAME)
     return _model
 
-def evaluate_answer(answer, model_answer):
+def text_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+class ModelAnswerEmbeddings:
+    """
+    Embeddings of the catalog's model answers, computed once and kept on disk.
+
+    Entries are keyed by the hash of the model-answer text; the file is named
+    after the encoder, so switching models never mixes vectors. Editing an
+    answer in the question JSON only re-embeds that answer.
+    """
+
+    def __init__(self, cache_dir=EMBEDDING_CACHE_DIR, model_name=ENCODER_NAME):
+        self.path = os.path.join(cache_dir, f"model_answers-{model_name.replace('/', '_')}.npz")
+        self._vectors = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._vectors is None:
+            self._vectors = {}
+            if os.path.exists(self.path):
+                with np.load(self.path) as data:
+                    self._vectors = dict(zip(data["keys"].tolist(), data["vectors"]))
+        return self._vectors
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        keys = list(self._vectors)
+        np.savez(tmp_path, keys=np.array(keys), vectors=np.stack([self._vectors[key] for key in keys]))
+        os.replace(tmp_path, self.path)
+
+    def get(self, model_answer):
+        with self._lock:
+            return self._load().get(text_hash(model_answer))
+
+    def precompute(self, model_answers, model=None, batch_size=EVAL_BATCH_SIZE):
+        """Embed, in batches, the model answers not stored yet; returns how many were added"""
+        with self._lock:
+            vectors = self._load()
+            missing = list(dict.fromkeys(a for a in model_answers if text_hash(a) not in vectors))
+            if not missing:
+                return 0
+            encoded = (model or get_model()).encode(missing, batch_size=batch_size)
+            for model_answer, vector in zip(missing, encoded):
+                vectors[text_hash(model_answer)] = np.asarray(vector, dtype=np.float32)
+            self._save()
+            return len(missing)
+
+_model_answer_embeddings = ModelAnswerEmbeddings()
+_scores = OrderedDict()
+_scores_lock = threading.Lock()
+
+def precompute_model_answer_embeddings(questions):
+    """
+    Embed the model answers of a loaded question catalog ahead of any submission.
+
+    Args:
+        questions (list): Question dicts as returned by load_questions.
+
+    Returns:
+        added (int): Number of model answers that had to be encoded.
+    """
+    return _model_answer_embeddings.precompute([q["model_answer"] for q in questions if q.get("model_answer")])
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+def evaluate_answer(answer, model_answer, question_id=None):
     """
     Evaluate a candidate's answer against the model answer using semantic similarity.
 
+    Only the candidate's answer is encoded; the model answer's embedding comes
+    from the precomputed table. Results are memoized per encoder, question,
+    model answer and candidate answer.
+
     Args:
         answer (str): Candidate's answer.
         model_answer (str): Reference/model answer.
+        question_id (str): Optional question id, part of the memo key.
 
     Returns:
         score (float): Score between 0 and 5.
         feedback (str): Textual feedback.
     """
-    if not answer or not answer.strip():
-        return 0.0, "No answer provided."
+    return evaluate_answers([(answer, model_answer)], question_ids=[question_id])[0]
 
-    model = get_model()
-    embeddings = model.encode([answer, model_answer])
-    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+def evaluate_answers(pairs, batch_size=EVAL_BATCH_SIZE, question_ids=None):
+    """
+    Evaluate many (answer, model_answer) pairs in one call.
 
-    # Map similarity (0 to 1) to score (0 to 5)
-    score = round(similarity * 5, 2)
+    Candidate answers not already scored are encoded in batches of
+    ``batch_size``; similarities are the row-wise dot products of the
+    normalized answer and model-answer matrices.
+
+    Args:
+        pairs (list): (candidate answer, model answer) tuples.
+        batch_size (int): Texts per encoder forward pass.
+        question_ids (list): Optional question id per pair, for memoization.
+
+    Returns:
+        results (list): (score, feedback) per pair, in input order.
+    """
+    pairs = list(pairs)
+    question_ids = question_ids or [None] * len(pairs)
+    results = [None] * len(pairs)
+    pending = {}
+
+    with _scores_lock:
+        for i, ((answer, model_answer), question_id) in enumerate(zip(pairs, question_ids)):
+            if not answer or not answer.strip():
+                results[i] = (0.0, "No answer provided.")
+                continue
+            # The model answer's hash keeps edited catalog answers from hitting stale scores
+            key = (ENCODER_NAME, question_id, text_hash(model_answer), text_hash(answer))
+            if key in _scores:
+                _scores.move_to_end(key)
+                results[i] = _scores[key]
+            else:
+                pending[i] = key
+    if not pending:
+        return results
+
+    model = get_model()
+    model_answers = [pairs[i][1] for i in pending]
+    _model_answer_embeddings.precompute(model_answers, model=model, batch_size=batch_size)
+    references = np.stack([_model_answer_embeddings.get(model_answer) for model_answer in model_answers])
+    answers = list(dict.fromkeys(pairs[i][0] for i in pending))
+    encoded = dict(zip(answers, model.encode(answers, batch_size=batch_size)))
+    embeddings = np.stack([encoded[pairs[i][0]] for i in pending])
+    similarities = np.einsum("ij,ij->i", normalize_rows(embeddings), normalize_rows(references))
 
-    feedback = generate_feedback(answer, score, model_answer)
-    return score, feedback
+    with _scores_lock:
+        for (i, key), similarity in zip(pending.items(), similarities):
+            # Map similarity (0 to 1) to score (0 to 5)
+            score = round(float(similarity) * 5, 2)
+            results[i] = (score, generate_feedback(pairs[i][0], score, pairs[i][1]))
+            _scores[key] = results[i]
+        while len(_scores) > SCORE_CACHE_SIZE:
+            _scores.popitem(last=False)
+    return results
 
 def generate_feedback(candidate_answer, score, model_answer):
     """
@@ -3,29 +3,36 @@
 import streamlit as st
 from transformers import pipeline
 
-@st.cache_resource
-def load_model():
-    """Cache the Hugging Face model to avoid reloading on every interaction"""
+GENERATION_KWARGS = {
+    "max_new_tokens": 100,
+    "temperature": 0.7,
+    "do_sample": True,
+    "truncation": True
+}
+
+def create_pipeline():
+    """Load the Hugging Face model; shared by the Streamlit cache and the scoring service"""
     return pipeline(
         "text2text-generation", 
         model="google/flan-t5-base",
         device_map="auto"  # Automatically uses GPU if available
     )
 
+@st.cache_resource
+def load_model():
+    """Cache the Hugging Face model to avoid reloading on every interaction"""
+    return create_pipeline()
+
+def generation_prompt(question: str) -> str:
+    return f"Answer this interview-related question concisely: {question}"
+
 def nlp_response_fn(question: str) -> str:
     """
     Generate an AI answer to a user question using a local Hugging Face model.
     Uses Streamlit's caching for efficient model loading.
     """
     pipe = load_model()
-    prompt = f"Answer this interview-related question concisely: {question}"
-    response = pipe(
-        prompt,
-        max_new_tokens=100,
-        temperature=0.7,
-        do_sample=True,
-        truncation=True
-    )
+    response = pipe(generation_prompt(question), **GENERATION_KWARGS)
     return response[0]['generated_text'].strip()
 
 # Example usage
@@ -0,0 +1,185 @@
+# src/onnx_encoder.py
+"""
+Int8-quantized ONNX Runtime backend for the answer encoder.
+
+The sentence-transformers model's transformer is exported to ONNX once, its
+weights quantized to int8 with dynamic (per-batch) activation quantization,
+and run on CPU with ONNX Runtime. Mean pooling and normalization match
+all-MiniLM-L6-v2's SentenceTransformer pipeline. Select it with
+EVAL_ENCODER_BACKEND=onnx. The model is exported ahead of serving, either
+explicitly or by evaluation.prepare_encoder at startup, never on a request:
+
+    python -m src.onnx_encoder --export
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+ONNX_MODEL_DIR = os.getenv("EVAL_ONNX_MODEL_DIR", os.path.join("data", ".onnx"))
+# ONNX Runtime intra-op threads per session (0: one per physical core)
+ONNX_THREADS = int(os.getenv("EVAL_ONNX_THREADS", "0"))
+# Tokens per text, as in the SentenceTransformer model's max_seq_length
+MAX_SEQ_LENGTH = 256
+
+MODEL_FILE = "model.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+CONFIG_FILE = "encoder.json"
+INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+def model_dir(model_name, root=ONNX_MODEL_DIR):
+    return os.path.join(root, f"{model_name.replace('/', '_')}-int8")
+
+def _publish(tmp_dir, out_dir, replace=True):
+    """
+    Rename a finished export into place. With ``replace=False`` a complete
+    export another process published first is kept and ``tmp_dir`` dropped.
+    """
+    if os.path.exists(os.path.join(out_dir, MODEL_FILE)) and not replace:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+    if os.path.exists(out_dir):
+        # Readers between the two renames see no model rather than half of one
+        old_dir = f"{out_dir}.{os.getpid()}.old"
+        os.rename(out_dir, old_dir)
+        os.rename(tmp_dir, out_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+        os.rename(tmp_dir, out_dir)
+
+def export_quantized(model_name, out_dir, replace=True):
+    """
+    Export a sentence-transformers model to ONNX and quantize its weights to int8.
+    Needs torch and transformers; the exported encoder only needs onnxruntime.
+
+    The export is built in a temporary directory next to ``out_dir`` and
+    renamed into place, so a concurrent reader never loads a partial model.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    tokenizer = AutoTokenizer.from_pretrained(hub_name)
+    model = AutoModel.from_pretrained(hub_name).eval()
+
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(out_dir)}-", dir=parent)
+    try:
+        tokenizer.save_pretrained(tmp_dir)
+        sample = tokenizer(["Tell me about yourself."], return_tensors="pt")
+        fp32_path = os.path.join(tmp_dir, "model.fp32.onnx")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in INPUT_NAMES),
+                fp32_path,
+                input_names=list(INPUT_NAMES),
+                output_names=["last_hidden_state"],
+                dynamic_axes={name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES + ("last_hidden_state",)},
+                opset_version=14
+            )
+        quantize_dynamic(fp32_path, os.path.join(tmp_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+        with open(os.path.join(tmp_dir, CONFIG_FILE), "w") as f:
+            json.dump({"model_name": model_name, "max_seq_length": MAX_SEQ_LENGTH, "quantization": "int8-dynamic"}, f)
+        _publish(tmp_dir, out_dir, replace=replace)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+def ensure_exported(model_name, root=ONNX_MODEL_DIR):
+    """
+    Export ``model_name`` unless it already is; returns its directory.
+    Call once before starting workers or serving requests, not per request.
+    """
+    path = model_dir(model_name, root)
+    if not os.path.exists(os.path.join(path, MODEL_FILE)):
+        export_quantized(model_name, path, replace=False)
+    return path
+
+class OnnxSentenceEncoder:
+    """
+    SentenceTransformer-compatible ``encode`` over an exported ONNX model.
+
+    Texts are sorted by length before batching, as SentenceTransformer does,
+    so each batch is padded only to its own longest text.
+    """
+
+    def __init__(self, path, threads=ONNX_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        max_seq_length = MAX_SEQ_LENGTH
+        config_path = os.path.join(path, CONFIG_FILE)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                max_seq_length = json.load(f).get("max_seq_length", MAX_SEQ_LENGTH)
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            os.path.join(path, MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        hidden = self.session.run(None, {name: inputs[name] for name in INPUT_NAMES if name in self.input_names})[0]
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts, batch_size=32):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        batches = [
+            self._encode_batch([texts[i] for i in order[start:start + batch_size]])
+            for start in range(0, len(texts), batch_size)
+        ]
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings[0] if single else embeddings
+
+def load_encoder(model_name, root=ONNX_MODEL_DIR, threads=ONNX_THREADS):
+    """The quantized encoder for ``model_name``, exported beforehand by ensure_exported."""
+    path = model_dir(model_name, root)
+    if not os.path.exists(os.path.join(path, MODEL_FILE)):
+        raise FileNotFoundError(f"No ONNX encoder in {path}; export it with: python -m src.onnx_encoder")
+    return OnnxSentenceEncoder(path, threads=threads)
+
+# Example usage: export ahead of deployment
+if __name__ == "__main__":
+    import argparse
+
+    from src.evaluation import MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Export the answer encoder to int8 ONNX.")
+    parser.add_argument("--export", action="store_true", help="Export even if a model is already there")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--out-dir", default=ONNX_MODEL_DIR)
+    args = parser.parse_args()
+
+    path = model_dir(args.model, args.out_dir)
+    if args.export:
+        export_quantized(args.model, path)
+    else:
+        ensure_exported(args.model, args.out_dir)
+    encoder = OnnxSentenceEncoder(path)
+    print(f"Exported {args.model} to {path}; embedding size {encoder.encode('hello').shape[0]}")
@@ -8,16 +8,29 @@ from langchain.chains import RetrievalQA
 import os
 import json
 
+try:
+    # Shared on-disk embedding cache and index factory; only importable from the repository root
+    from backend.services.embedding_cache import CachedEmbeddings
+    from backend.services.vector_index import build_vector_store_from_texts
+except ImportError:
+    CachedEmbeddings = None
+    build_vector_store_from_texts = None
+
 # 1. Indexing Phase: Ingest, Chunk, Embed, Store
 
 def build_vector_store_from_json(
     json_paths,
     embedding_model_name="sentence-transformers/all-MiniLM-L6-v2",
     chunk_size=500,
-    chunk_overlap=50
+    chunk_overlap=50,
+    use_embedding_cache=True,
+    embeddings=None
 ):
     """
     Load questions and model answers from JSON files, chunk, embed, and store in FAISS vector DB.
+    Embeddings are read through the shared embedding cache when it is available,
+    so only new or edited chunks are embedded. Pass ``embeddings`` to use another
+    embeddings object instead of the HuggingFace model (e.g. a benchmark stub).
     Returns the FAISS vector store object.
     """
     # Load all questions and answers
@@ -39,20 +52,26 @@ def build_vector_store_from_json(
         chunks.extend(splitter.split_text(doc))
     
     # Embedding
-    embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
+    if embeddings is None:
+        embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
+        if use_embedding_cache and CachedEmbeddings is not None:
+            embeddings = CachedEmbeddings(embeddings, model_name=embedding_model_name)
     
-    # Build FAISS vector store
+    # Build FAISS vector store (flat, HNSW or IVF by corpus size when available)
+    if build_vector_store_from_texts is not None:
+        return build_vector_store_from_texts(chunks, embeddings)
     vector_store = FAISS.from_texts(chunks, embedding=embeddings)
     return vector_store
 
 # 2. Retrieval and Generation Phase
 
-def get_rag_chain(vector_store, openai_api_key=None, llm_temperature=0.2):
+def get_rag_chain(vector_store, openai_api_key=None, llm_temperature=0.2, llm=None):
     """
     Create a RetrievalQA chain using the vector store and an LLM.
     """
     # Use OpenAI LLM (or swap for HuggingFacePipeline if preferred)
-    llm = OpenAI(openai_api_key=openai_api_key, temperature=llm_temperature)
+    if llm is None:
+        llm = OpenAI(openai_api_key=openai_api_key, temperature=llm_temperature)
     retriever = vector_store.as_retriever()
     rag_chain = RetrievalQA.from_chain_type(
         llm=llm,
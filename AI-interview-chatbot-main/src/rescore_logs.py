@@ -0,0 +1,172 @@
+# src/rescore_logs.py
+"""
+Re-score the interaction log against the current model answers and scoring.
+
+Run after changing the thresholds in generate_feedback or the encoder. The log
+is streamed in chunks that are scored across a process pool, each worker
+loading the model once; re-scored rows are appended to the output in input
+order and a checkpoint is saved after every chunk, so an interrupted run
+resumes where it stopped:
+
+    python -m src.rescore_logs
+    python -m src.rescore_logs --input data/interaction_logs.csv --workers 8 --chunk-size 20000
+    python -m src.rescore_logs --restart
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import pandas as pd
+
+from src.analytics import rescore_interactions
+from src.data_loader import load_questions
+from src.evaluation import (
+    ENCODER_NAME, EVAL_BATCH_SIZE, get_model, precompute_model_answer_embeddings, prepare_encoder
+)
+
+logger = logging.getLogger(__name__)
+
+# Per worker process, set by init_worker
+_questions = None
+
+def init_worker(questions):
+    """Load the encoder once per worker; model-answer embeddings come from the disk table."""
+    global _questions
+    _questions = questions
+    get_model()
+
+def rescore_chunk(chunk, batch_size):
+    rescored = rescore_interactions(chunk, _questions, batch_size=batch_size)
+    rescored.insert(rescored.columns.get_loc('score'), 'previous_score', chunk['score'] if 'score' in chunk else None)
+    return rescored
+
+class InlineExecutor:
+    """Runs jobs in the calling process, for a single worker."""
+
+    def __init__(self, questions):
+        init_worker(questions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+def make_executor(questions, workers):
+    if workers <= 1:
+        return InlineExecutor(questions)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        # Spawned, not forked: the parent may hold an initialized encoder
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(questions,)
+    )
+
+def checkpoint_path(output_path):
+    return f"{output_path}.checkpoint.json"
+
+def input_signature(input_path):
+    stat = os.stat(input_path)
+    return {"input": os.path.abspath(input_path), "size": stat.st_size, "mtime": stat.st_mtime, "model": ENCODER_NAME}
+
+def load_checkpoint(input_path, output_path):
+    """Rows already re-scored and the output size after them; (0, 0) if starting over."""
+    try:
+        with open(checkpoint_path(output_path), "r") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0, 0
+    if checkpoint.get("signature") != input_signature(input_path) or not os.path.exists(output_path):
+        logger.warning("Checkpoint does not match %s; starting over", input_path)
+        return 0, 0
+    return checkpoint["rows"], checkpoint["output_bytes"]
+
+def save_checkpoint(input_path, output_path, rows, output_bytes):
+    path = checkpoint_path(output_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"signature": input_signature(input_path), "rows": rows, "output_bytes": output_bytes}, f)
+    os.replace(tmp_path, path)
+
+def rescore_log(
+    input_path,
+    output_path,
+    questions,
+    workers=os.cpu_count() or 1,
+    chunk_size=10000,
+    batch_size=EVAL_BATCH_SIZE,
+    restart=False
+):
+    """
+    Re-score ``input_path`` into ``output_path``, resuming from its checkpoint.
+
+    Returns:
+        rows (int): Rows re-scored by this run.
+    """
+    done, output_bytes = (0, 0) if restart else load_checkpoint(input_path, output_path)
+    if done:
+        logger.info("Resuming after %d rows", done)
+    # Export the encoder and embed the model answers here, so workers only read them
+    prepare_encoder()
+    precompute_model_answer_embeddings(questions)
+
+    chunks = pd.read_csv(input_path, chunksize=chunk_size, skiprows=range(1, done + 1))
+    rows, started_at = 0, time.perf_counter()
+    with open(output_path, "r+b" if done else "wb") as out, make_executor(questions, workers) as pool:
+        # Drop anything written after the last checkpoint
+        out.truncate(output_bytes)
+        out.seek(output_bytes)
+        in_flight = deque()
+
+        def write_next():
+            nonlocal rows
+            rescored = in_flight.popleft().result()
+            rescored.to_csv(out, header=out.tell() == 0, index=False)
+            out.flush()
+            rows += len(rescored)
+            save_checkpoint(input_path, output_path, done + rows, out.tell())
+            elapsed = time.perf_counter() - started_at
+            logger.info("Re-scored %d rows (%.0f rows/s)", done + rows, rows / elapsed if elapsed else 0)
+
+        for chunk in chunks:
+            in_flight.append(pool.submit(rescore_chunk, chunk, batch_size))
+            # Bounded read-ahead keeps memory flat on multi-million-row logs
+            if len(in_flight) >= 2 * workers:
+                write_next()
+        while in_flight:
+            write_next()
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score the interaction log with the current scoring.")
+    parser.add_argument("--input", default="data/interaction_logs.csv")
+    parser.add_argument("--output", default="data/interaction_logs.rescored.csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per job sent to a worker")
+    parser.add_argument("--batch-size", type=int, default=EVAL_BATCH_SIZE, help="Answers per encoder forward pass")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    started_at = time.perf_counter()
+    count = rescore_log(
+        args.input, args.output, load_questions(),
+        workers=args.workers, chunk_size=args.chunk_size, batch_size=args.batch_size, restart=args.restart
+    )
+    elapsed = time.perf_counter() - started_at
+    print(f"Re-scored {count} rows into {args.output} in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} rows/s)")
@@ -0,0 +1,84 @@
+# src/scoring_client.py
+"""
+Scoring calls for the Streamlit app, served by the shared scoring service when
+SCORING_SERVICE_URL is set and run inline otherwise.
+
+If the service cannot be reached or times out, calls fall back to inline
+scoring and the service is skipped for SCORING_RETRY_SECONDS before it is
+tried again, so an interview never fails because the service is down. An
+HTTP error only sends that one call inline.
+"""
+
+import logging
+import os
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SCORING_SERVICE_URL = os.getenv("SCORING_SERVICE_URL", "").rstrip("/")
+SCORING_TIMEOUT_SECONDS = float(os.getenv("SCORING_TIMEOUT_SECONDS", "30"))
+SCORING_RETRY_SECONDS = float(os.getenv("SCORING_RETRY_SECONDS", "30"))
+
+_session = requests.Session()
+_unavailable_until = 0.0
+
+def _post(path, payload):
+    """Results from the service, or None to score inline."""
+    global _unavailable_until
+    if not SCORING_SERVICE_URL or time.monotonic() < _unavailable_until:
+        return None
+    try:
+        response = _session.post(f"{SCORING_SERVICE_URL}{path}", json=payload, timeout=SCORING_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()["results"]
+    except (requests.ConnectionError, requests.Timeout) as exc:
+        logger.warning("Scoring service unavailable (%s); scoring inline for %ss", exc, SCORING_RETRY_SECONDS)
+        _unavailable_until = time.monotonic() + SCORING_RETRY_SECONDS
+        return None
+    except (requests.RequestException, ValueError, KeyError) as exc:
+        # A rejected or malformed reply concerns this call only; keep using the service
+        logger.warning("Scoring service failed %s (%s); scoring this call inline", path, exc)
+        return None
+
+# The inline paths import their models' modules lazily, so a frontend that
+# uses the service never loads torch, the encoder or flan-t5 itself.
+
+def evaluate_answers(pairs, question_ids=None):
+    """(score, feedback) per (answer, model_answer) pair; see evaluation.evaluate_answers."""
+    pairs = list(pairs)
+    question_ids = question_ids or [None] * len(pairs)
+    results = _post("/evaluate", {"items": [
+        {"answer": answer or "", "model_answer": model_answer or "", "question_id": question_id}
+        for (answer, model_answer), question_id in zip(pairs, question_ids)
+    ]})
+    if results is not None:
+        return [(result["score"], result["feedback"]) for result in results]
+    from src.evaluation import evaluate_answers as evaluate_inline
+    return evaluate_inline(pairs, question_ids=question_ids)
+
+def evaluate_answer(answer, model_answer, question_id=None):
+    return evaluate_answers([(answer, model_answer)], question_ids=[question_id])[0]
+
+def analyze_sentiment(text):
+    results = _post("/sentiment", {"texts": [text if isinstance(text, str) else ""]})
+    if results is not None:
+        return results[0]
+    from src.sentiment_analysis import analyze_sentiment as analyze_inline
+    return analyze_inline(text)
+
+def generate_answer(question):
+    results = _post("/generate", {"questions": [question]})
+    if results is not None:
+        return results[0]
+    from src.nlp_processor import nlp_response_fn
+    return nlp_response_fn(question)
+
+def precompute_model_answer_embeddings(questions):
+    # The service embeds model answers on first use and keeps them on disk
+    if SCORING_SERVICE_URL:
+        return 0
+    from src.evaluation import precompute_model_answer_embeddings as precompute_inline, prepare_encoder
+    prepare_encoder()
+    return precompute_inline(questions)
@@ -0,0 +1,234 @@
+# src/scoring_service.py
+"""
+Local scoring service shared by every Streamlit session on a host.
+
+Holds the answer encoder, the VADER analyzer and the flan-t5 pipeline once,
+instead of once per Streamlit server process. Requests from all sessions go
+into per-model queues; a micro-batcher drains each queue into one batched
+model call, waiting at most SCORING_MAX_WAIT_MS for more jobs once the first
+arrives. Point the frontends at it with SCORING_SERVICE_URL (see
+src/scoring_client.py):
+
+    uvicorn src.scoring_service:app --host 127.0.0.1 --port 8765
+    python -m src.scoring_service
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from src.evaluation import EVAL_BATCH_SIZE, evaluate_answers, get_model, prepare_encoder
+from src.sentiment_analysis import analyze_sentiment
+
+logger = logging.getLogger(__name__)
+
+# Jobs per batched model call
+SCORING_MAX_BATCH = int(os.getenv("SCORING_MAX_BATCH", str(EVAL_BATCH_SIZE)))
+# How long a batch waits to fill up after its first job
+SCORING_MAX_WAIT_MS = float(os.getenv("SCORING_MAX_WAIT_MS", "10"))
+# Generation is slow and memory hungry, so its batches are smaller
+GENERATE_MAX_BATCH = int(os.getenv("SCORING_GENERATE_MAX_BATCH", "8"))
+
+class MicroBatcher:
+    """
+    Collects jobs submitted concurrently and runs them through ``batch_fn`` together.
+
+    ``batch_fn`` takes a list of jobs and returns one result per job. It runs
+    on a dedicated thread, so a model only ever sees one batch at a time and
+    the event loop keeps accepting jobs meanwhile.
+    """
+
+    def __init__(self, name, batch_fn, max_batch=SCORING_MAX_BATCH, max_wait_ms=SCORING_MAX_WAIT_MS):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.in_flight = 0
+        self.batches = 0
+        self.jobs = 0
+        self.busy_seconds = 0.0
+        self._queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"scoring-{name}")
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, job):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.in_flight = len(batch)
+            started_at = time.perf_counter()
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self._run_batch, [job for job, _ in batch])
+                for (_, future), (ok, outcome) in zip(batch, outcomes):
+                    if future.done():
+                        continue
+                    if ok:
+                        future.set_result(outcome)
+                    else:
+                        logger.error("%s job failed: %r", self.name, outcome)
+                        future.set_exception(outcome)
+            finally:
+                self.in_flight = 0
+                self.batches += 1
+                self.jobs += len(batch)
+                self.busy_seconds += time.perf_counter() - started_at
+
+    def _run_batch(self, jobs):
+        """
+        (ok, result or exception) per job. If the batched call raises, its jobs
+        are re-run one at a time, so only the jobs that fail on their own get
+        an exception and other sessions' jobs in the batch still get results.
+        """
+        try:
+            return [(True, result) for result in self.batch_fn(jobs)]
+        except Exception as exc:
+            if len(jobs) == 1:
+                return [(False, exc)]
+            logger.exception("%s batch of %d failed; retrying its jobs one by one", self.name, len(jobs))
+        outcomes = []
+        for job in jobs:
+            try:
+                outcomes.append((True, self.batch_fn([job])[0]))
+            except Exception as exc:
+                outcomes.append((False, exc))
+        return outcomes
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self.in_flight,
+            "batches": self.batches,
+            "jobs": self.jobs,
+            "mean_batch_size": round(self.jobs / self.batches, 2) if self.batches else 0,
+            "busy_seconds": round(self.busy_seconds, 3)
+        }
+
+def evaluate_batch(jobs):
+    return evaluate_answers(
+        [(answer, model_answer) for answer, model_answer, _ in jobs],
+        question_ids=[question_id for _, _, question_id in jobs]
+    )
+
+def sentiment_batch(texts):
+    # VADER scores one text at a time; batching only saves the per-request overhead
+    return [analyze_sentiment(text) for text in texts]
+
+_generator = None
+def generate_batch(questions):
+    global _generator
+    # flan-t5 is loaded on the first generation job, not at startup
+    from src.nlp_processor import GENERATION_KWARGS, create_pipeline, generation_prompt
+    if _generator is None:
+        _generator = create_pipeline()
+    outputs = _generator(
+        [generation_prompt(question) for question in questions],
+        batch_size=len(questions),
+        **GENERATION_KWARGS
+    )
+    return [output[0]['generated_text'].strip() for output in outputs]
+
+batchers = {
+    "evaluate": MicroBatcher("evaluate", evaluate_batch),
+    "sentiment": MicroBatcher("sentiment", sentiment_batch),
+    "generate": MicroBatcher("generate", generate_batch, max_batch=GENERATE_MAX_BATCH)
+}
+
+@asynccontextmanager
+async def lifespan(app):
+    # Export and load the encoder before the first request rather than inside it
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, prepare_encoder)
+    await loop.run_in_executor(None, get_model)
+    for batcher in batchers.values():
+        batcher.start()
+    yield
+    for batcher in batchers.values():
+        await batcher.stop()
+
+app = FastAPI(title="Ivy scoring service", lifespan=lifespan)
+
+class EvaluateItem(BaseModel):
+    answer: str
+    model_answer: str
+    question_id: Optional[str] = None
+
+class EvaluateRequest(BaseModel):
+    items: List[EvaluateItem]
+
+class TextsRequest(BaseModel):
+    texts: List[str]
+
+class QuestionsRequest(BaseModel):
+    questions: List[str]
+
+@app.post("/evaluate")
+async def evaluate(request: EvaluateRequest):
+    # Items are queued one by one so they share batches with other sessions' jobs
+    results = await asyncio.gather(*(
+        batchers["evaluate"].submit((item.answer, item.model_answer, item.question_id)) for item in request.items
+    ))
+    return {"results": [{"score": score, "feedback": feedback} for score, feedback in results]}
+
+@app.post("/sentiment")
+async def sentiment(request: TextsRequest):
+    return {"results": await asyncio.gather(*(batchers["sentiment"].submit(text) for text in request.texts))}
+
+@app.post("/generate")
+async def generate(request: QuestionsRequest):
+    return {"results": await asyncio.gather(*(batchers["generate"].submit(q) for q in request.questions))}
+
+@app.get("/stats")
+async def stats():
+    return {name: batcher.stats() for name, batcher in batchers.items()}
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(
+        app,
+        host=os.getenv("SCORING_SERVICE_HOST", "127.0.0.1"),
+        port=int(os.getenv("SCORING_SERVICE_PORT", "8765"))
+    )
@@ -3,16 +3,20 @@
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
+_sia = None
 def get_sia():
     """
     Singleton loader for VADER SentimentIntensityAnalyzer.
     Downloads lexicon if needed.
     """
-    try:
-        nltk.data.find('sentiment/vader_lexicon.zip')
-    except LookupError:
-        nltk.download('vader_lexicon')
-    return SentimentIntensityAnalyzer()
+    global _sia
+    if _sia is None:
+        try:
+            nltk.data.find('sentiment/vader_lexicon.zip')
+        except LookupError:
+            nltk.download('vader_lexicon')
+        _sia = SentimentIntensityAnalyzer()
+    return _sia
 
 def analyze_sentiment(text):
     """
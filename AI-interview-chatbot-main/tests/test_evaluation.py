@@ -0,0 +1,127 @@
+# tests/test_evaluation.py
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src import evaluation
+from src.evaluation import ModelAnswerEmbeddings, evaluate_answer, evaluate_answers, precompute_model_answer_embeddings
+
+class CountingModel:
+    """Bag-of-letters encoder that records every text it is asked to encode."""
+
+    def __init__(self):
+        self.encoded = []
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32):
+        self.encoded.extend(texts)
+        self.calls += (len(texts) + batch_size - 1) // batch_size
+        vectors = np.zeros((len(texts), 26), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if "a" <= char <= "z":
+                    vectors[row, ord(char) - ord("a")] += 1
+        return vectors
+
+class TestModelAnswerEmbeddings(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.model = CountingModel()
+        patches = [
+            patch.object(evaluation, "get_model", return_value=self.model),
+            patch.object(evaluation, "_model_answer_embeddings", ModelAnswerEmbeddings(self.cache_dir)),
+            patch.object(evaluation, "_scores", evaluation.OrderedDict())
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.questions = [
+            {"id": "technical-1", "category": "Technical", "text": "What is OOP?", "model_answer": "Objects and classes."},
+            {"id": "hr-1", "category": "HR", "text": "Why this job?", "model_answer": "Growth."}
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_precompute_persists_and_skips_known_answers(self):
+        self.assertEqual(precompute_model_answer_embeddings(self.questions), 2)
+        self.assertEqual(precompute_model_answer_embeddings(self.questions), 0)
+
+        # A fresh table, as in a new process, reads the vectors back from disk
+        table = ModelAnswerEmbeddings(self.cache_dir)
+        self.assertEqual(table.precompute(["Objects and classes.", "Growth."], model=self.model), 0)
+        np.testing.assert_array_equal(table.get("Growth."), self.model.encode(["Growth."])[0])
+
+    def test_evaluate_encodes_only_the_candidate_answer(self):
+        precompute_model_answer_embeddings(self.questions)
+        self.model.encoded.clear()
+
+        score, feedback = evaluate_answer("Objects and classes.", "Objects and classes.", question_id="technical-1")
+        self.assertEqual(score, 5.0)
+        self.assertIn("Excellent", feedback)
+        self.assertEqual(self.model.encoded, ["Objects and classes."])
+
+    def test_repeated_submission_is_memoized(self):
+        first = evaluate_answer("Classes hold objects.", "Objects and classes.", question_id="technical-1")
+        self.model.encoded.clear()
+
+        self.assertEqual(evaluate_answer("Classes hold objects.", "Objects and classes.", question_id="technical-1"), first)
+        self.assertEqual(self.model.encoded, [])
+
+    def test_edited_model_answer_is_rescored(self):
+        first = evaluate_answer("Classes hold objects.", "Objects and classes.", question_id="technical-1")
+        edited = evaluate_answer("Classes hold objects.", "Functions and modules.", question_id="technical-1")
+
+        self.assertNotEqual(edited, first)
+        self.assertEqual(edited, evaluate_answers([("Classes hold objects.", "Functions and modules.")])[0])
+
+    def test_evaluate_answers_matches_per_pair_scores(self):
+        pairs = [
+            ("Objects and classes.", "Objects and classes."),
+            ("", "Growth."),
+            ("I want to grow.", "Growth."),
+            ("Classes hold objects.", "Objects and classes.")
+        ]
+        batched = evaluate_answers(pairs, batch_size=2)
+        self.assertEqual(batched[1], (0.0, "No answer provided."))
+
+        evaluation._scores.clear()
+        self.assertEqual(batched, [evaluate_answer(answer, model_answer) for answer, model_answer in pairs])
+
+    def test_evaluate_answers_encodes_each_new_answer_once(self):
+        precompute_model_answer_embeddings(self.questions)
+        evaluate_answer("Growth matters.", "Growth.", question_id="hr-1")
+        self.model.encoded.clear()
+        self.model.calls = 0
+
+        evaluate_answers(
+            [("Growth matters.", "Growth."), ("Objects!", "Objects and classes."), ("Objects!", "Objects and classes.")],
+            batch_size=8,
+            question_ids=["hr-1", "technical-1", "technical-1"]
+        )
+        self.assertEqual(self.model.encoded, ["Objects!"])
+        self.assertEqual(self.model.calls, 1)
+
+class TestEncoderBackend(unittest.TestCase):
+
+    def test_unknown_backend_is_rejected(self):
+        # A typo must not load torch while tagging its vectors as another backend's
+        result = subprocess.run(
+            [sys.executable, "-c", "import src.evaluation"],
+            env={**os.environ, "EVAL_ENCODER_BACKEND": "onxx"},
+            capture_output=True,
+            text=True
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("EVAL_ENCODER_BACKEND", result.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
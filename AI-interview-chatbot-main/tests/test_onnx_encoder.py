@@ -0,0 +1,125 @@
+# tests/test_onnx_encoder.py
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import onnx
+    import onnxruntime  # noqa: F401
+    from onnx import TensorProto, helper, numpy_helper
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+    HAS_ONNX = True
+except ImportError:
+    HAS_ONNX = False
+
+from src.onnx_encoder import MODEL_FILE, TOKENIZER_FILE, OnnxSentenceEncoder, _publish, load_encoder, model_dir
+
+WORDS = ["[PAD]", "[UNK]", "objects", "and", "classes", "growth", "i", "want", "to", "grow", "teamwork"]
+
+def build_toy_model(path, dim=16, seed=0):
+    """Embedding lookup followed by a dense layer, shaped like a transformer's last_hidden_state."""
+    rng = np.random.default_rng(seed)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["embeddings", "input_ids"], ["token_vectors"]),
+            helper.make_node("MatMul", ["token_vectors", "dense"], ["last_hidden_state"])
+        ],
+        "toy_encoder",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"])
+        ],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "sequence", dim])],
+        initializer=[
+            numpy_helper.from_array(rng.normal(size=(len(WORDS), dim)).astype(np.float32), "embeddings"),
+            numpy_helper.from_array(rng.normal(size=(dim, dim)).astype(np.float32), "dense")
+        ]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 14)])
+    model.ir_version = 8  # readable by older onnxruntime releases
+    onnx.save(model, path)
+
+@unittest.skipUnless(HAS_ONNX, "onnxruntime, onnx and tokenizers are required")
+class TestOnnxSentenceEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        tokenizer = Tokenizer(WordLevel({word: i for i, word in enumerate(WORDS)}, unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = Whitespace()
+        tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+        tokenizer.save(os.path.join(self.model_dir, TOKENIZER_FILE))
+        self.fp32_path = os.path.join(self.model_dir, "model.fp32.onnx")
+        build_toy_model(self.fp32_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+
+    def test_batched_encoding_matches_single_texts(self):
+        shutil.copy(self.fp32_path, os.path.join(self.model_dir, MODEL_FILE))
+        encoder = OnnxSentenceEncoder(self.model_dir)
+        texts = ["objects and classes", "growth", "i want to grow and teamwork", "classes"]
+
+        batched = encoder.encode(texts, batch_size=3)
+        self.assertEqual(batched.shape, (4, 16))
+        np.testing.assert_allclose(np.linalg.norm(batched, axis=1), 1.0, rtol=1e-5)
+        for text, vector in zip(texts, batched):
+            # Padding must not leak into the mean pooling
+            np.testing.assert_allclose(encoder.encode(text), vector, atol=1e-5)
+
+    def test_int8_model_stays_close_to_fp32(self):
+        shutil.copy(self.fp32_path, os.path.join(self.model_dir, MODEL_FILE))
+        texts = ["objects and classes", "i want to grow", "teamwork and growth"]
+        fp32 = OnnxSentenceEncoder(self.model_dir).encode(texts)
+
+        quantize_dynamic(self.fp32_path, os.path.join(self.model_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+        int8 = OnnxSentenceEncoder(self.model_dir).encode(texts)
+        self.assertGreater(float(np.min(np.sum(fp32 * int8, axis=1))), 0.99)
+
+class TestExportPublishing(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.out_dir = model_dir("toy", self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def make_export(self, content):
+        tmp_dir = tempfile.mkdtemp(dir=self.root)
+        with open(os.path.join(tmp_dir, MODEL_FILE), "w") as f:
+            f.write(content)
+        return tmp_dir
+
+    def read_model(self):
+        with open(os.path.join(self.out_dir, MODEL_FILE)) as f:
+            return f.read()
+
+    def test_load_encoder_never_exports(self):
+        with self.assertRaises(FileNotFoundError):
+            load_encoder("toy", root=self.root)
+        self.assertFalse(os.path.exists(self.out_dir))
+
+    def test_concurrent_export_keeps_the_first_published(self):
+        _publish(self.make_export("first"), self.out_dir, replace=False)
+        second = self.make_export("second")
+        _publish(second, self.out_dir, replace=False)
+
+        self.assertEqual(self.read_model(), "first")
+        self.assertFalse(os.path.exists(second))
+
+    def test_forced_export_replaces_the_published_model(self):
+        _publish(self.make_export("first"), self.out_dir)
+        _publish(self.make_export("second"), self.out_dir)
+
+        self.assertEqual(self.read_model(), "second")
+        self.assertEqual(os.listdir(self.root), [os.path.basename(self.out_dir)])
+
+if __name__ == "__main__":
+    unittest.main()
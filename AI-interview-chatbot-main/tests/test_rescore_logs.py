@@ -0,0 +1,77 @@
+# tests/test_rescore_logs.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src import evaluation, rescore_logs
+from src.evaluation import ModelAnswerEmbeddings
+from src.rescore_logs import rescore_log
+from tests.test_evaluation import CountingModel
+
+class TestRescoreLogs(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        patches = [
+            patch.object(evaluation, "get_model", return_value=CountingModel()),
+            patch.object(rescore_logs, "get_model", return_value=None),
+            patch.object(evaluation, "_model_answer_embeddings", ModelAnswerEmbeddings(self.work_dir)),
+            patch.object(evaluation, "_scores", evaluation.OrderedDict())
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.questions = [
+            {"id": "technical-1", "category": "Technical", "text": "What is OOP?", "model_answer": "Objects and classes."},
+            {"id": "hr-1", "category": "HR", "text": "Why this job?", "model_answer": "Growth."}
+        ]
+        self.input_path = os.path.join(self.work_dir, "interaction_logs.csv")
+        self.output_path = os.path.join(self.work_dir, "rescored.csv")
+        pd.DataFrame({
+            "candidate_id": list(range(10)),
+            "question": ["What is OOP?", "Why this job?", "Unknown question?", "What is OOP?", "Why this job?"] * 2,
+            "answer": ["Objects and classes.", "Money.", "Anything.", "", "Growth."] * 2,
+            "score": [1.0] * 10,
+            "feedback": ["old"] * 10
+        }).to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_rescores_every_row_in_order(self):
+        rows = rescore_log(self.input_path, self.output_path, self.questions, workers=1, chunk_size=3)
+        self.assertEqual(rows, 10)
+
+        out = pd.read_csv(self.output_path)
+        self.assertListEqual(out["candidate_id"].tolist(), list(range(10)))
+        self.assertListEqual(out["previous_score"].tolist(), [1.0] * 10)
+        self.assertEqual(out.loc[0, "score"], 5.0)
+        self.assertEqual(out.loc[2, "feedback"], "old")  # not in the catalog
+        self.assertEqual(out.loc[3, "feedback"], "No answer provided.")
+
+    def test_resumes_after_interruption(self):
+        calls = {"count": 0}
+        rescore_chunk = rescore_logs.rescore_chunk
+
+        def flaky(chunk, batch_size):
+            calls["count"] += 1
+            if calls["count"] == 3:
+                raise RuntimeError("worker died")
+            return rescore_chunk(chunk, batch_size)
+
+        with patch.object(rescore_logs, "rescore_chunk", flaky):
+            with self.assertRaises(RuntimeError):
+                rescore_log(self.input_path, self.output_path, self.questions, workers=1, chunk_size=3)
+        self.assertEqual(len(pd.read_csv(self.output_path)), 6)
+
+        rows = rescore_log(self.input_path, self.output_path, self.questions, workers=1, chunk_size=3)
+        self.assertEqual(rows, 4)
+        self.assertListEqual(pd.read_csv(self.output_path)["candidate_id"].tolist(), list(range(10)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# tests/test_scoring_service.py
+
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+from fastapi.testclient import TestClient
+
+from src import evaluation, scoring_client, scoring_service
+from src.evaluation import ModelAnswerEmbeddings
+from src.scoring_service import MicroBatcher
+from tests.test_evaluation import CountingModel
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_concurrent_jobs_share_a_batch(self):
+        batches = []
+        release = threading.Event()
+
+        def batch_fn(jobs):
+            batches.append(list(jobs))
+            release.wait(1)
+            return [job * 2 for job in jobs]
+
+        async def scenario():
+            batcher = MicroBatcher("double", batch_fn, max_batch=4, max_wait_ms=50)
+            batcher.start()
+            first = asyncio.ensure_future(batcher.submit(0))
+            await asyncio.sleep(0.1)  # first batch is now running alone
+            rest = [asyncio.ensure_future(batcher.submit(i)) for i in range(1, 6)]
+            await asyncio.sleep(0.01)
+            depth = batcher.stats()["queue_depth"]
+            release.set()
+            results = await asyncio.gather(first, *rest)
+            stats = batcher.stats()
+            await batcher.stop()
+            return results, depth, stats
+
+        results, depth, stats = asyncio.run(scenario())
+        self.assertEqual(results, [0, 2, 4, 6, 8, 10])
+        self.assertEqual(depth, 5)
+        self.assertEqual(batches, [[0], [1, 2, 3, 4], [5]])
+        self.assertEqual(stats["jobs"], 6)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_failed_batch_fails_its_jobs(self):
+        def batch_fn(jobs):
+            raise RuntimeError("model crashed")
+
+        async def scenario():
+            batcher = MicroBatcher("broken", batch_fn, max_wait_ms=1)
+            batcher.start()
+            try:
+                await batcher.submit("job")
+            finally:
+                await batcher.stop()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(scenario())
+
+    def test_bad_job_fails_alone(self):
+        def batch_fn(jobs):
+            if "bad" in jobs:
+                raise ValueError("malformed item")
+            return [job.upper() for job in jobs]
+
+        async def scenario():
+            batcher = MicroBatcher("upper", batch_fn, max_batch=4, max_wait_ms=50)
+            batcher.start()
+            results = await asyncio.gather(
+                *(batcher.submit(job) for job in ["a", "bad", "c"]), return_exceptions=True
+            )
+            stats = batcher.stats()
+            await batcher.stop()
+            return results, stats
+
+        results, stats = asyncio.run(scenario())
+        self.assertEqual(results[0], "A")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], "C")
+        self.assertEqual(stats["batches"], 1)
+
+class TestScoringService(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        model = CountingModel()
+        patches = [
+            patch.object(evaluation, "get_model", return_value=model),
+            patch.object(scoring_service, "get_model", return_value=model),
+            patch.object(evaluation, "_model_answer_embeddings", ModelAnswerEmbeddings(self.cache_dir)),
+            patch.object(evaluation, "_scores", evaluation.OrderedDict()),
+            patch.object(scoring_service, "sentiment_batch", lambda texts: [{"label": "Neutral"} for _ in texts]),
+            patch.object(scoring_client, "_unavailable_until", 0.0)
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+
+    def test_client_scores_through_the_service(self):
+        # Fresh batchers, bound to the test client's event loop
+        batchers = {
+            "evaluate": MicroBatcher("evaluate", scoring_service.evaluate_batch),
+            "sentiment": MicroBatcher("sentiment", lambda texts: scoring_service.sentiment_batch(texts))
+        }
+        with patch.object(scoring_service, "batchers", batchers), TestClient(scoring_service.app) as client, \
+                patch.object(scoring_client, "SCORING_SERVICE_URL", "http://testserver"), \
+                patch.object(scoring_client, "_session", client):
+            results = scoring_client.evaluate_answers(
+                [("Objects and classes.", "Objects and classes."), ("", "Growth.")],
+                question_ids=["technical-1", "hr-1"]
+            )
+            self.assertEqual(results, [
+                (5.0, "Excellent answer! You covered all key points."),
+                (0.0, "No answer provided.")
+            ])
+            self.assertEqual(scoring_client.analyze_sentiment("Fine.")["label"], "Neutral")
+            stats = client.get("/stats").json()
+        self.assertEqual(stats["evaluate"]["jobs"], 2)
+        self.assertEqual(stats["evaluate"]["batches"], 1)
+
+    def test_client_falls_back_inline_when_service_is_down(self):
+        with patch.object(scoring_client, "SCORING_SERVICE_URL", "http://127.0.0.1:9"):
+            score, feedback = scoring_client.evaluate_answer("Objects and classes.", "Objects and classes.")
+            self.assertEqual(score, 5.0)
+            self.assertGreater(scoring_client._unavailable_until, 0)
+            # Skipped, not retried, until the retry interval has passed
+            with patch.object(scoring_client._session, "post") as post:
+                scoring_client.evaluate_answer("Classes.", "Objects and classes.")
+                post.assert_not_called()
+
+    def test_http_error_falls_back_without_skipping_the_service(self):
+        response = requests.Response()
+        response.status_code = 500
+        with patch.object(scoring_client, "SCORING_SERVICE_URL", "http://testserver"), \
+                patch.object(scoring_client._session, "post", return_value=response) as post:
+            score, _ = scoring_client.evaluate_answer("Objects and classes.", "Objects and classes.")
+            self.assertEqual(score, 5.0)
+            self.assertEqual(scoring_client._unavailable_until, 0.0)
+            scoring_client.evaluate_answer("Classes.", "Objects and classes.")
+            self.assertEqual(post.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
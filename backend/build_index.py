@@ -0,0 +1,29 @@
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from services.rag_service import RAGService
+
+# Load environment variables
+load_dotenv()
+
+
+def build_index(force: bool = False, prune: bool = False) -> str:
+    """Build the vector index artifact so workers can memory-load it on start."""
+    rag_service = RAGService(load_index=False)
+    key = rag_service.initialize_vector_store(force_rebuild=force)
+    if prune:
+        rag_service.index_store.prune(keep=[key])
+    return key
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the RAG vector index artifact")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if a matching artifact exists")
+    parser.add_argument("--prune", action="store_true", help="Delete artifacts for older sources or settings")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    key = build_index(force=args.force, prune=args.prune)
+    print(f"Vector index artifact ready: {key}")
@@ -1,12 +1,16 @@
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import json
+import logging
 import os
 
-from database import get_db
+from database import get_db, SessionLocal
 from models import User, Message, Feedback, ProgressTrack
 from schemas import (
     UserCreate, User as UserSchema,
@@ -16,11 +20,14 @@ from schemas import (
 )
 from security import (
     get_current_user, create_access_token,
-    authenticate_user, get_password_hash
+    authenticate_user, get_password_hash,
+    get_user_from_token
 )
 from services.rag_service import RAGService
 from services.progress_service import ProgressService
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
 
 # Configure CORS
@@ -92,29 +99,70 @@ async def send_message(
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Save user message
+    save_user_message(db, user_id, message.content, message.question_type)
+
+    # Generate response
+    try:
+        response = await rag_service.aget_response(
+            message.content,
+            current_user.selected_role,
+            message.question_type,
+            message.difficulty
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out generating a response")
+
+    assistant_message = save_assistant_message(
+        db, user_id, response["answer"], message.question_type
+    )
+
+    return {
+        "id": assistant_message.id,
+        "answer": response["answer"],
+        "context_used": response["context_used"],
+        "confidence_score": response["confidence_score"],
+        "suggested_topics": response["suggested_topics"],
+        "prompt_tokens": response.get("prompt_tokens")
+    }
+
+@app.post("/api/chat/{user_id}/stream")
+async def stream_message(
+    user_id: int,
+    message: MessageCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    save_user_message(db, user_id, message.content, message.question_type)
+    selected_role = current_user.selected_role
+
+    async def event_stream():
+        async for event in stream_chat_events(
+            user_id, message.content, selected_role, message.question_type, message.difficulty
+        ):
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+def save_user_message(db: Session, user_id: int, content: str, question_type: str) -> Message:
     db_message = Message(
         user_id=user_id,
-        content=message.content,
+        content=content,
         role="user",
-        question_type=message.question_type
+        question_type=question_type
     )
     db.add(db_message)
     db.commit()
+    return db_message
 
-    # Generate response
-    response = rag_service.get_response(
-        message.content,
-        current_user.selected_role,
-        message.question_type
-    )
-
-    # Save assistant message
+def save_assistant_message(db: Session, user_id: int, answer: str, question_type: str) -> Message:
     assistant_message = Message(
         user_id=user_id,
-        content=response["answer"],
+        content=answer,
         role="assistant",
-        question_type=message.question_type
+        question_type=question_type
     )
     db.add(assistant_message)
     db.commit()
@@ -124,16 +172,41 @@ async def send_message(
     progress_service = ProgressService(db)
     progress_service.update_progress(
         user_id=user_id,
-        topic=message.question_type
+        topic=question_type
     )
+    return assistant_message
 
-    return {
-        "id": assistant_message.id,
-        "answer": response["answer"],
-        "context_used": response["context_used"],
-        "confidence_score": response["confidence_score"],
-        "suggested_topics": response["suggested_topics"]
-    }
+async def stream_chat_events(
+    user_id: int,
+    content: str,
+    selected_role: str,
+    question_type: str,
+    difficulty: Optional[str] = None
+):
+    """Relay RAG stream events and persist the reply once the answer is complete.
+
+    A failure ends the stream with an ``error`` event instead of cutting it off.
+    """
+    try:
+        async for event in rag_service.astream_response(
+            content, selected_role, question_type, difficulty
+        ):
+            if event["type"] == "done":
+                # The request-scoped session may already be closed while streaming
+                db = SessionLocal()
+                try:
+                    assistant_message = save_assistant_message(
+                        db, user_id, event["answer"], question_type
+                    )
+                    event = {**event, "id": assistant_message.id}
+                finally:
+                    db.close()
+            yield event
+    except asyncio.TimeoutError:
+        yield {"type": "error", "detail": "Timed out generating a response"}
+    except Exception:
+        logger.exception("Streaming a response for user %s failed", user_id)
+        yield {"type": "error", "detail": "Failed to generate a response"}
 
 @app.get("/api/chat/{user_id}/history", response_model=List[MessageSchema])
 async def get_chat_history(
@@ -197,8 +270,23 @@ async def get_study_streak(
     progress_service = ProgressService(db)
     return progress_service.get_study_streak(user_id)
 
+@app.get("/api/rag/stats")
+async def get_rag_stats(
+    current_user: User = Depends(get_current_user)
+):
+    return rag_service.get_stats()
+
 @app.websocket("/ws/chat/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: int):
+async def websocket_endpoint(websocket: WebSocket, user_id: int, token: Optional[str] = None):
+    # Browsers cannot set headers on a WebSocket, so the access token comes as ?token=
+    db = SessionLocal()
+    try:
+        current_user = get_user_from_token(token, db) if token else None
+    finally:
+        db.close()
+    if current_user is None or current_user.id != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     await websocket.accept()
     active_connections[user_id] = websocket
     try:
@@ -214,6 +302,32 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
                             "user_id": user_id,
                             "is_typing": data["is_typing"]
                         })
+            elif data["type"] == "chat":
+                if not data.get("content") or not data.get("question_type"):
+                    await websocket.send_json({
+                        "type": "error", "detail": "chat messages need content and question_type"
+                    })
+                    continue
+                # Stream the answer token by token back to the sender
+                db = SessionLocal()
+                try:
+                    user = db.query(User).filter(User.id == user_id).first()
+                    selected_role = user.selected_role if user else None
+                    if user:
+                        save_user_message(db, user_id, data["content"], data["question_type"])
+                finally:
+                    db.close()
+                if not user:
+                    await websocket.send_json({"type": "error", "detail": "User not found"})
+                    continue
+                async for event in stream_chat_events(
+                    user_id, data["content"], selected_role, data["question_type"],
+                    data.get("difficulty")
+                ):
+                    await websocket.send_json(event)
     except WebSocketDisconnect:
-        if user_id in active_connections:
+        pass
+    finally:
+        # A newer connection for the same user may have replaced this one
+        if active_connections.get(user_id) is websocket:
             del active_connections[user_id] 
\ No newline at end of file
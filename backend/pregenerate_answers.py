@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+from schemas import RoleType
+from services.answer_store import DEFAULT_DB_PATH, PregeneratedAnswerStore, answer_key
+from services.concurrency import BoundedExecutor
+from services.rag_service import RAGService
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'interview_questions.json')
+
+# Chat question types a catalog question is asked under
+CATALOG_QUESTION_TYPES = {
+    "technical": ["technical"],
+    "behavioral": ["behavioral"],
+    "hr": ["behavioral", "resume"]
+}
+
+
+def catalog_jobs(rag_service: RAGService, roles: Iterable[str]) -> List[Dict]:
+    """Every catalog question for every role it can be asked for, deduplicated"""
+    roles = list(roles)
+    jobs = {}
+
+    def add(question: str, role: str, catalog_type: str) -> None:
+        for question_type in CATALOG_QUESTION_TYPES.get(catalog_type, [catalog_type]):
+            job = {"question": question, "role": role, "question_type": question_type}
+            jobs.setdefault(answer_key(role, question_type, None, question), job)
+
+    # Shared question banks apply to every role
+    for catalog_type, questions in rag_service.questions.items():
+        for q in questions:
+            for role in roles:
+                add(q['question'], role, catalog_type)
+
+    # Role-specific bank: role -> level -> questions
+    with open(INTERVIEW_QUESTIONS_PATH, 'r') as f:
+        for role, levels in json.load(f).items():
+            if role not in roles:
+                continue
+            for questions in levels.values():
+                for q in questions:
+                    add(q['question'], role, q.get('type', 'technical'))
+
+    return list(jobs.values())
+
+
+async def pregenerate(
+    rag_service: RAGService,
+    store: PregeneratedAnswerStore,
+    jobs: List[Dict],
+    concurrency: int,
+    limit: Optional[int] = None
+) -> Dict[str, int]:
+    """Generate and store answers for ``jobs``; already stored ones are skipped"""
+    index_key = rag_service.index_key
+    done = store.existing_keys(index_key)
+    pending = [
+        job for job in jobs
+        if answer_key(job["role"], job["question_type"], None, job["question"]) not in done
+    ]
+    counts = {"generated": 0, "failed": 0, "skipped": len(jobs) - len(pending)}
+    logger.info("%d of %d answers already generated, %d to go", counts["skipped"], len(jobs), len(pending))
+    pending = pending[:limit]
+
+    rag_service.executor = BoundedExecutor(max_concurrency=concurrency, name="pregenerate")
+    started_at = time.perf_counter()
+
+    async def run(job: Dict) -> None:
+        try:
+            response = await rag_service.executor.run(
+                rag_service.generate_response, job["question"], job["role"], job["question_type"]
+            )
+        except Exception:
+            # Left out of the table, so the next run retries it
+            logger.exception("Failed to generate an answer for %s", job)
+            counts["failed"] += 1
+            return
+        response.pop("prompt_tokens", None)
+        # Stored as each answer completes, so an interrupted run resumes here
+        store.put(index_key, job["role"], job["question_type"], None, job["question"], response)
+        counts["generated"] += 1
+        if counts["generated"] % 25 == 0:
+            logger.info(
+                "%d/%d answers generated (%.1f/s)",
+                counts["generated"], len(pending), counts["generated"] / (time.perf_counter() - started_at)
+            )
+
+    await asyncio.gather(*(run(job) for job in pending))
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate answers for the catalog questions")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite lookup table to write")
+    parser.add_argument("--roles", nargs="+", default=[role.value for role in RoleType])
+    parser.add_argument("--concurrency", type=int, default=4, help="Answers generated at once")
+    parser.add_argument("--limit", type=int, help="Only the first N pending questions")
+    parser.add_argument("--prune", action="store_true", help="Delete answers generated for older indexes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    rag_service = RAGService()
+    # Every catalog question gets its own answer, not a semantically close one
+    rag_service.answer_cache = None
+    store = PregeneratedAnswerStore(args.db, readonly=False)
+
+    jobs = catalog_jobs(rag_service, args.roles)
+    counts = asyncio.run(pregenerate(rag_service, store, jobs, args.concurrency, args.limit))
+    if args.prune:
+        logger.info("Pruned %d stale answers", store.prune([rag_service.index_key]))
+    print(f"Pre-generated answers: {counts['generated']} new, {counts['skipped']} already stored, "
+          f"{counts['failed']} failed")
@@ -41,6 +41,8 @@ class MessageBase(BaseModel):
 class MessageCreate(MessageBase):
     user_id: int
     role: str
+    # Restricts retrieval to reference answers of this difficulty
+    difficulty: Optional[str] = None
 
 class Message(MessageBase):
     id: int
@@ -56,6 +58,7 @@ class ChatResponse(BaseModel):
     context_used: List[str]
     confidence_score: float
     suggested_topics: List[str]
+    prompt_tokens: Optional[int] = None
 
 class FeedbackCreate(BaseModel):
     rating: int
@@ -52,6 +52,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def get_user_from_token(token: str, db: Session) -> Optional[User]:
+    """Resolve a JWT access token to its user, or None if it is invalid."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    return db.query(User).filter(User.email == email).first()
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -62,15 +73,7 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_from_token(token, db)
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+    return user
\ No newline at end of file
@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .metrics import LatencyRecorder
+from .semantic_cache import normalize_question
+
+DEFAULT_DB_PATH = os.getenv(
+    "RAG_PREGENERATED_DB",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'pregenerated_answers.db')
+)
+PREGENERATED_ANSWERS = os.getenv("RAG_PREGENERATED_ANSWERS", "true").lower() == "true"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    index_key TEXT NOT NULL,
+    role TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    question TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (index_key, role, question_type, difficulty, question_key)
+)
+"""
+
+AnswerKey = Tuple[str, str, str, str]
+
+
+def answer_key(role, question_type, difficulty: Optional[str], question: str) -> AnswerKey:
+    return (
+        str(getattr(role, "value", role)),
+        str(getattr(question_type, "value", question_type)),
+        difficulty or "",
+        normalize_question(question)
+    )
+
+
+class PregeneratedAnswerStore:
+    """SQLite lookup table of answers generated offline for catalog questions.
+
+    Rows are keyed by the vector index artifact they were generated against,
+    so answers grounded in outdated sources are never served. Readers open
+    the database lazily, so a server started before the first batch run
+    begins serving answers once the file appears.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, readonly: bool = True):
+        self.path = os.path.abspath(path)
+        self.readonly = readonly
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = LatencyRecorder()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if self.readonly:
+                if not os.path.exists(self.path):
+                    return None
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                # Let serving workers read while a batch run writes
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(SCHEMA)
+        return self._conn
+
+    def get(self, index_key: str, role, question_type, difficulty: Optional[str], question: str) -> Optional[Dict]:
+        started_at = time.perf_counter()
+        row = None
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT response FROM answers WHERE index_key = ? AND role = ? AND question_type = ?"
+                        " AND difficulty = ? AND question_key = ?",
+                        (index_key, *answer_key(role, question_type, difficulty, question))
+                    ).fetchone()
+                except sqlite3.OperationalError:
+                    # Table not created yet by the first batch run
+                    row = None
+        self.lookup_time.record(time.perf_counter() - started_at)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, index_key: str, role, question_type, difficulty: Optional[str], question: str, response: Dict) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (index_key, *answer_key(role, question_type, difficulty, question),
+                 question, json.dumps(response), time.time())
+            )
+            conn.commit()
+
+    def existing_keys(self, index_key: str) -> Set[AnswerKey]:
+        """Keys already generated for ``index_key``, for resuming a batch run"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return set()
+            return {
+                tuple(row) for row in conn.execute(
+                    "SELECT role, question_type, difficulty, question_key FROM answers WHERE index_key = ?",
+                    (index_key,)
+                )
+            }
+
+    def prune(self, keep_index_keys: Iterable[str]) -> int:
+        """Delete answers generated against any other index artifact"""
+        keep = list(keep_index_keys)
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute(
+                f"DELETE FROM answers WHERE index_key NOT IN ({', '.join('?' for _ in keep)})", keep
+            ).rowcount
+            conn.commit()
+        return deleted
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "lookup": self.lookup_time.summary()
+        }
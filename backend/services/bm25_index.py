@@ -0,0 +1,269 @@
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.schema.retriever import BaseRetriever
+
+from .partitions import PARTITION_FALLBACK, PartitionIndex, search_params
+
+# Share of the fused score that comes from BM25; the rest is vector similarity
+BM25_WEIGHT = float(os.getenv("RAG_HYBRID_BM25_WEIGHT", "0.3"))
+KEYWORD_FAST_PATH = os.getenv("RAG_KEYWORD_FAST_PATH", "true").lower() == "true"
+# Top keyword hit must beat the runner-up by this factor to skip the embedding
+KEYWORD_FAST_PATH_MARGIN = float(os.getenv("RAG_KEYWORD_FAST_PATH_MARGIN", "1.2"))
+
+# Keeps technical terms such as "c++", "b-tree", "node.js" and "use_effect" whole
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_+#]*(?:[.\-][a-z0-9_+#]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it of on or "
+    "the this to was what when where which who why with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class KeywordHit:
+    position: int
+    score: float
+    # Fraction of the distinct query terms present in the document
+    coverage: float
+
+
+class BM25Index:
+    """In-memory inverted index scoring documents with Okapi BM25.
+
+    Document ``i`` corresponds to row ``i`` of the FAISS index it was built
+    alongside, so keyword and vector hits can be fused by position.
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths = np.zeros(len(texts), dtype=np.float32)
+        for position, text in enumerate(texts):
+            terms = tokenize(text)
+            self.doc_lengths[position] = len(terms)
+            for term, frequency in Counter(terms).items():
+                self.postings[term].append((position, frequency))
+        self.avg_length = float(self.doc_lengths.mean()) if len(texts) else 0.0
+        self.idf = {
+            term: math.log(1 + (len(texts) - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def from_vector_store(cls, vector_store) -> "BM25Index":
+        return cls([
+            vector_store.docstore.search(vector_store.index_to_docstore_id[position]).page_content
+            for position in range(vector_store.index.ntotal)
+        ])
+
+    def search(self, query: str, k: int, positions: Optional[np.ndarray] = None) -> List[KeywordHit]:
+        """Top ``k`` keyword hits, only among ``positions`` when given"""
+        terms = set(tokenize(query))
+        if not terms or not len(self):
+            return []
+        scores = np.zeros(len(self), dtype=np.float32)
+        matched = np.zeros(len(self), dtype=np.int32)
+        for term in terms:
+            for position, frequency in self.postings.get(term, ()):
+                norm = 1 - self.b + self.b * self.doc_lengths[position] / self.avg_length
+                scores[position] += self.idf[term] * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                matched[position] += 1
+        if positions is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[positions] = True
+            scores[~allowed] = 0
+        candidates = np.flatnonzero(scores)
+        top = candidates[np.argsort(-scores[candidates])[:k]]
+        return [
+            KeywordHit(position=int(p), score=float(scores[p]), coverage=matched[p] / len(terms))
+            for p in top
+        ]
+
+
+@dataclass
+class HybridResult:
+    documents: List[Document]
+    # Fused relevance in [0, 1], best first
+    scores: List[float]
+    query_embedding: Optional[List[float]]
+    keyword_only: bool = False
+
+
+class HybridSearcher:
+    """Fuses BM25 and FAISS scores for one vector store.
+
+    ``score = weight * bm25 / max(bm25) + (1 - weight) * cosine``. When the
+    best keyword hit covers every query term and clearly beats the runner-up,
+    the keyword results are returned without embedding the query.
+
+    ``filters`` restrict a search to documents whose metadata matches, e.g.
+    ``{"type": ["technical"]}``; with ``fallback`` a partition that yields
+    fewer than ``k`` results is topped up from the whole store.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        weight: float = BM25_WEIGHT,
+        fast_path: bool = KEYWORD_FAST_PATH,
+        fast_path_margin: float = KEYWORD_FAST_PATH_MARGIN,
+        fallback: bool = PARTITION_FALLBACK
+    ):
+        self.vector_store = vector_store
+        self.bm25 = BM25Index.from_vector_store(vector_store)
+        self.partitions = PartitionIndex.from_vector_store(vector_store)
+        self.fallback = fallback
+        self.weight = weight
+        self.fast_path = fast_path
+        self.fast_path_margin = fast_path_margin
+        self.searches = 0
+        self.keyword_only = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _document(self, position: int) -> Document:
+        return self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[position])
+
+    def _record(self, keyword_only: bool) -> None:
+        with self._lock:
+            self.searches += 1
+            self.keyword_only += keyword_only
+
+    def keyword_match(
+        self,
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Sequence[str]]] = None
+    ) -> Optional[HybridResult]:
+        """Keyword-only results if the query is an unambiguous exact match"""
+        result = self._keyword_match(query, k, self.partitions.positions(filters or {}))
+        if result is not None:
+            self._record(keyword_only=True)
+        return result
+
+    def _keyword_match(self, query: str, k: int, positions: Optional[np.ndarray]) -> Optional[HybridResult]:
+        if not self.fast_path:
+            return None
+        hits = self.bm25.search(query, k, positions)
+        if len(tokenize(query)) < 2 or not hits or hits[0].coverage < 1.0:
+            return None
+        if len(hits) > 1 and hits[0].score < self.fast_path_margin * hits[1].score:
+            return None
+        top = hits[0].score
+        return HybridResult(
+            documents=[self._document(hit.position) for hit in hits],
+            scores=[hit.score / top for hit in hits],
+            query_embedding=None,
+            keyword_only=True
+        )
+
+    def _vector_scores(
+        self,
+        query_embedding: List[float],
+        fetch_k: int,
+        allowed: Optional[np.ndarray] = None
+    ) -> Dict[int, float]:
+        index = self.vector_store.index
+        vector = np.asarray([query_embedding], dtype=np.float32)
+        if allowed is None:
+            distances, positions = index.search(vector, fetch_k)
+        else:
+            distances, positions = index.search(vector, fetch_k, params=search_params(index, allowed))
+        # Embeddings are unit length, so squared L2 distance is 2 - 2 * cosine
+        return {
+            int(p): max(0.0, min(1.0, 1 - float(d) / 2))
+            for d, p in zip(distances[0], positions[0]) if p != -1
+        }
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        query_embedding: Optional[List[float]] = None,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        filters: Optional[Dict[str, Sequence[str]]] = None
+    ) -> HybridResult:
+        if query_embedding is None:
+            keyword = self.keyword_match(query, k, filters)
+            if keyword is not None:
+                return keyword
+            query_embedding = embed_fn(query)
+
+        allowed = self.partitions.positions(filters or {})
+        ranked = self._rank(query, query_embedding, k, allowed)
+        if allowed is not None and len(ranked) < k and self.fallback:
+            seen = {position for position, _ in ranked}
+            ranked += [
+                item for item in self._rank(query, query_embedding, k, None)
+                if item[0] not in seen
+            ][:k - len(ranked)]
+            with self._lock:
+                self.fallbacks += 1
+        self._record(keyword_only=False)
+        return HybridResult(
+            documents=[self._document(position) for position, _ in ranked],
+            scores=[score for _, score in ranked],
+            query_embedding=query_embedding
+        )
+
+    def _rank(
+        self,
+        query: str,
+        query_embedding: List[float],
+        k: int,
+        allowed: Optional[np.ndarray]
+    ) -> List[Tuple[int, float]]:
+        fetch_k = max(k * 2, 10)
+        vector_scores = self._vector_scores(query_embedding, fetch_k, allowed)
+        keyword_hits = self.bm25.search(query, fetch_k, allowed) if self.weight > 0 else []
+        top_keyword = keyword_hits[0].score if keyword_hits else 0.0
+        keyword_scores = {hit.position: hit.score / top_keyword for hit in keyword_hits}
+
+        fused = {
+            position: (
+                self.weight * keyword_scores.get(position, 0.0)
+                + (1 - self.weight) * vector_scores.get(position, 0.0)
+            )
+            for position in set(vector_scores) | set(keyword_scores)
+        }
+        return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "searches": self.searches,
+            "partition_fallbacks": self.fallbacks,
+            "partitions": self.partitions.partitions(),
+            "keyword_only": self.keyword_only,
+            "keyword_only_rate": self.keyword_only / self.searches if self.searches else 0.0,
+            "bm25_weight": self.weight,
+            "documents": len(self.bm25)
+        }
+
+
+class HybridRetriever(BaseRetriever):
+    """LangChain retriever backed by a :class:`HybridSearcher`"""
+    vectorstore: object
+    searcher: object
+    k: int = 4
+
+    @classmethod
+    def from_vector_store(cls, vector_store, k: int = 4, **kwargs) -> "HybridRetriever":
+        return cls(vectorstore=vector_store, searcher=HybridSearcher(vector_store, **kwargs), k=k)
+
+    def _get_relevant_documents(self, query: str, *, run_manager) -> List[Document]:
+        return self.searcher.search(query, self.k, embed_fn=self.vectorstore.embeddings.embed_query).documents
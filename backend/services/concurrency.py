@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .metrics import LatencyRecorder
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("RAG_MAX_CONCURRENCY", "8"))
+
+
+class BoundedExecutor:
+    """Runs blocking calls off the event loop with a per-worker concurrency limit.
+
+    Callers beyond ``max_concurrency`` wait on a semaphore; the time spent
+    waiting is recorded as queue time.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, name: str = "rag"):
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=name
+        )
+        # Created on first use so it binds to the server's running loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.queue_time = LatencyRecorder()
+        self.run_time = LatencyRecorder()
+        self.waiting = 0
+        self.in_flight = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``max_concurrency`` slots, e.g. while streaming."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started_at = time.perf_counter()
+        self.queue_time.record(started_at - queued_at)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.run_time.record(time.perf_counter() - started_at)
+            self._semaphore.release()
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        async with self.slot():
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_time": self.queue_time.summary(),
+            "run_time": self.run_time.summary()
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
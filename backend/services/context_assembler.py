@@ -0,0 +1,174 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from langchain.docstore.document import Document
+
+from .token_counter import DEFAULT_MODEL, count_tokens, truncate_to_tokens
+
+DEFAULT_MAX_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_MAX_TOKENS", "1000"))
+# Comma separated per-role overrides, e.g. "backend:1500,qa:600"
+ROLE_CONTEXT_BUDGETS = os.getenv("RAG_CONTEXT_ROLE_BUDGETS", "")
+# A chunk cut shorter than this is dropped rather than included as a fragment
+MIN_CHUNK_TOKENS = 32
+# Shortest repeated text treated as splitter overlap, also at least a quarter
+# of ``chunk_overlap``
+MIN_OVERLAP_CHARS = 12
+
+SEPARATOR = "\n\n"
+
+
+def parse_role_budgets(spec: str) -> Dict[str, int]:
+    budgets = {}
+    for item in spec.split(","):
+        if ":" not in item:
+            continue
+        role, tokens = item.split(":", 1)
+        budgets[role.strip()] = int(tokens)
+    return budgets
+
+
+def _source_key(doc: Document) -> Optional[Hashable]:
+    metadata = doc.metadata or {}
+    for key in ("source", "id"):
+        if key in metadata:
+            return (key, str(metadata[key]), str(metadata.get("type", "")))
+    return None
+
+
+def _overlap(left: str, right: str, max_overlap: int, min_overlap: int = 1) -> int:
+    """Length of the longest suffix of ``left`` that is a prefix of ``right``
+
+    Only whole-word overlaps of at least ``min_overlap`` characters count, so a
+    coincidental match like "...index" / "xylophone..." is not stripped.
+    """
+    for size in range(min(len(left), len(right), max_overlap), min_overlap - 1, -1):
+        if not left.endswith(right[:size]):
+            continue
+        starts_on_word = size == len(left) or left[-size - 1].isspace() or right[0].isspace()
+        ends_on_word = size == len(right) or right[size].isspace() or right[size - 1].isspace()
+        if starts_on_word and ends_on_word:
+            return size
+    return 0
+
+
+@dataclass
+class AssembledContext:
+    documents: List[Document] = field(default_factory=list)
+    tokens: int = 0
+    budget: int = 0
+    dropped: int = 0
+
+    @property
+    def text(self) -> str:
+        return SEPARATOR.join(doc.page_content for doc in self.documents)
+
+
+class ContextAssembler:
+    """Builds the document context stuffed into a RAG prompt.
+
+    Retrieved chunks are ordered by score, text repeated between neighbouring
+    chunks of the same source (the splitter's ``chunk_overlap``) is removed,
+    and chunks are added until the role's token budget is spent.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_CONTEXT_TOKENS,
+        role_budgets: Optional[Dict[str, int]] = None,
+        chunk_overlap: int = 200,
+        model_name: str = DEFAULT_MODEL
+    ):
+        self.max_tokens = max_tokens
+        self.role_budgets = (
+            parse_role_budgets(ROLE_CONTEXT_BUDGETS) if role_budgets is None else role_budgets
+        )
+        self.chunk_overlap = chunk_overlap
+        self.min_overlap = max(MIN_OVERLAP_CHARS, chunk_overlap // 4)
+        self.model_name = model_name
+        self.assembled = 0
+        self.total_tokens = 0
+        self.max_seen_tokens = 0
+        self.dropped_chunks = 0
+        self.deduplicated_chars = 0
+        self._lock = threading.Lock()
+
+    def budget_for(self, role: Any = None) -> int:
+        role = getattr(role, "value", role)
+        return self.role_budgets.get(str(role), self.max_tokens) if role is not None else self.max_tokens
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self.model_name)
+
+    def _dedupe(self, text: str, kept: List[str]) -> str:
+        for previous in kept:
+            if text in previous:
+                return ""
+            text = text[_overlap(previous, text, self.chunk_overlap, self.min_overlap):]
+            tail = _overlap(text, previous, self.chunk_overlap, self.min_overlap)
+            if tail:
+                text = text[:-tail]
+        return text.strip()
+
+    def assemble(
+        self,
+        documents: Sequence[Document],
+        scores: Optional[Sequence[float]] = None,
+        role: Any = None
+    ) -> AssembledContext:
+        """Select and trim ``documents`` (higher ``scores`` first) to fit the budget"""
+        budget = self.budget_for(role)
+        order = list(range(len(documents)))
+        if scores is not None:
+            order.sort(key=lambda i: scores[i], reverse=True)
+
+        result = AssembledContext(budget=budget)
+        kept_by_source: Dict[Any, List[str]] = {}
+        deduplicated = 0
+        separator_tokens = self.count_tokens(SEPARATOR)
+        for position, i in enumerate(order):
+            doc = documents[i]
+            source = _source_key(doc)
+            # Without a source, compare against everything already kept
+            kept = kept_by_source.setdefault(source, []) if source is not None else [
+                d.page_content for d in result.documents
+            ]
+            text = self._dedupe(doc.page_content, kept)
+            deduplicated += len(doc.page_content) - len(text)
+            if not text:
+                result.dropped += 1
+                continue
+
+            remaining = budget - result.tokens - (separator_tokens if result.documents else 0)
+            tokens = self.count_tokens(text)
+            if tokens > remaining:
+                if remaining >= MIN_CHUNK_TOKENS:
+                    text = truncate_to_tokens(text, remaining, self.model_name)
+                    tokens = self.count_tokens(text)
+                else:
+                    result.dropped += len(order) - position
+                    break
+
+            result.documents.append(Document(page_content=text, metadata=dict(doc.metadata)))
+            result.tokens += tokens + (separator_tokens if len(result.documents) > 1 else 0)
+            kept.append(text)
+
+        with self._lock:
+            self.assembled += 1
+            self.total_tokens += result.tokens
+            self.max_seen_tokens = max(self.max_seen_tokens, result.tokens)
+            self.dropped_chunks += result.dropped
+            self.deduplicated_chars += deduplicated
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "assembled": self.assembled,
+            "avg_context_tokens": self.total_tokens / self.assembled if self.assembled else 0.0,
+            "max_context_tokens": self.max_seen_tokens,
+            "dropped_chunks": self.dropped_chunks,
+            "deduplicated_chars": self.deduplicated_chars,
+            "max_tokens": self.max_tokens,
+            "role_budgets": dict(self.role_budgets)
+        }
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'embedding_cache')
+)
+DEFAULT_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+# Query embeddings are kept per process only, never written to disk
+QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "1024"))
+
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+KEY_BYTES = 16
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+class _ModelStore:
+    """Vectors of one embedding model: an append-only float32 matrix file and
+    a parallel append-only log of 16-byte text hashes, one per row.
+
+    Appends only add bytes at the end of both files, so other processes pick
+    up new rows by reading the tail of the key log. Eviction compacts into a
+    new generation of files and repoints ``meta.json`` at it; readers seeing
+    a new generation reload from scratch.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.dim: Optional[int] = None
+        self.generation = 0
+        self.num_rows = 0
+        self.rows: "OrderedDict[str, int]" = OrderedDict()  # least recently used first
+        self.vectors: Optional[np.memmap] = None
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, META_FILE)
+
+    def keys_path(self, generation: Optional[int] = None) -> str:
+        return os.path.join(self.directory, f"keys.{self.generation if generation is None else generation}.bin")
+
+    def vectors_path(self, generation: Optional[int] = None) -> str:
+        return os.path.join(self.directory, f"vectors.{self.generation if generation is None else generation}.f32")
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self) -> None:
+        tmp_path = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"dim": self.dim, "generation": self.generation}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _reset(self, meta: Dict) -> None:
+        self.dim = meta["dim"]
+        self.generation = meta["generation"]
+        self.num_rows = 0
+        self.rows = OrderedDict()
+        self.vectors = None
+
+    def refresh(self) -> None:
+        """Pick up rows appended (or a compaction made) by other processes."""
+        meta = self._read_meta()
+        if meta is None:
+            return
+        if meta["generation"] != self.generation or meta["dim"] != self.dim:
+            self._reset(meta)
+        try:
+            with open(self.keys_path(), 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size // KEY_BYTES <= self.num_rows:
+                    return
+                f.seek(self.num_rows * KEY_BYTES)
+                data = f.read((size // KEY_BYTES - self.num_rows) * KEY_BYTES)
+        except FileNotFoundError:
+            # Compacted away between reading meta and opening the log
+            return self.refresh() if self._read_meta() != meta else None
+        for offset in range(0, len(data), KEY_BYTES):
+            self.rows[data[offset:offset + KEY_BYTES].hex()] = self.num_rows + offset // KEY_BYTES
+        self.num_rows += len(data) // KEY_BYTES
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        if self.num_rows == 0 or self.dim is None:
+            self.vectors = None
+            return
+        self.vectors = np.memmap(
+            self.vectors_path(), dtype=np.float32, mode='r', shape=(self.num_rows, self.dim)
+        )
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None or self.vectors is None:
+            return None
+        self.rows.move_to_end(key)
+        return np.array(self.vectors[row])
+
+    def append(self, items: Dict[str, np.ndarray]) -> None:
+        """Append rows; the caller holds the directory's file lock."""
+        self.refresh()
+        new_items = [(key, vector) for key, vector in items.items() if key not in self.rows]
+        if not new_items:
+            return
+        matrix = np.asarray([vector for _, vector in new_items], dtype=np.float32)
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+            self._write_meta()
+        # Vectors first: a row becomes visible once its key is in the log
+        with open(self.vectors_path(), 'ab') as f:
+            f.truncate(self.num_rows * self.dim * 4)
+            f.write(matrix.tobytes())
+        with open(self.keys_path(), 'ab') as f:
+            f.truncate(self.num_rows * KEY_BYTES)
+            f.write(b"".join(bytes.fromhex(key) for key, _ in new_items))
+        for offset, (key, _) in enumerate(new_items):
+            self.rows[key] = self.num_rows + offset
+        self.num_rows += len(new_items)
+        self._map_vectors()
+
+    def evict(self, max_entries: int) -> int:
+        """Drop least recently used rows into a compacted generation; the caller holds the file lock."""
+        excess = len(self.rows) - max_entries
+        if excess <= 0:
+            return 0
+        # Evict down to 90% of the cap so compaction is not repeated on every insert
+        excess += max_entries // 10
+        for _ in range(min(excess, len(self.rows))):
+            self.rows.popitem(last=False)
+
+        kept = list(self.rows.items())
+        old_generation, generation = self.generation, self.generation + 1
+        with open(self.vectors_path(generation), 'wb') as f:
+            for _, row in kept:
+                f.write(np.asarray(self.vectors[row], dtype=np.float32).tobytes())
+        with open(self.keys_path(generation), 'wb') as f:
+            f.write(b"".join(bytes.fromhex(key) for key, _ in kept))
+        self.generation = generation
+        self._write_meta()
+        self.rows = OrderedDict((key, new_row) for new_row, (key, _) in enumerate(kept))
+        self.num_rows = len(kept)
+        self._map_vectors()
+        # Open memmaps in other processes keep the old files alive until they refresh
+        for path in (self.keys_path(old_generation), self.vectors_path(old_generation)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return excess
+
+
+class EmbeddingCache:
+    """On-disk embedding cache shared by every RAG index builder and query path.
+
+    Vectors are keyed by (model name, text hash) and stored as a memory-mapped
+    float32 matrix per model, so rebuilding an index only embeds texts that
+    changed. The cache is bounded to ``max_entries`` vectors per model with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, model_name: str) -> _ModelStore:
+        if model_name not in self._stores:
+            safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+            self._stores[model_name] = _ModelStore(os.path.join(self.cache_dir, safe_name))
+        return self._stores[model_name]
+
+    @contextmanager
+    def _file_lock(self, store: _ModelStore):
+        # Serialise writers across uvicorn workers sharing the cache directory
+        with open(os.path.join(store.directory, LOCK_FILE), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            store = self._store(model_name)
+            keys = [text_hash(text) for text in texts]
+            if any(key not in store.rows for key in keys):
+                # Another process may have embedded these texts already; reads only the new rows
+                store.refresh()
+            vectors = [store.get(key) for key in keys]
+            found = sum(vector is not None for vector in vectors)
+            self.hits += found
+            self.misses += len(vectors) - found
+            return vectors
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        with self._lock:
+            store = self._store(model_name)
+            with self._file_lock(store):
+                store.append({
+                    text_hash(text): np.asarray(vector, dtype=np.float32)
+                    for text, vector in zip(texts, vectors)
+                })
+                self.evictions += store.evict(self.max_entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": sum(len(store.rows) for store in self._stores.values())
+        }
+
+
+_default_cache: Optional[EmbeddingCache] = None
+
+
+def get_default_cache() -> EmbeddingCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = EmbeddingCache()
+    return _default_cache
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps a LangChain embeddings model so every call reads through the cache.
+
+    Document embeddings are persisted to the shared cache. Query embeddings
+    are looked up there but only kept in a small per-process LRU, so chat
+    messages never write to disk.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: Optional[EmbeddingCache] = None,
+        model_name: Optional[str] = None,
+        query_cache_size: int = QUERY_CACHE_SIZE
+    ):
+        self.embeddings = embeddings
+        self.cache = cache or get_default_cache()
+        self.query_cache_size = query_cache_size
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._queries_lock = threading.Lock()
+        self.model = (
+            model_name
+            or getattr(embeddings, 'model', None)
+            or getattr(embeddings, 'model_name', None)
+            or type(embeddings).__name__
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            embedded = self.embeddings.embed_documents(missing_texts)
+            self.cache.put_many(self.model, missing_texts, embedded)
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return [[float(x) for x in vector] for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._queries_lock:
+            if text in self._queries:
+                self._queries.move_to_end(text)
+                return list(self._queries[text])
+        vector = self.cache.get_many(self.model, [text])[0]
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+        vector = [float(x) for x in vector]
+        with self._queries_lock:
+            self._queries[text] = vector
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+        return list(vector)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+import faiss
+import numpy as np
+from langchain.vectorstores import FAISS
+
+from .mmap_docstore import MmapDocstore, write_docstore
+from .vector_index import RerankIndex, unwrap
+
+logger = logging.getLogger(__name__)
+
+# Bump when the document layout written into the index changes so that
+# artifacts built by older code are never picked up.
+INDEX_FORMAT_VERSION = 2
+
+DEFAULT_INDEX_DIR = os.getenv(
+    "RAG_INDEX_DIR",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'index')
+)
+
+# Map index files read-only so worker processes share their pages
+INDEX_MMAP = os.getenv("RAG_INDEX_MMAP", "true").lower() == "true"
+# Zero-copy mapping of Flat and HNSW codes needs IO_FLAG_MMAP_IFC (faiss >= 1.9);
+# older releases' IO_FLAG_MMAP only maps IVF inverted lists
+MMAP_FLAT_CODES = hasattr(faiss, "IO_FLAG_MMAP_IFC")
+MMAP_FLAGS = (
+    faiss.IO_FLAG_MMAP_IFC if MMAP_FLAT_CODES else faiss.IO_FLAG_MMAP
+) | faiss.IO_FLAG_READ_ONLY
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+# Full-precision vectors kept next to a quantized index for re-ranking
+RERANK_VECTORS_FILE = "rerank_vectors.npy"
+
+
+def compute_index_key(source_paths: Iterable[str], **params) -> str:
+    """Hash the source files and build parameters into an artifact key."""
+    digest = hashlib.sha256()
+    digest.update(f"format={INDEX_FORMAT_VERSION}".encode())
+    for path in sorted(source_paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class IndexArtifactStore:
+    """Persists FAISS vector stores on disk for read-only, shared loading.
+
+    Each build is written to a temporary directory, renamed to a versioned
+    directory and published by atomically repointing the ``<key>`` symlink,
+    so workers never observe a half-written index and a rebuild replaces a
+    live one without a gap. Loaded stores memory-map the index, docstore and
+    re-rank vectors, so every worker shares one copy in the page cache.
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_INDEX_DIR, mmap: bool = INDEX_MMAP):
+        self.root_dir = os.path.abspath(root_dir)
+        self.mmap = mmap
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root_dir, key)
+
+    def resolve(self, key: str) -> str:
+        """Versioned directory the ``key`` link currently points at"""
+        return os.path.realpath(self.path_for(key))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path_for(key), MANIFEST_FILE))
+
+    def read_manifest(self, key: str) -> Dict:
+        with open(os.path.join(self.path_for(key), MANIFEST_FILE), 'r') as f:
+            return json.load(f)
+
+    def mmap_sharing(self, index) -> str:
+        """How much of a loaded ``index`` workers share: "full", "off", or
+        "partial" when its codes are copied into each worker"""
+        if not self.mmap:
+            return "off"
+        if MMAP_FLAT_CODES or faiss.try_extract_index_ivf(unwrap(index)) is not None:
+            return "full"
+        return "partial"
+
+    def load(self, key: str, embeddings) -> FAISS:
+        # Resolve once so every file comes from the same version
+        path = self.resolve(key)
+        flags = MMAP_FLAGS if self.mmap else 0
+        index = faiss.read_index(os.path.join(path, INDEX_FILE), flags)
+        if self.mmap_sharing(index) == "partial":
+            logger.warning(
+                "faiss %s cannot memory-map %s codes; each worker keeps its own copy of index %s",
+                faiss.__version__, type(index).__name__, key
+            )
+        mmap_mode = 'r' if self.mmap else None
+        rerank_path = os.path.join(path, RERANK_VECTORS_FILE)
+        if os.path.exists(rerank_path):
+            index = RerankIndex(index, np.load(rerank_path, mmap_mode=mmap_mode))
+        docstore = MmapDocstore(path)
+        return FAISS(embeddings, index, docstore, docstore.ids())
+
+    def save(
+        self,
+        key: str,
+        vector_store: FAISS,
+        manifest: Optional[Dict] = None,
+        replace: bool = True
+    ) -> str:
+        """Write ``vector_store`` and publish it as ``key``.
+
+        With ``replace=False`` an artifact another worker published first is
+        kept and this build is discarded.
+        """
+        os.makedirs(self.root_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.root_dir)
+        try:
+            index = vector_store.index
+            faiss.write_index(unwrap(index), os.path.join(tmp_dir, INDEX_FILE))
+            if isinstance(index, RerankIndex):
+                np.save(os.path.join(tmp_dir, RERANK_VECTORS_FILE), np.asarray(index.vectors))
+            write_docstore(tmp_dir, (
+                vector_store.docstore.search(vector_store.index_to_docstore_id[position])
+                for position in range(index.ntotal)
+            ))
+            version = f"{key}@{datetime.utcnow():%Y%m%dT%H%M%S%f}-{os.getpid()}"
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump({
+                    "key": key,
+                    "version": version,
+                    "format_version": INDEX_FORMAT_VERSION,
+                    "created_at": datetime.utcnow().isoformat(),
+                    "num_vectors": index.ntotal,
+                    **(manifest or {})
+                }, f, indent=2)
+            if not replace and self.exists(key):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return self.resolve(key)
+            version_dir = os.path.join(self.root_dir, version)
+            os.rename(tmp_dir, version_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self._publish(key, version)
+        return version_dir
+
+    def _publish(self, key: str, version: str) -> None:
+        link_tmp = os.path.join(self.root_dir, f".{key}.{os.getpid()}.link")
+        if os.path.lexists(link_tmp):
+            os.unlink(link_tmp)
+        os.symlink(version, link_tmp)
+        # rename() over an existing symlink is atomic
+        os.replace(link_tmp, self.path_for(key))
+
+    def load_or_build(
+        self,
+        key: str,
+        embeddings,
+        build_fn: Callable[[], FAISS],
+        manifest: Optional[Dict] = None,
+        force_rebuild: bool = False
+    ) -> FAISS:
+        """Map the artifact for ``key``, building it on a miss.
+
+        ``force_rebuild`` swaps a fresh build in for the current artifact;
+        workers still using the old one keep their mappings.
+        """
+        if not force_rebuild and self.exists(key):
+            logger.info("Loading vector index artifact %s", key)
+            return self.load(key, embeddings)
+
+        logger.info("Building vector index artifact %s", key)
+        self.save(key, build_fn(), manifest, replace=force_rebuild)
+        # Serve from the shared mapping, not the private copy just built
+        return self.load(key, embeddings)
+
+    def remove(self, key: str) -> None:
+        path = self.path_for(key)
+        if os.path.islink(path):
+            target = self.resolve(key)
+            os.unlink(path)
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Delete every artifact except the current versions of ``keep``.
+
+        Files still mapped by running workers stay readable until unmapped.
+        """
+        if not os.path.isdir(self.root_dir):
+            return
+        keep = set(keep)
+        keep |= {os.path.basename(self.resolve(key)) for key in keep if os.path.islink(self.path_for(key))}
+        for name in os.listdir(self.root_dir):
+            if name in keep or name.startswith('.'):
+                continue
+            path = os.path.join(self.root_dir, name)
+            if os.path.islink(path):
+                os.unlink(path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,38 @@
+import threading
+from collections import deque
+from typing import Dict
+
+
+class LatencyRecorder:
+    """Keeps the most recent latency samples and summarises them in milliseconds."""
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "avg_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "avg_ms": round(1000 * sum(samples) / len(samples), 2),
+            "p50_ms": round(1000 * percentile(samples, 50), 2),
+            "p99_ms": round(1000 * percentile(samples, 99), 2),
+            "max_ms": round(1000 * samples[-1], 2)
+        }
+
+
+def percentile(sorted_samples, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
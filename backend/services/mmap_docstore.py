@@ -0,0 +1,83 @@
+import json
+import mmap
+import os
+from collections.abc import Mapping
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+from langchain.docstore.base import Docstore
+from langchain.docstore.document import Document
+
+DOCSTORE_FILE = "docstore.bin"
+OFFSETS_FILE = "docstore.offsets.npy"
+
+
+def write_docstore(directory: str, documents: Iterable[Document]) -> int:
+    """Write documents as back-to-back JSON records plus an offsets array.
+
+    Record ``i`` spans ``offsets[i]:offsets[i + 1]`` of the data file, so a
+    reader can decode one document without parsing the rest.
+    """
+    offsets = [0]
+    with open(os.path.join(directory, DOCSTORE_FILE), 'wb') as f:
+        for doc in documents:
+            record = json.dumps(
+                {"page_content": doc.page_content, "metadata": doc.metadata},
+                separators=(',', ':')
+            ).encode('utf-8')
+            f.write(record)
+            offsets.append(offsets[-1] + len(record))
+    np.save(os.path.join(directory, OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+    return len(offsets) - 1
+
+
+class PositionIds(Mapping):
+    """``index_to_docstore_id`` for a docstore keyed by row position.
+
+    Answers lookups arithmetically instead of holding one dict entry per row.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __getitem__(self, position) -> str:
+        position = int(position)
+        if not 0 <= position < self.size:
+            raise KeyError(position)
+        return str(position)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.size))
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class MmapDocstore(Docstore):
+    """Read-only docstore over a memory-mapped file written by ``write_docstore``.
+
+    Documents are decoded on lookup from pages in the OS page cache, which
+    every worker process mapping the same file shares.
+    """
+
+    def __init__(self, directory: str):
+        self.offsets = np.load(os.path.join(directory, OFFSETS_FILE), mmap_mode='r')
+        with open(os.path.join(directory, DOCSTORE_FILE), 'rb') as f:
+            # mmap cannot map an empty file
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if len(self) else b""
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def search(self, search: Union[str, int]) -> Union[str, Document]:
+        try:
+            position = int(search)
+        except ValueError:
+            position = -1
+        if not 0 <= position < len(self):
+            return f"ID {search} not found."
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return Document(**json.loads(self._data[start:end]))
+
+    def ids(self) -> PositionIds:
+        return PositionIds(len(self))
@@ -0,0 +1,98 @@
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from .vector_index import unwrap
+
+PARTITIONED_RETRIEVAL = os.getenv("RAG_PARTITIONED_RETRIEVAL", "true").lower() == "true"
+# Fill up from the whole index when a partition yields fewer than k results
+PARTITION_FALLBACK = os.getenv("RAG_PARTITION_FALLBACK", "true").lower() == "true"
+
+PARTITION_FIELDS = ("type", "difficulty")
+
+# Chat question types mapped to the document types that can answer them
+QUESTION_TYPE_PARTITIONS = {
+    "technical": ["technical"],
+    "coding": ["technical"],
+    "system_design": ["technical"],
+    "behavioral": ["behavioral", "hr"],
+    "resume": ["hr", "behavioral"],
+    "hr": ["hr"]
+}
+
+
+def partition_filter(question_type=None, difficulty: Optional[str] = None) -> Dict[str, List[str]]:
+    """Metadata filter for a chat request; empty when nothing restricts it"""
+    filters = {}
+    question_type = getattr(question_type, "value", question_type)
+    if question_type in QUESTION_TYPE_PARTITIONS:
+        filters["type"] = QUESTION_TYPE_PARTITIONS[question_type]
+    if difficulty:
+        filters["difficulty"] = [difficulty]
+    return filters
+
+
+class PartitionIndex:
+    """Row positions of a FAISS store grouped by document metadata.
+
+    Searches restricted to a partition pass an ID selector to FAISS instead
+    of keeping a separate sub-index per partition, so vectors are stored once.
+    """
+
+    def __init__(self, metadatas: Sequence[Dict], fields: Iterable[str] = PARTITION_FIELDS):
+        self.fields = tuple(fields)
+        self.size = len(metadatas)
+        groups: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for position, metadata in enumerate(metadatas):
+            for field in self.fields:
+                if field in metadata:
+                    groups[(field, str(metadata[field]))].append(position)
+        self._groups = {key: np.asarray(rows, dtype=np.int64) for key, rows in groups.items()}
+        self._cache: Dict[Tuple, np.ndarray] = {}
+
+    @classmethod
+    def from_vector_store(cls, vector_store, fields: Iterable[str] = PARTITION_FIELDS) -> "PartitionIndex":
+        return cls([
+            vector_store.docstore.search(vector_store.index_to_docstore_id[position]).metadata
+            for position in range(vector_store.index.ntotal)
+        ], fields)
+
+    def positions(self, filters: Dict[str, Sequence[str]]) -> Optional[np.ndarray]:
+        """Sorted rows matching every field filter, or None for no restriction"""
+        filters = {field: values for field, values in filters.items() if field in self.fields and values}
+        if not filters:
+            return None
+        key = tuple(sorted((field, tuple(sorted(values))) for field, values in filters.items()))
+        if key not in self._cache:
+            rows = None
+            for field, values in filters.items():
+                matched = np.unique(np.concatenate([
+                    self._groups.get((field, str(value)), np.empty(0, dtype=np.int64))
+                    for value in values
+                ]))
+                rows = matched if rows is None else np.intersect1d(rows, matched)
+            self._cache[key] = rows
+        return self._cache[key]
+
+    def partitions(self) -> Dict[str, int]:
+        return {f"{field}={value}": len(rows) for (field, value), rows in self._groups.items()}
+
+
+def search_params(index: faiss.Index, positions: np.ndarray) -> faiss.SearchParameters:
+    """FAISS search parameters limiting results to ``positions``,
+    carrying over the index's own efSearch/nprobe settings"""
+    selector = faiss.IDSelectorBatch(positions)
+    index = unwrap(index)
+    ivf = faiss.try_extract_index_ivf(index)
+    if isinstance(index, faiss.IndexHNSW):
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    elif ivf is not None:
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    # The SWIG parameters object does not keep the selector alive by itself
+    params.referenced_objects = [selector]
+    return params
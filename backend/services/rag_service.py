@@ -1,27 +1,103 @@
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
+from dataclasses import dataclass, field
 import os
 import json
+import logging
+import time
 from langchain.llms import OpenAI
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores import FAISS
-from langchain.chains import RetrievalQA
+from langchain.chains.question_answering import load_qa_chain
+from langchain.chains.question_answering.stuff_prompt import PROMPT as STUFF_PROMPT
+from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+from .answer_store import PREGENERATED_ANSWERS, PregeneratedAnswerStore
+from .bm25_index import HybridResult, HybridSearcher
+from .concurrency import BoundedExecutor
+from .context_assembler import AssembledContext, ContextAssembler
+from .embedding_cache import CachedEmbeddings
+from .partitions import PARTITIONED_RETRIEVAL, partition_filter
+from .index_store import IndexArtifactStore, compute_index_key
+from .semantic_cache import SemanticAnswerCache, normalize_question
+from .single_flight import SingleFlight
+from .topic_tagger import DEFAULT_TAXONOMY_PATH, get_default_tagger
+from .vector_index import IndexSpec, build_config, build_vector_store, configure_search
+
+QUESTION_SOURCES = {
+    'technical': os.path.join('AI-interview-chatbot-main', 'data', 'technical_questions.json'),
+    'behavioral': os.path.join('AI-interview-chatbot-main', 'data', 'behavioral_questions.json'),
+    'hr': os.path.join('AI-interview-chatbot-main', 'data', 'hr_questions.json')
+}
+
+CHUNK_SIZE = 500  # Smaller chunks
+CHUNK_OVERLAP = 50  # Less overlap
+MAX_QUESTIONS_PER_TYPE = 100  # Limit number of questions for free tier
+
+# One search per request serves every consumer of the retrieved documents
+RETRIEVAL_K = 5
+ANSWER_K = 4
+CONTEXT_K = 3
+
+# How often a worker checks whether a rebuild swapped in a new index artifact
+INDEX_RELOAD_INTERVAL_SECONDS = float(os.getenv("RAG_INDEX_RELOAD_INTERVAL_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RetrievalResult:
+    """Documents retrieved for a single query, best match first"""
+    query: str
+    # None when the keyword fast path answered without embedding the query
+    query_embedding: Optional[List[float]]
+    documents: List[Document] = field(default_factory=list)
+    # Fused keyword/vector relevance in [0, 1], higher is closer
+    scores: List[float] = field(default_factory=list)
+    keyword_only: bool = False
+
+    def top(self, k: int) -> List[Document]:
+        return self.documents[:k]
+
+    def similarities(self, k: int) -> List[float]:
+        return self.scores[:k]
+
 class RAGService:
-    def __init__(self):
+    def __init__(self, load_index: bool = True):
         self.llm = OpenAI(
             api_key=os.getenv("OPENAI_API_KEY"),
             temperature=0.7,
             max_tokens=150  # Limit token usage
         )
-        self.embeddings = OpenAIEmbeddings(
+        self.embeddings = CachedEmbeddings(OpenAIEmbeddings(
             api_key=os.getenv("OPENAI_API_KEY")
-        )
+        ))
         self.vector_store = None
+        self.searcher = None
+        self.index_store = IndexArtifactStore()
+        self.index_key = None
+        # Versioned artifact directory the loaded index was mapped from
+        self.index_path = None
+        self._index_checked_at = 0.0
+        self.answer_cache = (
+            SemanticAnswerCache()
+            if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true" else None
+        )
+        # Answers generated offline for catalog questions by pregenerate_answers.py
+        self.pregenerated = PregeneratedAnswerStore() if PREGENERATED_ANSWERS else None
+        # Built once; documents and question are the only per-request inputs
+        self._chains = {}
+        # Blocking LangChain/OpenAI calls run here instead of on the event loop
+        self.executor = BoundedExecutor()
+        # Identical questions arriving together share one embedding and LLM call
+        self.single_flight = SingleFlight()
+        # Deduplicates retrieved chunks and caps the prompt context per role
+        self.context_assembler = ContextAssembler(chunk_overlap=CHUNK_OVERLAP)
+        self.topic_tagger = get_default_tagger()
         self.questions = self.load_questions()
         self.evaluation_criteria = self.load_evaluation_criteria()
         self.sample_responses = self.load_sample_responses()
-        self.initialize_vector_store()
+        if load_index:
+            self.initialize_vector_store()
 
     def load_questions(self) -> Dict:
         questions = {
@@ -31,20 +107,17 @@ class RAGService:
         }
         
         # Load technical questions
-        tech_path = os.path.join('AI-interview-chatbot-main', 'data', 'technical_questions.json')
-        with open(tech_path, 'r') as f:
+        with open(QUESTION_SOURCES['technical'], 'r') as f:
             tech_data = json.load(f)
             questions['technical'] = tech_data['questions']
 
         # Load behavioral questions
-        behav_path = os.path.join('AI-interview-chatbot-main', 'data', 'behavioral_questions.json')
-        with open(behav_path, 'r') as f:
+        with open(QUESTION_SOURCES['behavioral'], 'r') as f:
             behav_data = json.load(f)
             questions['behavioral'] = behav_data['behavioral_questions']
 
         # Load HR questions
-        hr_path = os.path.join('AI-interview-chatbot-main', 'data', 'hr_questions.json')
-        with open(hr_path, 'r') as f:
+        with open(QUESTION_SOURCES['hr'], 'r') as f:
             questions['hr'] = json.load(f)
 
         return questions
@@ -57,65 +130,325 @@ class RAGService:
         with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_responses.json'), 'r') as f:
             return json.load(f)
 
-    def initialize_vector_store(self):
+    def get_index_key(self) -> str:
+        """Key of the index artifact matching the current sources and settings"""
+        return compute_index_key(
+            list(QUESTION_SOURCES.values()) + [DEFAULT_TAXONOMY_PATH],
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            max_questions_per_type=MAX_QUESTIONS_PER_TYPE,
+            embedding_model=self.embeddings.model,
+            index=build_config()
+        )
+
+    def initialize_vector_store(self, force_rebuild: bool = False) -> str:
+        # Reuse the persisted index when sources, chunking and model are unchanged
+        self.index_key = self.get_index_key()
+        vector_store = self.index_store.load_or_build(
+            self.index_key,
+            self.embeddings,
+            self.build_vector_store,
+            manifest={
+                "sources": list(QUESTION_SOURCES.values()),
+                "embedding_model": self.embeddings.model
+            },
+            force_rebuild=force_rebuild
+        )
+        self._use_vector_store(vector_store, self.index_store.resolve(self.index_key))
+        return self.index_key
+
+    def _use_vector_store(self, vector_store: FAISS, index_path: str) -> None:
+        configure_search(vector_store.index, IndexSpec())
+        # Keyword index over the same chunks, row for row
+        searcher = HybridSearcher(vector_store)
+        self.index_path = index_path
+        self._index_checked_at = time.monotonic()
+        # Requests in flight keep the old store alive until they finish
+        self.vector_store, self.searcher = vector_store, searcher
+
+    def reload_if_swapped(self) -> bool:
+        """Map the current artifact if a rebuild has swapped it in"""
+        if self.index_key is None or time.monotonic() - self._index_checked_at < INDEX_RELOAD_INTERVAL_SECONDS:
+            return False
+        self._index_checked_at = time.monotonic()
+        index_path = self.index_store.resolve(self.index_key)
+        if index_path == self.index_path:
+            return False
+        logger.info("Index artifact %s was rebuilt, reloading", self.index_key)
+        self._use_vector_store(self.index_store.load(self.index_key, self.embeddings), index_path)
+        return True
+
+    def build_documents(self) -> List[Document]:
         # Convert questions and responses into documents for the vector store
         documents = []
         
         # Process all question types (limit to 100 questions for free tier)
         for q_type, questions in self.questions.items():
-            for q in questions[:100]:  # Limit number of questions
-                doc = {
-                    "content": f"Question Type: {q_type}\nQuestion: {q['question']}\nAnswer: {q['answer']}\nDifficulty: {q['difficulty']}\nFeedback: {q['feedback']}",
-                    "metadata": {
+            for q in questions[:MAX_QUESTIONS_PER_TYPE]:
+                documents.append(Document(
+                    page_content=f"Question Type: {q_type}\nQuestion: {q['question']}\nAnswer: {q['answer']}\nDifficulty: {q['difficulty']}\nFeedback: {q['feedback']}",
+                    metadata={
                         "id": q['candidate_id'],
                         "type": q_type,
                         "difficulty": q['difficulty'],
                         "score": q['score']
                     }
-                }
-                documents.append(doc)
-        
+                ))
+        return documents
+
+    def build_vector_store(self) -> FAISS:
         # Create text splitter with smaller chunks
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,  # Smaller chunks
-            chunk_overlap=50  # Less overlap
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP
         )
         
         # Split documents
-        texts = text_splitter.split_documents(documents)
+        texts = text_splitter.split_documents(self.build_documents())
+
+        # Tag topics once here so requests only read them from metadata
+        for chunk in texts:
+            chunk.metadata["topics"] = self.topic_tagger.tag(chunk.page_content)
         
-        # Create vector store
-        self.vector_store = FAISS.from_documents(texts, self.embeddings)
-
-    def get_response(self, question: str, role: str, question_type: str) -> Dict:
-        # Create retrieval chain
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            chain_type="stuff",
-            retriever=self.vector_store.as_retriever()
+        # Create vector store; flat, HNSW or IVF depending on corpus size
+        # Saved as an artifact, whose loads map the re-rank vectors
+        return build_vector_store(texts, self.embeddings, rerank=True)
+
+    def retrieve(
+        self,
+        question: str,
+        k: int = RETRIEVAL_K,
+        query_embedding: Optional[List[float]] = None,
+        filters: Optional[Dict[str, List[str]]] = None
+    ) -> RetrievalResult:
+        # One hybrid search; the query is only embedded if keywords are not decisive
+        return self._to_retrieval(question, self.searcher.search(
+            question, k,
+            query_embedding=query_embedding,
+            embed_fn=self.embeddings.embed_query,
+            filters=filters
+        ))
+
+    @staticmethod
+    def _to_retrieval(question: str, result: HybridResult) -> RetrievalResult:
+        return RetrievalResult(
+            query=question,
+            query_embedding=result.query_embedding,
+            documents=result.documents,
+            scores=result.scores,
+            keyword_only=result.keyword_only
         )
-        
-        # Get response
+
+    def get_qa_chain(self, chain_type: str = "stuff"):
+        if chain_type not in self._chains:
+            self._chains[chain_type] = load_qa_chain(llm=self.llm, chain_type=chain_type)
+        return self._chains[chain_type]
+
+    def build_query(self, question: str, role: str, question_type: str) -> str:
         context = f"You are an AI interview assistant helping a {role} developer with a {question_type} question."
-        query = f"Context: {context}\nQuestion: {question}\nProvide a detailed answer with examples if applicable."
-        
-        response = qa_chain.run(query)
+        return f"Context: {context}\nQuestion: {question}\nProvide a detailed answer with examples if applicable."
+
+    def assemble_context(self, retrieval: RetrievalResult, role: str) -> AssembledContext:
+        return self.context_assembler.assemble(
+            retrieval.top(ANSWER_K), retrieval.similarities(ANSWER_K), role
+        )
+
+    def build_prompt(self, context: AssembledContext, query: str) -> str:
+        return STUFF_PROMPT.format(context=context.text, question=query)
+
+    def lookup_pregenerated(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> Optional[Dict]:
+        if self.pregenerated is None or self.index_key is None:
+            return None
+        # Not reload_if_swapped(): this runs on the event loop, and a swapped
+        # artifact keeps its index_key, the only part of the answer key it sets
+        response = self.pregenerated.get(self.index_key, role, question_type, difficulty, question)
+        return None if response is None else {**response, "prompt_tokens": 0}
+
+    @staticmethod
+    def _cache_bucket(question_type: str, difficulty: Optional[str]) -> str:
+        # Answers grounded in one difficulty are not reused for another
+        return f"{question_type}:{difficulty}" if difficulty else question_type
+
+    def prepare(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> Tuple[Optional[Dict], Optional[RetrievalResult]]:
+        """Return a cached answer, or the retrieval to answer from"""
+        self.reload_if_swapped()
+        # Only search chunks of the matching question type and difficulty
+        filters = partition_filter(question_type, difficulty) if PARTITIONED_RETRIEVAL else None
+        cache_bucket = self._cache_bucket(question_type, difficulty)
+
+        # Exact keyword matches are retrieved without an embedding call
+        retrieval = self.searcher.keyword_match(question, RETRIEVAL_K, filters)
+        query_embedding = None
+        if retrieval is None:
+            query_embedding = self.embeddings.embed_query(question)
+
+        # Near-identical questions for the same role and type reuse a stored answer
+        if self.answer_cache is not None:
+            cached = self.answer_cache.get(role, cache_bucket, query_embedding, question)
+            if cached is not None:
+                return {**cached, "prompt_tokens": 0}, None
+
+        if retrieval is not None:
+            return None, self._to_retrieval(question, retrieval)
+        return None, self.retrieve(question, query_embedding=query_embedding, filters=filters)
+
+    def get_response(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> Dict:
+        pregenerated = self.lookup_pregenerated(question, role, question_type, difficulty)
+        if pregenerated is not None:
+            return pregenerated
+        return self.generate_response(question, role, question_type, difficulty)
+
+    def generate_response(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> Dict:
+        """Answer through retrieval and the LLM, skipping pre-generated answers"""
+        cached, retrieval = self.prepare(question, role, question_type, difficulty)
+        if cached is not None:
+            return cached
+
+        context = self.assemble_context(retrieval, role)
+
+        # Answer from the retrieved documents instead of letting a retriever search again
+        qa_chain = self.get_qa_chain("stuff")
         
+        # Get response
+        query = self.build_query(question, role, question_type)
+        response = qa_chain.run(input_documents=context.documents, question=query)
+        prompt_tokens = self.context_assembler.count_tokens(self.build_prompt(context, query))
+
+        return self._finish_response(
+            question, role, question_type, retrieval, response, prompt_tokens, difficulty
+        )
+
+    def _finish_response(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        retrieval: RetrievalResult,
+        answer: str,
+        prompt_tokens: int = 0,
+        difficulty: Optional[str] = None
+    ) -> Dict:
         # Get relevant documents for context
-        docs = self.vector_store.similarity_search(question, k=3)
+        docs = retrieval.top(CONTEXT_K)
         context_used = [doc.page_content for doc in docs]
         
         # Calculate confidence score based on similarity to existing questions
         confidence_score = self.calculate_confidence_score(question, docs)
         
         # Get suggested topics based on the role and question type
-        suggested_topics = self.get_suggested_topics(question, role, question_type)
+        suggested_topics = self.get_suggested_topics(
+            question, role, question_type, retrieval.top(RETRIEVAL_K)
+        )
         
-        return {
-            "answer": response,
+        result = {
+            "answer": answer,
             "context_used": context_used,
             "confidence_score": confidence_score,
-            "suggested_topics": suggested_topics
+            "suggested_topics": suggested_topics,
+            "prompt_tokens": prompt_tokens
+        }
+        if self.answer_cache is not None:
+            # Keyword fast-path answers have no embedding and are only reused
+            # for the same normalized question; embedding them here would put
+            # the call the fast path skips back on the request
+            self.answer_cache.put(
+                role, self._cache_bucket(question_type, difficulty),
+                retrieval.query_embedding, question, result
+            )
+        return result
+
+    async def aget_response(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> Dict:
+        # Catalog questions are answered inline, without queueing for a worker thread
+        pregenerated = self.lookup_pregenerated(question, role, question_type, difficulty)
+        if pregenerated is not None:
+            return pregenerated
+
+        key = (str(role), str(question_type), difficulty, normalize_question(question))
+        response = await self.single_flight.do(
+            key,
+            lambda: self.executor.run(self.generate_response, question, role, question_type, difficulty)
+        )
+        return dict(response)
+
+    async def astream_response(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        difficulty: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield ``token`` events as the LLM generates, then one ``done`` event
+        carrying the full answer, context and suggested topics."""
+        cached = self.lookup_pregenerated(question, role, question_type, difficulty)
+        retrieval = None
+        if cached is None:
+            cached, retrieval = await self.executor.run(
+                self.prepare, question, role, question_type, difficulty
+            )
+        if cached is not None:
+            yield {"type": "token", "token": cached["answer"]}
+            yield {"type": "done", **cached}
+            return
+
+        context = self.assemble_context(retrieval, role)
+        prompt = self.build_prompt(context, self.build_query(question, role, question_type))
+        prompt_tokens = self.context_assembler.count_tokens(prompt)
+
+        tokens = []
+        async with self.executor.slot():
+            async for token in self.llm.astream(prompt):
+                tokens.append(token)
+                yield {"type": "token", "token": token}
+
+        result = self._finish_response(
+            question, role, question_type, retrieval, "".join(tokens), prompt_tokens, difficulty
+        )
+        yield {"type": "done", **result}
+
+    def get_stats(self) -> Dict:
+        return {
+            "executor": self.executor.stats(),
+            "single_flight": self.single_flight.stats(),
+            "pregenerated": self.pregenerated.stats() if self.pregenerated else None,
+            "answer_cache": self.answer_cache.stats() if self.answer_cache else None,
+            "context": self.context_assembler.stats(),
+            "retrieval": self.searcher.stats() if self.searcher else None,
+            "index": {
+                "key": self.index_key,
+                "path": self.index_path,
+                "mmap_sharing": self.index_store.mmap_sharing(self.vector_store.index)
+            } if self.vector_store is not None else None,
+            "embedding_cache": self.embeddings.cache.stats()
         }
 
     def calculate_confidence_score(self, question: str, similar_docs: List) -> float:
@@ -127,27 +460,20 @@ class RAGService:
         scores = [doc.metadata.get('score', 0) for doc in similar_docs if 'score' in doc.metadata]
         return sum(scores) / len(scores) if scores else 0.7
 
-    def get_suggested_topics(self, question: str, role: str, question_type: str) -> List[str]:
-        # Get similar questions and extract their topics
-        similar_docs = self.vector_store.similarity_search(question, k=5)
-        topics = set()
-        
+    def get_suggested_topics(
+        self,
+        question: str,
+        role: str,
+        question_type: str,
+        similar_docs: List[Document]
+    ) -> List[str]:
+        # Topics were tagged into chunk metadata when the index was built
+        topics = {}
         for doc in similar_docs:
-            # Extract topics from the content
-            content = doc.page_content.lower()
-            if 'react' in content:
-                topics.add('React')
-            if 'javascript' in content:
-                topics.add('JavaScript')
-            if 'python' in content:
-                topics.add('Python')
-            if 'database' in content or 'sql' in content:
-                topics.add('Databases')
-            if 'algorithm' in content:
-                topics.add('Algorithms')
-            if 'system design' in content:
-                topics.add('System Design')
-            if 'machine learning' in content or 'ai' in content:
-                topics.add('Machine Learning')
+            doc_topics = doc.metadata.get("topics")
+            if doc_topics is None:
+                doc_topics = self.topic_tagger.tag(doc.page_content)
+            for topic in doc_topics:
+                topics[topic] = None
             
-        return list(topics) 
\ No newline at end of file
+        return list(topics)
@@ -0,0 +1,164 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+DEFAULT_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+
+
+def normalize_question(question: str) -> str:
+    return re.sub(r'\s+', ' ', question).strip().strip('?!. ').lower()
+
+
+@dataclass
+class _Entry:
+    bucket: Tuple[str, str]
+    question: str
+    vector: Optional[np.ndarray]
+    response: Dict
+    expires_at: float
+
+
+class SemanticAnswerCache:
+    """Answer cache for chat questions keyed by (role, question type, query embedding).
+
+    A lookup hits when a stored question in the same role/type bucket has the
+    same normalized text, or an embedding whose cosine similarity to the query
+    is at least ``threshold``. Entries expire after ``ttl_seconds`` and the
+    least recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_question: Dict[Tuple[str, str, str], int] = {}
+        self._next_id = 0
+        # Per-bucket stacked unit vectors, rebuilt lazily after changes
+        self._matrices: Dict[Tuple[str, str], Tuple[np.ndarray, list]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _bucket_matrix(self, bucket: Tuple[str, str]) -> Tuple[np.ndarray, list]:
+        if bucket not in self._matrices:
+            ids = [
+                entry_id for entry_id, entry in self._entries.items()
+                if entry.bucket == bucket and entry.vector is not None
+            ]
+            matrix = (
+                np.stack([self._entries[i].vector for i in ids])
+                if ids else np.empty((0, 0), dtype=np.float32)
+            )
+            self._matrices[bucket] = (matrix, ids)
+        return self._matrices[bucket]
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        self._by_question.pop((*entry.bucket, entry.question), None)
+        self._matrices.pop(entry.bucket, None)
+
+    def _find(self, bucket, question, embedding) -> Optional[int]:
+        if question is not None:
+            entry_id = self._by_question.get((*bucket, normalize_question(question)))
+            if entry_id is not None:
+                return entry_id
+        if embedding is None:
+            return None
+        matrix, ids = self._bucket_matrix(bucket)
+        if not ids:
+            return None
+        similarities = matrix @ self._unit(embedding)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return ids[best]
+        return None
+
+    def get(
+        self,
+        role: str,
+        question_type: str,
+        embedding: Optional[Sequence[float]] = None,
+        question: Optional[str] = None
+    ) -> Optional[Dict]:
+        bucket = (str(role), str(question_type))
+        now = time.monotonic()
+        with self._lock:
+            entry_id = self._find(bucket, question, embedding)
+            if entry_id is not None and self._entries[entry_id].expires_at <= now:
+                self._remove(entry_id)
+                entry_id = self._find(bucket, question, embedding)
+            if entry_id is None or self._entries[entry_id].expires_at <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return dict(self._entries[entry_id].response)
+
+    def put(
+        self,
+        role: str,
+        question_type: str,
+        embedding: Optional[Sequence[float]],
+        question: str,
+        response: Dict
+    ) -> None:
+        bucket = (str(role), str(question_type))
+        with self._lock:
+            existing = self._find(bucket, question, None)
+            if existing is not None:
+                self._remove(existing)
+            now = time.monotonic()
+            for entry_id in [i for i, e in self._entries.items() if e.expires_at <= now]:
+                self._remove(entry_id)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            normalized = normalize_question(question)
+            self._entries[self._next_id] = _Entry(
+                bucket=bucket,
+                question=normalized,
+                vector=None if embedding is None else self._unit(embedding),
+                response=dict(response),
+                expires_at=now + self.ttl_seconds
+            )
+            self._by_question[(*bucket, normalized)] = self._next_id
+            self._next_id += 1
+            self._matrices.pop(bucket, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_question.clear()
+            self._matrices.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries)
+        }
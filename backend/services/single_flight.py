@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .metrics import LatencyRecorder
+
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("RAG_SINGLE_FLIGHT_TIMEOUT_SECONDS", "60"))
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task, timeout: float):
+        self.task = task
+        self.deadline = time.monotonic() + timeout
+        self.waiters = 1
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one computation.
+
+    The first caller for a key starts ``fn``; callers arriving while it is in
+    flight await the same result instead of starting their own. Every caller
+    waits at most the key's ``timeout``. A flight past its deadline is no
+    longer joined, so a stuck call cannot hold up later requests.
+    """
+
+    def __init__(self, timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS):
+        self.timeout_seconds = timeout_seconds
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.flights = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.max_waiters = 0
+        self.duration = LatencyRecorder()
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Any:
+        timeout = self.timeout_seconds if timeout is None else timeout
+        flight = self._flights.get(key)
+        if flight is not None and time.monotonic() < flight.deadline:
+            flight.waiters += 1
+            self.coalesced += 1
+            self.max_waiters = max(self.max_waiters, flight.waiters)
+        else:
+            task = asyncio.ensure_future(self._run(key, fn))
+            # Consume the result even if every caller has timed out
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            flight = _Flight(task, timeout)
+            self._flights[key] = flight
+            self.flights += 1
+
+        try:
+            # Shield so one caller timing out does not cancel the shared call
+            return await asyncio.wait_for(
+                asyncio.shield(flight.task), max(0.0, flight.deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            raise
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            self.duration.record(time.perf_counter() - started_at)
+            flight = self._flights.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.flights + self.coalesced
+        return {
+            "flights": self.flights,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / calls if calls else 0.0,
+            "max_waiters": self.max_waiters,
+            "timeouts": self.timeouts,
+            "in_flight": len(self._flights),
+            "duration": self.duration.summary()
+        }
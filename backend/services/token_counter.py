@@ -0,0 +1,50 @@
+import logging
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Rough stand-in when the BPE files cannot be fetched (e.g. offline CI)
+_APPROX_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str = DEFAULT_MODEL) -> Optional["tiktoken.Encoding"]:
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning("tiktoken encoding unavailable, approximating token counts")
+        return None
+
+
+def _approx_tokens(text: str) -> List[str]:
+    return _APPROX_TOKEN_RE.findall(text)
+
+
+def count_tokens(text: str, model_name: str = DEFAULT_MODEL) -> int:
+    encoding = get_encoding(model_name)
+    if encoding is None:
+        return len(_approx_tokens(text))
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: str = DEFAULT_MODEL) -> str:
+    """Cut ``text`` down to at most ``max_tokens`` tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding(model_name)
+    if encoding is None:
+        matches = list(_APPROX_TOKEN_RE.finditer(text))
+        return text if len(matches) <= max_tokens else text[:matches[max_tokens].start()].rstrip()
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
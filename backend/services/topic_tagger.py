@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "RAG_TOPIC_TAXONOMY",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'topic_taxonomy.json')
+)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class TopicTagger:
+    """Tags text with taxonomy topics using an Aho-Corasick automaton.
+
+    All keywords are matched in a single pass over the text. A keyword only
+    counts as a whole word, so "ai" does not match inside "maintain".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.topics = list(taxonomy)
+        # Trie as parallel arrays: child transitions, failure link, matches ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, int]]] = [[]]
+        for topic_id, keywords in enumerate(taxonomy.values()):
+            for keyword in keywords:
+                self._add(keyword.lower(), topic_id)
+        self._link()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "TopicTagger":
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def _add(self, keyword: str, topic_id: int) -> None:
+        node = 0
+        for char in keyword:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._output[node].append((topic_id, len(keyword)))
+
+    def _link(self) -> None:
+        # Breadth-first so each node's failure target is already linked
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def tag(self, text: str) -> List[str]:
+        """Topics found in ``text``, in order of first occurrence"""
+        text = text.lower()
+        found: Dict[int, None] = {}
+        node = 0
+        for end, char in enumerate(text, start=1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for topic_id, length in self._output[node]:
+                if topic_id in found:
+                    continue
+                start = end - length
+                if (start == 0 or not _is_word_char(text[start - 1])) and (
+                    end == len(text) or not _is_word_char(text[end])
+                ):
+                    found[topic_id] = None
+        return [self.topics[topic_id] for topic_id in found]
+
+
+@lru_cache(maxsize=None)
+def get_default_tagger(path: str = DEFAULT_TAXONOMY_PATH) -> TopicTagger:
+    """The taxonomy tagger, or one that tags nothing if the taxonomy is missing"""
+    if not os.path.exists(path):
+        logger.warning("Topic taxonomy %s not found; chunks will not be tagged", path)
+        return TopicTagger({})
+    return TopicTagger.from_file(path)
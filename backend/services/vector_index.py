@@ -0,0 +1,250 @@
+import logging
+import math
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+import faiss
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.vectorstores import FAISS
+
+logger = logging.getLogger(__name__)
+
+# "auto" picks by corpus size; "flat", "ivf" or "hnsw" force a type
+INDEX_TYPE = os.getenv("RAG_INDEX_TYPE", "auto")
+# Below this many vectors exact search is fast enough
+FLAT_MAX_VECTORS = int(os.getenv("RAG_FLAT_MAX_VECTORS", "20000"))
+# Above this many vectors HNSW graphs get too large to keep resident, use IVF
+HNSW_MAX_VECTORS = int(os.getenv("RAG_HNSW_MAX_VECTORS", "1000000"))
+
+HNSW_M = int(os.getenv("RAG_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_HNSW_EF_CONSTRUCTION", "80"))
+HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "16"))
+
+# Vector codes kept in the index: "none" (float32), "fp16", "sq8" or "pq"
+QUANTIZATION = os.getenv("RAG_QUANTIZATION", "none")
+# Product quantizer sub-vectors; 0 picks dim / 8
+PQ_M = int(os.getenv("RAG_PQ_M", "0"))
+# Quantized searches fetch k * factor candidates and re-rank them exactly
+RERANK_FACTOR = int(os.getenv("RAG_RERANK_FACTOR", "4"))
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+QUANTIZATIONS = ("none", "fp16", "sq8", "pq")
+# 8-bit PQ codebooks need ~39 training points per centroid
+PQ_MIN_TRAIN = 256 * 39
+
+
+@dataclass
+class IndexSpec:
+    """Index type plus its build and query-time parameters"""
+    index_type: str = "flat"
+    hnsw_m: int = HNSW_M
+    hnsw_ef_construction: int = HNSW_EF_CONSTRUCTION
+    hnsw_ef_search: int = HNSW_EF_SEARCH
+    ivf_nlist: int = 0
+    ivf_nprobe: int = IVF_NPROBE
+    quantization: str = QUANTIZATION
+    pq_m: int = PQ_M
+    rerank_factor: int = RERANK_FACTOR
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def build_config() -> Dict:
+    """Settings that change how an index is built, for artifact keys"""
+    return {
+        "index_type": INDEX_TYPE,
+        "flat_max_vectors": FLAT_MAX_VECTORS,
+        "hnsw_max_vectors": HNSW_MAX_VECTORS,
+        "hnsw_m": HNSW_M,
+        "hnsw_ef_construction": HNSW_EF_CONSTRUCTION,
+        "quantization": QUANTIZATION,
+        "pq_m": PQ_M
+    }
+
+
+def choose_index_spec(num_vectors: int, index_type: Optional[str] = None, **params) -> IndexSpec:
+    """Pick an index type for ``num_vectors`` unless ``index_type`` forces one"""
+    index_type = (index_type or INDEX_TYPE).lower()
+    if index_type == "auto":
+        if num_vectors <= FLAT_MAX_VECTORS:
+            index_type = "flat"
+        elif num_vectors <= HNSW_MAX_VECTORS:
+            index_type = "hnsw"
+        else:
+            index_type = "ivf"
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    spec = IndexSpec(index_type=index_type, **params)
+    if spec.index_type == "ivf" and not spec.ivf_nlist:
+        # ~4 * sqrt(n) lists, keeping enough training points per centroid
+        spec.ivf_nlist = max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+    if spec.quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {spec.quantization}")
+    if spec.quantization == "pq" and (num_vectors < PQ_MIN_TRAIN or spec.index_type == "hnsw"):
+        # Too few vectors to train codebooks, and HNSW over PQ codes builds very slowly
+        logger.info("Using sq8 instead of pq for %d vectors (%s)", num_vectors, spec.index_type)
+        spec.quantization = "sq8"
+    return spec
+
+
+def factory_string(dim: int, spec: IndexSpec) -> str:
+    code = {
+        "none": "Flat",
+        "fp16": "SQfp16",
+        "sq8": "SQ8",
+        "pq": f"PQ{spec.pq_m or dim // 8}"
+    }[spec.quantization]
+    if spec.index_type == "hnsw":
+        return f"HNSW{spec.hnsw_m}" if code == "Flat" else f"HNSW{spec.hnsw_m}_{code}"
+    if spec.index_type == "ivf":
+        return f"IVF{spec.ivf_nlist},{code}"
+    return code
+
+
+def make_index(dim: int, spec: IndexSpec) -> faiss.Index:
+    # L2 on unit-length embeddings, so distances stay comparable across types
+    if spec.quantization != "none":
+        index = faiss.index_factory(dim, factory_string(dim, spec), faiss.METRIC_L2)
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efConstruction = spec.hnsw_ef_construction
+    elif spec.index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, spec.hnsw_m)
+        index.hnsw.efConstruction = spec.hnsw_ef_construction
+    elif spec.index_type == "ivf":
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, spec.ivf_nlist)
+    else:
+        index = faiss.IndexFlatL2(dim)
+    configure_search(index, spec)
+    return index
+
+
+def configure_search(index: faiss.Index, spec: IndexSpec) -> None:
+    """Apply query-time parameters, which are not all persisted with the index"""
+    if isinstance(index, RerankIndex):
+        index.rerank_factor = spec.rerank_factor
+        index = index.index
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = spec.hnsw_ef_search
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = spec.ivf_nprobe
+
+
+class RerankIndex:
+    """Quantized FAISS index whose top candidates are re-scored exactly.
+
+    Searches fetch ``k * rerank_factor`` candidates from the compact index and
+    order them by true L2 distance to full-precision ``vectors``. A freshly
+    built index keeps them in memory; one loaded from an index artifact maps
+    them from the artifact, so they live in the shared page cache rather than
+    in each worker's heap. Other attributes are those of the wrapped index.
+    """
+
+    def __init__(self, index: faiss.Index, vectors: np.ndarray, rerank_factor: int = RERANK_FACTOR):
+        self.index = index
+        self.vectors = vectors
+        self.rerank_factor = rerank_factor
+
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+    def search(self, x: np.ndarray, k: int, params=None):
+        fetch_k = min(self.index.ntotal, max(k, k * self.rerank_factor))
+        if params is None:
+            _, candidates = self.index.search(x, fetch_k)
+        else:
+            _, candidates = self.index.search(x, fetch_k, params=params)
+        distances = np.full((len(x), k), np.inf, dtype=np.float32)
+        positions = np.full((len(x), k), -1, dtype=np.int64)
+        for row, query in enumerate(x):
+            found = np.sort(candidates[row][candidates[row] >= 0])
+            exact = ((np.asarray(self.vectors[found]) - query) ** 2).sum(axis=1)
+            best = np.argsort(exact)[:k]
+            distances[row, :len(best)] = exact[best]
+            positions[row, :len(best)] = found[best]
+        return distances, positions
+
+
+def unwrap(index) -> faiss.Index:
+    """The FAISS index itself, without a re-ranking wrapper"""
+    return index.index if isinstance(index, RerankIndex) else index
+
+
+def index_memory_bytes(index) -> int:
+    """Resident size of an index's codes and structures; re-rank vectors are not counted"""
+    index = unwrap(index)
+    if isinstance(index, faiss.IndexHNSW):
+        hnsw = index.hnsw
+        graph = 4 * hnsw.neighbors.size() + 4 * hnsw.levels.size() + 8 * hnsw.offsets.size()
+        return index_memory_bytes(faiss.downcast_index(index.storage)) + graph
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        # Inverted lists hold a code and an int64 id per vector
+        return ivf.ntotal * (ivf.code_size + 8) + index_memory_bytes(faiss.downcast_index(ivf.quantizer))
+    return index.ntotal * index.sa_code_size()
+
+
+def build_index(vectors: np.ndarray, spec: IndexSpec, rerank: bool = True):
+    """Build a FAISS index; quantized ones are wrapped for exact re-ranking
+    unless ``rerank`` is False"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = make_index(vectors.shape[1], spec)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    if spec.quantization != "none" and rerank:
+        # Saving the store writes these next to the index, where loads map them
+        return RerankIndex(index, vectors, spec.rerank_factor)
+    return index
+
+
+def build_vector_store(
+    documents: Sequence[Document],
+    embeddings,
+    spec: Optional[IndexSpec] = None,
+    rerank: bool = False
+) -> FAISS:
+    """``FAISS.from_documents`` with the index type chosen by ``spec``
+
+    Only pass ``rerank=True`` for stores saved to an :class:`IndexArtifactStore`:
+    the full-precision re-rank vectors stay on the heap until a load maps them
+    from the artifact, so an in-memory store would outweigh an unquantized one.
+    """
+    documents = list(documents)
+    spec = spec or choose_index_spec(len(documents))
+    vectors = np.asarray(
+        embeddings.embed_documents([doc.page_content for doc in documents]), dtype=np.float32
+    )
+    logger.info("Building %s index over %d vectors", spec.index_type, len(documents))
+    index = build_index(vectors, spec, rerank=rerank)
+
+    ids = [str(uuid.uuid4()) for _ in documents]
+    return FAISS(
+        embeddings,
+        index,
+        InMemoryDocstore(dict(zip(ids, documents))),
+        dict(enumerate(ids))
+    )
+
+
+def build_vector_store_from_texts(
+    texts: List[str],
+    embeddings,
+    metadatas: Optional[List[Dict]] = None,
+    spec: Optional[IndexSpec] = None,
+    rerank: bool = False
+) -> FAISS:
+    metadatas = metadatas or [{} for _ in texts]
+    return build_vector_store(
+        [Document(page_content=text, metadata=metadata) for text, metadata in zip(texts, metadatas)],
+        embeddings,
+        spec,
+        rerank
+    )
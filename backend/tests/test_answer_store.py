@@ -0,0 +1,35 @@
+from backend.services.answer_store import PregeneratedAnswerStore
+
+RESPONSE = {"answer": "Use an index", "context_used": [], "confidence_score": 0.9, "suggested_topics": ["Databases"]}
+
+
+def test_lookup_matches_normalized_question_within_index(tmp_path):
+    path = str(tmp_path / "answers.db")
+    writer = PregeneratedAnswerStore(path, readonly=False)
+    writer.put("idx1", "backend", "technical", None, "How do you speed up a slow query?", RESPONSE)
+    reader = PregeneratedAnswerStore(path)
+
+    assert reader.get("idx1", "backend", "technical", None, "how do you speed up a slow query") == RESPONSE
+    assert reader.get("idx2", "backend", "technical", None, "How do you speed up a slow query?") is None
+    assert reader.get("idx1", "frontend", "technical", None, "How do you speed up a slow query?") is None
+    assert reader.get("idx1", "backend", "technical", "hard", "How do you speed up a slow query?") is None
+    assert reader.stats()["hits"] == 1
+
+
+def test_reader_before_first_run_misses_then_sees_answers(tmp_path):
+    path = str(tmp_path / "answers.db")
+    reader = PregeneratedAnswerStore(path)
+
+    assert reader.get("idx1", "qa", "behavioral", None, "Tell me about yourself") is None
+    PregeneratedAnswerStore(path, readonly=False).put("idx1", "qa", "behavioral", None, "Tell me about yourself", RESPONSE)
+    assert reader.get("idx1", "qa", "behavioral", None, "Tell me about yourself") == RESPONSE
+
+
+def test_existing_keys_and_prune_are_per_index(tmp_path):
+    store = PregeneratedAnswerStore(str(tmp_path / "answers.db"), readonly=False)
+    store.put("old", "qa", "technical", None, "What is a mock?", RESPONSE)
+    store.put("new", "qa", "technical", None, "What is a stub?", RESPONSE)
+
+    assert store.existing_keys("new") == {("qa", "technical", "", "what is a stub")}
+    assert store.prune(["new"]) == 1
+    assert store.existing_keys("old") == set()
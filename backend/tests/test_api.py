@@ -1,11 +1,13 @@
 import pytest
+from fastapi import WebSocketDisconnect, status
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from .. import main
 from ..database import Base, get_db
 from ..main import app
 from ..models import User
-from ..security import get_password_hash
+from ..security import create_access_token, get_password_hash
 
 # Test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -116,4 +118,37 @@ def test_get_study_streak(test_user):
     data = response.json()
     assert "current_streak" in data
     assert "longest_streak" in data
-    assert "last_study_date" in data 
\ No newline at end of file
+    assert "last_study_date" in data 
+
+def test_chat_websocket_rejects_missing_token(test_user):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/ws/chat/{test_user.id}"):
+            pass
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+def test_chat_websocket_rejects_other_users_token(test_user, monkeypatch):
+    monkeypatch.setattr(main, "SessionLocal", TestingSessionLocal)
+    token = create_access_token(data={"sub": test_user.email})
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/ws/chat/{test_user.id + 1}?token={token}"):
+            pass
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+def test_chat_websocket_reports_bad_payload_and_stream_failure(test_user, monkeypatch):
+    monkeypatch.setattr(main, "SessionLocal", TestingSessionLocal)
+
+    async def failing_stream(*args, **kwargs):
+        raise RuntimeError("LLM unavailable")
+        yield
+    monkeypatch.setattr(main.rag_service, "astream_response", failing_stream)
+    token = create_access_token(data={"sub": test_user.email})
+
+    with client.websocket_connect(f"/ws/chat/{test_user.id}?token={token}") as websocket:
+        websocket.send_json({"type": "chat", "content": "What is React?"})
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "chat", "content": "What is React?", "question_type": "technical"})
+        assert websocket.receive_json() == {"type": "error", "detail": "Failed to generate a response"}
+        assert main.active_connections[test_user.id] is not None
+
+    assert test_user.id not in main.active_connections
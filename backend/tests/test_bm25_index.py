@@ -0,0 +1,56 @@
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+from langchain.vectorstores import FAISS
+
+from backend.services.bm25_index import BM25Index, HybridSearcher, tokenize
+
+TEXTS = [
+    "useEffect runs side effects after a React component renders.",
+    "A B-tree keeps sorted data balanced for database indexes.",
+    "The CAP theorem says a distributed store trades consistency for availability.",
+    "React state updates are batched during event handlers.",
+]
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+def make_searcher(**kwargs):
+    embeddings = CountingEmbedding(size=16)
+    vector_store = FAISS.from_texts(TEXTS, embeddings)
+    return HybridSearcher(vector_store, **kwargs), embeddings
+
+
+def test_tokenize_keeps_technical_terms():
+    assert tokenize("What is a B-tree vs. node.js, C++?") == ["b-tree", "vs", "node.js", "c++"]
+
+
+def test_bm25_ranks_exact_term_first():
+    hits = BM25Index(TEXTS).search("b-tree sorted", k=2)
+
+    assert hits[0].position == 1
+    assert hits[0].coverage == 1.0
+
+
+def test_keyword_fast_path_skips_embedding():
+    searcher, embeddings = make_searcher()
+    result = searcher.search("CAP theorem consistency", k=2, embed_fn=embeddings.embed_query)
+
+    assert result.keyword_only
+    assert result.documents[0].page_content == TEXTS[2]
+    assert embeddings.calls == 0
+    assert searcher.stats()["keyword_only"] == 1
+
+
+def test_hybrid_search_embeds_ambiguous_queries():
+    searcher, embeddings = make_searcher(weight=0.5)
+    result = searcher.search("react", k=3, embed_fn=embeddings.embed_query)
+
+    assert not result.keyword_only
+    assert embeddings.calls == 1
+    assert result.scores == sorted(result.scores, reverse=True)
+    assert {TEXTS[0], TEXTS[3]} <= {doc.page_content for doc in result.documents}
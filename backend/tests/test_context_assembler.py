@@ -0,0 +1,49 @@
+from langchain.docstore.document import Document
+
+from backend.services.context_assembler import ContextAssembler
+
+
+def doc(text, source="notes.txt"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_orders_chunks_by_score():
+    assembler = ContextAssembler(max_tokens=1000)
+    context = assembler.assemble([doc("low", "a"), doc("high", "b")], scores=[0.2, 0.9])
+
+    assert [d.page_content for d in context.documents] == ["high", "low"]
+
+
+def test_removes_overlap_between_chunks_of_same_source():
+    first = "React hooks let components keep state. useEffect runs after render."
+    second = "useEffect runs after render. Cleanup runs before the next effect."
+    assembler = ContextAssembler(max_tokens=1000, chunk_overlap=40)
+    context = assembler.assemble([doc(first), doc(second)])
+
+    assert context.documents[1].page_content == "Cleanup runs before the next effect."
+
+
+def test_keeps_coincidental_short_overlap():
+    assembler = ContextAssembler(max_tokens=1000, chunk_overlap=40)
+    context = assembler.assemble([doc("Use the index"), doc("xylophone music is loud")])
+
+    assert context.documents[1].page_content == "xylophone music is loud"
+
+
+def test_drops_duplicate_chunks():
+    assembler = ContextAssembler(max_tokens=1000)
+    context = assembler.assemble([doc("same text", "a"), doc("same text", "a")])
+
+    assert len(context.documents) == 1
+    assert context.dropped == 1
+
+
+def test_stays_within_role_budget():
+    chunks = [doc(f"chunk {i} " + "word " * 60, str(i)) for i in range(5)]
+    assembler = ContextAssembler(max_tokens=1000, role_budgets={"qa": 100})
+    context = assembler.assemble(chunks, role="qa")
+
+    assert context.budget == 100
+    assert context.tokens <= 100
+    assert assembler.count_tokens(context.text) <= 100
+    assert context.dropped > 0
@@ -0,0 +1,99 @@
+import pytest
+from backend.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    model = "counting-model"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(cache_dir=str(tmp_path), max_entries=100)
+
+
+def test_only_new_texts_are_embedded(cache):
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, cache=cache)
+
+    first = embeddings.embed_documents(["What is React?", "What is SQL?"])
+    second = embeddings.embed_documents(["What is React?", "What is Python?"])
+
+    assert base.embedded == ["What is React?", "What is SQL?", "What is Python?"]
+    assert second[0] == first[0]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    base = CountingEmbeddings()
+    CachedEmbeddings(base, cache=EmbeddingCache(str(tmp_path))).embed_documents(["B-tree"])
+
+    reloaded = CachedEmbeddings(base, cache=EmbeddingCache(str(tmp_path)))
+    assert reloaded.embed_query("B-tree") == [6.0, 1.0, 0.5]
+    assert base.embedded == ["B-tree"]
+
+
+def test_models_do_not_share_vectors(cache):
+    cache.put_many("model-a", ["text"], [[1.0, 2.0]])
+    assert cache.get_many("model-b", ["text"]) == [None]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = EmbeddingCache(cache_dir=str(tmp_path), max_entries=10)
+    texts = [f"question {i}" for i in range(10)]
+    cache.put_many("model", texts, [[float(i), 0.0] for i in range(10)])
+    cache.get_many("model", ["question 0"])
+
+    cache.put_many("model", ["question 10"], [[10.0, 0.0]])
+
+    vectors = cache.get_many("model", ["question 0", "question 1", "question 10"])
+    assert vectors[0].tolist() == [0.0, 0.0]
+    assert vectors[1] is None
+    assert vectors[2].tolist() == [10.0, 0.0]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_query_embeddings_are_not_persisted(tmp_path):
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, cache=EmbeddingCache(str(tmp_path)), query_cache_size=1)
+
+    embeddings.embed_query("What is a join?")
+    embeddings.embed_query("What is a join?")
+    assert base.embedded == ["What is a join?"]
+    assert EmbeddingCache(str(tmp_path)).get_many("counting-model", ["What is a join?"]) == [None]
+
+    embeddings.embed_query("What is an index?")
+    embeddings.embed_query("What is a join?")
+    assert base.embedded == ["What is a join?", "What is an index?", "What is a join?"]
+
+
+def test_rows_appended_by_another_process_are_read_incrementally(tmp_path):
+    reader = EmbeddingCache(str(tmp_path))
+    writer = EmbeddingCache(str(tmp_path))
+    writer.put_many("model", ["a"], [[1.0, 0.0]])
+    assert reader.get_many("model", ["a"])[0].tolist() == [1.0, 0.0]
+
+    writer.put_many("model", ["b"], [[0.0, 1.0]])
+    assert reader.get_many("model", ["b"])[0].tolist() == [0.0, 1.0]
+    assert reader.stats()["entries"] == 2
+
+
+def test_readers_follow_a_compaction(tmp_path):
+    reader = EmbeddingCache(str(tmp_path))
+    writer = EmbeddingCache(str(tmp_path), max_entries=10)
+    writer.put_many("model", [f"q{i}" for i in range(10)], [[float(i), 0.0] for i in range(10)])
+    assert reader.get_many("model", ["q9"])[0].tolist() == [9.0, 0.0]
+
+    writer.put_many("model", ["q10"], [[10.0, 0.0]])
+    assert reader.get_many("model", ["q10"])[0].tolist() == [10.0, 0.0]
+    assert reader.get_many("model", ["q0"]) == [None]
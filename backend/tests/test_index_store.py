@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+
+from backend.services import index_store
+from backend.services.index_store import IndexArtifactStore
+from backend.services.mmap_docstore import MmapDocstore, write_docstore
+from backend.services.vector_index import build_vector_store, choose_index_spec
+
+EMBEDDINGS = DeterministicFakeEmbedding(size=16)
+
+
+def make_store(prefix="Interview question", n=40):
+    documents = [
+        Document(page_content=f"{prefix} {i}", metadata={"type": "technical", "topics": [f"t{i % 3}"]})
+        for i in range(n)
+    ]
+    return build_vector_store(documents, EMBEDDINGS, choose_index_spec(n, "flat"))
+
+
+def test_docstore_decodes_documents_by_position(tmp_path):
+    documents = [Document(page_content="Explain the GIL", metadata={"difficulty": "medium"}),
+                 Document(page_content="Tell me about yourself ✓", metadata={})]
+    write_docstore(str(tmp_path), documents)
+    docstore = MmapDocstore(str(tmp_path))
+
+    assert len(docstore) == 2
+    assert docstore.search("1") == documents[1]
+    assert docstore.search(docstore.ids()[0]) == documents[0]
+    assert "not found" in docstore.search("2")
+    assert list(docstore.ids()) == [0, 1]
+
+
+def test_loaded_store_is_memory_mapped_and_matches_original(tmp_path):
+    store = make_store()
+    artifacts = IndexArtifactStore(str(tmp_path))
+    artifacts.save("key", store)
+    loaded = artifacts.load("key", EMBEDDINGS)
+
+    assert isinstance(loaded.docstore, MmapDocstore)
+    assert isinstance(loaded.docstore.offsets, np.memmap)
+    for query in ("Interview question 7", "Interview question 31"):
+        expected = store.similarity_search_with_score(query, k=3)
+        actual = loaded.similarity_search_with_score(query, k=3)
+        assert [doc for doc, _ in actual] == [doc for doc, _ in expected]
+        np.testing.assert_allclose([s for _, s in actual], [s for _, s in expected], rtol=1e-5)
+
+
+def test_rebuild_swaps_artifact_without_breaking_loaded_store(tmp_path):
+    artifacts = IndexArtifactStore(str(tmp_path))
+    old = artifacts.load_or_build("key", EMBEDDINGS, lambda: make_store("Old question"))
+    old_path = artifacts.resolve("key")
+
+    new = artifacts.load_or_build(
+        "key", EMBEDDINGS, lambda: make_store("New question"), force_rebuild=True
+    )
+    artifacts.prune(keep=["key"])
+
+    assert artifacts.resolve("key") != old_path
+    assert not os.path.exists(old_path)
+    assert new.similarity_search("New question 3", k=1)[0].page_content == "New question 3"
+    # Mappings taken before the swap stay readable after the files are pruned
+    assert old.similarity_search("Old question 3", k=1)[0].page_content == "Old question 3"
+
+
+def test_concurrent_build_keeps_published_artifact(tmp_path):
+    artifacts = IndexArtifactStore(str(tmp_path))
+    artifacts.save("key", make_store("First question"))
+    first = artifacts.resolve("key")
+
+    artifacts.save("key", make_store("Second question"), replace=False)
+
+    assert artifacts.resolve("key") == first
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.')] == []
+
+
+def test_flat_index_sharing_is_partial_without_ifc_mmap(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(index_store, "MMAP_FLAT_CODES", False)
+    monkeypatch.setattr(index_store, "MMAP_FLAGS", index_store.faiss.IO_FLAG_MMAP | index_store.faiss.IO_FLAG_READ_ONLY)
+    artifacts = IndexArtifactStore(str(tmp_path))
+    artifacts.save("key", make_store())
+    loaded = artifacts.load("key", EMBEDDINGS)
+
+    assert artifacts.mmap_sharing(loaded.index) == "partial"
+    assert "cannot memory-map" in caplog.text
+    assert IndexArtifactStore(str(tmp_path), mmap=False).mmap_sharing(loaded.index) == "off"
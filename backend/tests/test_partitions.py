@@ -0,0 +1,56 @@
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+from langchain.vectorstores import FAISS
+
+from backend.services.bm25_index import HybridSearcher
+from backend.services.partitions import PartitionIndex, partition_filter
+
+METADATAS = [
+    {"type": "technical", "difficulty": "easy"},
+    {"type": "technical", "difficulty": "hard"},
+    {"type": "behavioral", "difficulty": "hard"},
+    {"type": "hr", "difficulty": "medium"},
+]
+
+
+def test_partition_filter_maps_chat_question_types():
+    assert partition_filter("coding") == {"type": ["technical"]}
+    assert partition_filter("behavioral", "hard") == {
+        "type": ["behavioral", "hr"], "difficulty": ["hard"]
+    }
+    assert partition_filter("unknown") == {}
+
+
+def test_positions_intersect_fields():
+    partitions = PartitionIndex(METADATAS)
+
+    assert partitions.positions({}) is None
+    assert partitions.positions({"type": ["technical"]}).tolist() == [0, 1]
+    assert partitions.positions({"type": ["behavioral", "hr"], "difficulty": ["hard"]}).tolist() == [2]
+
+
+def make_searcher(fallback):
+    texts = [f"interview answer number {i}" for i in range(len(METADATAS))]
+    vector_store = FAISS.from_texts(texts, DeterministicFakeEmbedding(size=16), metadatas=METADATAS)
+    return HybridSearcher(vector_store, fast_path=False, fallback=fallback)
+
+
+def test_search_stays_inside_partition():
+    searcher = make_searcher(fallback=False)
+    result = searcher.search(
+        "interview answer", k=3, embed_fn=searcher.vector_store.embeddings.embed_query,
+        filters={"type": ["technical"]}
+    )
+
+    assert [doc.metadata["type"] for doc in result.documents] == ["technical", "technical"]
+
+
+def test_small_partition_falls_back_to_whole_store():
+    searcher = make_searcher(fallback=True)
+    result = searcher.search(
+        "interview answer", k=3, embed_fn=searcher.vector_store.embeddings.embed_query,
+        filters={"type": ["technical"]}
+    )
+
+    assert len(result.documents) == 3
+    assert [doc.metadata["type"] for doc in result.documents[:2]] == ["technical", "technical"]
+    assert searcher.stats()["partition_fallbacks"] == 1
@@ -0,0 +1,47 @@
+import os
+
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+from langchain.llms.fake import FakeListLLM
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from backend.services.bm25_index import HybridResult
+from backend.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+from backend.services.index_store import IndexArtifactStore
+from backend.services.rag_service import RAGService
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    model: str = "counting"
+    queries: int = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return super().embed_query(text)
+
+
+def make_service(tmp_path):
+    service = RAGService(load_index=False)
+    service.llm = FakeListLLM(responses=["An answer."] * 10)
+    service.embeddings = CachedEmbeddings(
+        CountingEmbeddings(size=16), cache=EmbeddingCache(str(tmp_path / "embeddings"))
+    )
+    service.index_store = IndexArtifactStore(str(tmp_path / "index"))
+    service.initialize_vector_store()
+    return service
+
+
+def test_keyword_hit_is_cached_without_embedding(tmp_path):
+    service = make_service(tmp_path)
+    documents = service.build_documents()[:3]
+    service.searcher.keyword_match = lambda *args: HybridResult(
+        documents=documents, scores=[1.0, 0.9, 0.8], query_embedding=None, keyword_only=True
+    )
+    counting = service.embeddings.embeddings
+    counting.queries = 0
+
+    first = service.generate_response("Explain React reconciliation", "frontend", "technical")
+    again = service.generate_response("explain react reconciliation?", "frontend", "technical")
+
+    assert counting.queries == 0
+    assert again == {**first, "prompt_tokens": 0}
@@ -0,0 +1,51 @@
+from backend.services.semantic_cache import SemanticAnswerCache
+
+RESPONSE = {
+    "answer": "var is function scoped, let and const are block scoped.",
+    "context_used": [],
+    "confidence_score": 0.9,
+    "suggested_topics": ["JavaScript"]
+}
+
+
+def test_similar_question_hits_above_threshold():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.put("frontend", "technical", [1.0, 0.0, 0.1], "Difference between var, let and const?", RESPONSE)
+
+    assert cache.get("frontend", "technical", [1.0, 0.05, 0.1]) == RESPONSE
+    assert cache.get("frontend", "technical", [0.0, 1.0, 0.0]) is None
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_buckets_are_separated_by_role_and_type():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.put("frontend", "technical", [1.0, 0.0], "What is a closure?", RESPONSE)
+
+    assert cache.get("backend", "technical", [1.0, 0.0]) is None
+    assert cache.get("frontend", "behavioral", [1.0, 0.0]) is None
+
+
+def test_exact_question_hits_without_embedding():
+    cache = SemanticAnswerCache()
+    cache.put("frontend", "technical", [1.0, 0.0], "What is a closure?", RESPONSE)
+
+    assert cache.get("frontend", "technical", question="what is a  closure") == RESPONSE
+
+
+def test_expired_entries_miss():
+    cache = SemanticAnswerCache(ttl_seconds=0)
+    cache.put("frontend", "technical", [1.0, 0.0], "What is a closure?", RESPONSE)
+
+    assert cache.get("frontend", "technical", [1.0, 0.0]) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticAnswerCache(threshold=0.99, max_entries=2)
+    cache.put("qa", "technical", [1.0, 0.0, 0.0], "first", RESPONSE)
+    cache.put("qa", "technical", [0.0, 1.0, 0.0], "second", RESPONSE)
+    cache.get("qa", "technical", [1.0, 0.0, 0.0])
+    cache.put("qa", "technical", [0.0, 0.0, 1.0], "third", RESPONSE)
+
+    assert cache.get("qa", "technical", [1.0, 0.0, 0.0]) is not None
+    assert cache.get("qa", "technical", [0.0, 1.0, 0.0]) is None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from backend.services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": "shared"}
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("key", compute) for _ in range(5)])
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result == {"answer": "shared"} for result in results)
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["max_waiters"] == 5
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("a", lambda: asyncio.sleep(0.01, result="a")),
+            flight.do("b", lambda: asyncio.sleep(0.01, result="b"))
+        ), flight
+
+    results, flight = asyncio.run(main())
+    assert results == ["a", "b"]
+    assert flight.stats()["flights"] == 2
+
+
+def test_stuck_flight_times_out_and_is_not_joined_again():
+    async def main():
+        flight = SingleFlight()
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", lambda: asyncio.sleep(1), timeout=0.05)
+        result = await flight.do("key", lambda: asyncio.sleep(0, result="fresh"))
+        return flight, result
+
+    flight, result = asyncio.run(main())
+    assert result == "fresh"
+    assert flight.stats()["timeouts"] == 1
+    assert flight.stats()["flights"] == 2
+
+
+def test_errors_propagate_to_every_waiter():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
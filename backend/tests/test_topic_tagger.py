@@ -0,0 +1,29 @@
+from backend.services.topic_tagger import TopicTagger, get_default_tagger
+
+
+def test_matches_overlapping_keywords_in_one_pass():
+    tagger = TopicTagger({"Pronouns": ["he", "she", "hers"], "Possessive": ["his"]})
+
+    assert tagger.tag("she said his") == ["Pronouns", "Possessive"]
+    assert tagger.tag("hers") == ["Pronouns"]
+
+
+def test_only_whole_words_match():
+    tagger = TopicTagger({"Machine Learning": ["ai"]})
+
+    assert tagger.tag("How do you maintain a legacy service?") == []
+    assert tagger.tag("Explain AI safety.") == ["Machine Learning"]
+
+
+def test_default_taxonomy_tags_technical_terms():
+    topics = get_default_tagger().tag(
+        "How does useEffect in React relate to closures, and when is a B-tree index used?"
+    )
+
+    assert topics == ["React", "JavaScript", "Databases"]
+
+
+def test_missing_taxonomy_tags_nothing(tmp_path):
+    tagger = get_default_tagger(str(tmp_path / "missing.json"))
+
+    assert tagger.tag("How does useEffect in React work?") == []
@@ -0,0 +1,100 @@
+import faiss
+import numpy as np
+import pytest
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+
+from backend.services.index_store import IndexArtifactStore
+from backend.services.vector_index import (
+    RerankIndex, build_index, build_vector_store_from_texts, choose_index_spec, index_memory_bytes
+)
+
+
+def unit_vectors(n, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def test_auto_spec_scales_with_corpus_size():
+    assert choose_index_spec(300, "auto").index_type == "flat"
+    assert choose_index_spec(200000, "auto").index_type == "hnsw"
+    spec = choose_index_spec(5000000, "auto")
+    assert spec.index_type == "ivf"
+    assert spec.ivf_nlist > 0
+
+
+def test_unknown_index_type_is_rejected():
+    with pytest.raises(ValueError):
+        choose_index_spec(100, "lsh")
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+def test_index_types_find_exact_vectors(index_type):
+    vectors = unit_vectors(2000)
+    index = build_index(vectors, choose_index_spec(len(vectors), index_type))
+    _, positions = index.search(vectors[:20], 1)
+
+    assert index.ntotal == 2000
+    assert np.mean(positions[:, 0] == np.arange(20)) >= 0.9
+
+
+def test_vector_store_keeps_documents_aligned_with_rows():
+    texts = [f"Interview question {i}" for i in range(30)]
+    store = build_vector_store_from_texts(
+        texts, DeterministicFakeEmbedding(size=16), spec=choose_index_spec(30, "hnsw")
+    )
+
+    assert store.similarity_search(texts[7], k=1)[0].page_content == texts[7]
+
+
+@pytest.mark.parametrize("quantization", ["fp16", "sq8"])
+def test_quantized_index_reranks_exactly(quantization):
+    vectors = unit_vectors(2000)
+    spec = choose_index_spec(len(vectors), "flat", quantization=quantization)
+    index = build_index(vectors, spec)
+    exact = build_index(vectors, choose_index_spec(len(vectors), "flat"))
+
+    distances, positions = index.search(vectors[:20], 5)
+    exact_distances, exact_positions = exact.search(vectors[:20], 5)
+
+    assert isinstance(index, RerankIndex)
+    assert index_memory_bytes(index) < index_memory_bytes(exact)
+    np.testing.assert_array_equal(positions, exact_positions)
+    np.testing.assert_allclose(distances, exact_distances, atol=1e-5)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+def test_memory_bytes_match_serialized_size(index_type):
+    index = build_index(unit_vectors(2000), choose_index_spec(2000, index_type, quantization="sq8"))
+    serialized = faiss.serialize_index(index.index).nbytes
+
+    assert abs(index_memory_bytes(index) - serialized) <= 0.02 * serialized
+
+
+def test_in_memory_quantized_store_skips_rerank_vectors():
+    store = build_vector_store_from_texts(
+        [f"Interview question {i}" for i in range(50)], DeterministicFakeEmbedding(size=16),
+        spec=choose_index_spec(50, "flat", quantization="sq8")
+    )
+
+    assert not isinstance(store.index, RerankIndex)
+
+
+def test_pq_falls_back_to_sq8_for_small_corpora():
+    assert choose_index_spec(500, "flat", quantization="pq").quantization == "sq8"
+    assert choose_index_spec(50000, "flat", quantization="pq").quantization == "pq"
+
+
+def test_quantized_store_round_trips_through_artifact_store(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=16)
+    texts = [f"Interview question {i}" for i in range(50)]
+    store = build_vector_store_from_texts(
+        texts, embeddings, spec=choose_index_spec(50, "flat", quantization="sq8"), rerank=True
+    )
+    artifacts = IndexArtifactStore(str(tmp_path))
+    artifacts.save("key", store)
+    loaded = artifacts.load("key", embeddings)
+
+    assert isinstance(loaded.index, RerankIndex)
+    assert isinstance(loaded.index.vectors, np.memmap)
+    assert loaded.similarity_search(texts[3], k=1)[0].page_content == texts[3]
@@ -0,0 +1,110 @@
+"""Benchmark: recall@k and query latency of ANN index types against Flat.
+
+Uses clustered synthetic unit vectors by default, or the vectors of a saved
+FAISS index (e.g. one role's store or a backend index artifact):
+
+    python -m benchmarks.ann_recall --num-vectors 200000 --dim 384
+    python -m benchmarks.ann_recall --index-dir backend/data/index/<key> \\
+        --ef-search 32 64 128 --nprobe 8 16 32
+"""
+import argparse
+import os
+import time
+
+import faiss
+import numpy as np
+
+from backend.services.metrics import percentile
+from backend.services.vector_index import IndexSpec, build_index, choose_index_spec, configure_search
+
+
+def synthetic_vectors(num_vectors: int, dim: int, seed: int = 0) -> np.ndarray:
+    # Clustered like real embeddings: topics around a few hundred centroids
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(max(1, num_vectors // 500), dim))
+    vectors = centroids[rng.integers(len(centroids), size=num_vectors)]
+    vectors = vectors + 0.5 * rng.normal(size=(num_vectors, dim))
+    return normalize(vectors)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def load_index_vectors(index_dir: str) -> np.ndarray:
+    index = faiss.read_index(os.path.join(index_dir, "index.faiss"))
+    return normalize(index.reconstruct_n(0, index.ntotal))
+
+
+def make_queries(vectors: np.ndarray, num_queries: int, seed: int = 1) -> np.ndarray:
+    # Perturbed corpus vectors stand in for paraphrased questions
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(len(vectors), size=num_queries)]
+    return normalize(picks + 0.1 * rng.normal(size=picks.shape))
+
+
+def time_queries(index, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        started_at = time.perf_counter()
+        _, positions = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - started_at)
+        results.append(positions[0])
+    return np.array(results), sorted(latencies)
+
+
+def recall_at_k(results: np.ndarray, truth: np.ndarray, k: int) -> float:
+    return float(np.mean([
+        len(set(found[:k]) & set(expected[:k])) / k for found, expected in zip(results, truth)
+    ]))
+
+
+def run(vectors: np.ndarray, queries: np.ndarray, k: int, ef_search, nprobe) -> list:
+    rows = []
+    flat_spec = IndexSpec(index_type="flat")
+    started_at = time.perf_counter()
+    flat = build_index(vectors, flat_spec)
+    build_seconds = time.perf_counter() - started_at
+    truth, latencies = time_queries(flat, queries, k)
+    rows.append(("flat", "-", build_seconds, 1.0, latencies))
+
+    for index_type, values, param in (("hnsw", ef_search, "hnsw_ef_search"), ("ivf", nprobe, "ivf_nprobe")):
+        spec = choose_index_spec(len(vectors), index_type)
+        started_at = time.perf_counter()
+        index = build_index(vectors, spec)
+        build_seconds = time.perf_counter() - started_at
+        for value in values:
+            setattr(spec, param, value)
+            configure_search(index, spec)
+            results, latencies = time_queries(index, queries, k)
+            rows.append((index_type, f"{param}={value}", build_seconds, recall_at_k(results, truth, k), latencies))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index-dir", help="Saved FAISS index directory to take vectors from")
+    parser.add_argument("--num-vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    vectors = (
+        load_index_vectors(args.index_dir) if args.index_dir
+        else synthetic_vectors(args.num_vectors, args.dim)
+    )
+    queries = make_queries(vectors, args.queries)
+    print(f"{len(vectors)} vectors, dim {vectors.shape[1]}, {len(queries)} queries, k={args.k}")
+    print(f"{'index':6s} {'params':20s} {'build s':>8s} {'recall@k':>9s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for index_type, params, build_seconds, recall, latencies in run(
+        vectors, queries, args.k, args.ef_search, args.nprobe
+    ):
+        print(
+            f"{index_type:6s} {params:20s} {build_seconds:8.1f} {recall:9.3f} "
+            f"{1000 * percentile(latencies, 50):8.3f} {1000 * percentile(latencies, 99):8.3f}"
+        )
@@ -0,0 +1,89 @@
+"""Micro-benchmark: per-request chain construction vs. reusing cached chains.
+
+Measures only object construction and lookup, not LLM or retrieval time:
+
+    python -m benchmarks.chain_construction --iterations 500
+"""
+import argparse
+import timeit
+
+from langchain.chains import ConversationalRetrievalChain, RetrievalQA
+from langchain.chains.question_answering import load_qa_chain
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+from langchain.llms.fake import FakeListLLM
+from langchain.memory import ConversationBufferMemory
+from langchain.vectorstores import FAISS
+
+
+def build_fixtures():
+    llm = FakeListLLM(responses=["answer"])
+    vector_store = FAISS.from_texts(
+        [f"Interview question {i}" for i in range(50)],
+        DeterministicFakeEmbedding(size=64)
+    )
+    return llm, vector_store
+
+
+def run(iterations: int) -> dict:
+    llm, vector_store = build_fixtures()
+
+    # backend: RetrievalQA per request (before) vs. one stuff chain (after)
+    backend_chains = {}
+
+    def backend_before():
+        RetrievalQA.from_chain_type(
+            llm=llm, chain_type="stuff", retriever=vector_store.as_retriever()
+        )
+
+    def backend_after():
+        if "stuff" not in backend_chains:
+            backend_chains["stuff"] = load_qa_chain(llm=llm, chain_type="stuff")
+        return backend_chains["stuff"]
+
+    # src: chain + memory per question (before) vs. per-role cached chain (after)
+    src_chains = {}
+
+    def src_before():
+        memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        ConversationalRetrievalChain.from_llm(
+            llm=llm,
+            retriever=vector_store.as_retriever(),
+            memory=memory,
+            return_source_documents=True
+        )
+
+    def src_after():
+        key = ("frontend", "conversational_retrieval")
+        if key not in src_chains:
+            src_chains[key] = ConversationalRetrievalChain.from_llm(
+                llm=llm,
+                retriever=vector_store.as_retriever(),
+                return_source_documents=True
+            )
+        return src_chains[key]
+
+    results = {}
+    for name, fn in [
+        ("backend_before", backend_before),
+        ("backend_after", backend_after),
+        ("src_before", src_before),
+        ("src_after", src_after),
+    ]:
+        seconds = timeit.timeit(fn, number=iterations)
+        results[name] = seconds / iterations * 1e6  # microseconds per request
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    for path in ("backend", "src"):
+        before = results[f"{path}_before"]
+        after = results[f"{path}_after"]
+        print(
+            f"{path:8s} before: {before:9.1f} us/request  "
+            f"after: {after:7.2f} us/request  ({before / after:.0f}x)"
+        )
@@ -0,0 +1,124 @@
+"""Report: accuracy drift and speed of the int8 ONNX encoder against PyTorch.
+
+Encodes candidate answers (model answers with words dropped, plus answers
+paired with another question's model answer for low scores) from the
+interview question JSON with the SentenceTransformer and with the quantized
+ONNX Runtime encoder. Reports embedding cosine between the two backends, the
+drift in 0-5 scores, how often the feedback band changes, per-answer latency
+at batch size 1 and throughput at ``--batch-size``:
+
+    python -m benchmarks.encoder_backends
+    python -m benchmarks.encoder_backends --threads 4 --output encoder_backends.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from backend.services.metrics import percentile
+from benchmarks.evaluation_batching import load_evaluation, load_pairs
+
+ONNX_ENCODER_PATH = os.path.join('AI-interview-chatbot-main', 'src', 'onnx_encoder.py')
+ONNX_DIR = os.path.join('AI-interview-chatbot-main', 'data', '.onnx')
+
+
+def load_onnx_encoder():
+    spec = importlib.util.spec_from_file_location("onnx_encoder", ONNX_ENCODER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def with_mismatches(pairs, seed: int):
+    """Add each answer against a different question's model answer, so low scores are covered"""
+    rng = random.Random(seed)
+    references = [reference for _, reference in pairs]
+    return pairs + [(answer, rng.choice(references)) for answer, _ in pairs]
+
+
+def scores(encoder, pairs, batch_size: int):
+    answers = encoder.encode([answer for answer, _ in pairs], batch_size=batch_size)
+    references = encoder.encode([reference for _, reference in pairs], batch_size=batch_size)
+    answers = answers / np.linalg.norm(answers, axis=1, keepdims=True)
+    references = references / np.linalg.norm(references, axis=1, keepdims=True)
+    return answers, np.round(np.einsum("ij,ij->i", answers, references) * 5, 2)
+
+
+def speed(encoder, texts, batch_size: int):
+    latencies = []
+    for text in texts:
+        started_at = time.perf_counter()
+        encoder.encode([text], batch_size=1)
+        latencies.append(time.perf_counter() - started_at)
+    latencies.sort()
+    started_at = time.perf_counter()
+    encoder.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started_at
+    return {
+        "latency_p50_ms": round(1000 * percentile(latencies, 50), 2),
+        "latency_p99_ms": round(1000 * percentile(latencies, 99), 2),
+        "texts_per_second": round(len(texts) / elapsed, 1)
+    }
+
+
+def run(args) -> dict:
+    evaluation = load_evaluation()
+    onnx_encoder = load_onnx_encoder()
+    from sentence_transformers import SentenceTransformer
+
+    onnx_encoder.ensure_exported(evaluation.MODEL_NAME, root=args.onnx_dir)
+    encoders = {
+        "torch": SentenceTransformer(evaluation.MODEL_NAME),
+        "onnx-int8": onnx_encoder.load_encoder(evaluation.MODEL_NAME, root=args.onnx_dir, threads=args.threads)
+    }
+    pairs = with_mismatches(load_pairs(args.pairs, args.dropout, args.seed), args.seed)
+    results = {name: scores(encoder, pairs, args.batch_size) for name, encoder in encoders.items()}
+    (torch_vectors, torch_scores), (onnx_vectors, onnx_scores) = results["torch"], results["onnx-int8"]
+
+    cosine = np.einsum("ij,ij->i", torch_vectors, onnx_vectors)
+    drift = np.abs(torch_scores - onnx_scores)
+    bands_changed = sum(
+        evaluation.generate_feedback(answer, float(a), reference) != evaluation.generate_feedback(answer, float(b), reference)
+        for (answer, reference), a, b in zip(pairs, torch_scores, onnx_scores)
+    )
+    texts = [answer for answer, _ in pairs[:args.latency_texts]]
+    return {
+        "pairs": len(pairs),
+        "accuracy": {
+            "embedding_cosine_mean": round(float(cosine.mean()), 4),
+            "embedding_cosine_min": round(float(cosine.min()), 4),
+            "score_drift_mean": round(float(drift.mean()), 4),
+            "score_drift_p99": round(percentile(sorted(drift.tolist()), 99), 4),
+            "score_drift_max": round(float(drift.max()), 4),
+            "feedback_band_changes": f"{bands_changed}/{len(pairs)}"
+        },
+        "speed": {name: speed(encoder, texts, args.batch_size) for name, encoder in encoders.items()}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=256)
+    parser.add_argument("--dropout", type=float, default=0.3, help="Fraction of model-answer words dropped")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-texts", type=int, default=200, help="Answers timed one at a time")
+    parser.add_argument("--onnx-dir", default=ONNX_DIR)
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads (0: default)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(f"{report['pairs']} answer pairs")
+    for metric, value in report["accuracy"].items():
+        print(f"  {metric:24s} {value}")
+    print(f"\n{'backend':10s} {'p50 ms':>8s} {'p99 ms':>8s} {'texts/s':>9s}")
+    for name, row in report["speed"].items():
+        print(f"{name:10s} {row['latency_p50_ms']:8.2f} {row['latency_p99_ms']:8.2f} {row['texts_per_second']:9.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,140 @@
+"""Benchmark: per-pair answer scoring versus batched ``evaluate_answers``.
+
+Scores candidate answers (model answers with words dropped) from the
+interview question JSON three ways: the original path that encodes both
+texts and calls sklearn's ``cosine_similarity`` per pair, ``evaluate_answer``
+per pair, and ``evaluate_answers`` at each ``--batch-sizes``. The score cache
+is cleared before every run. ``--stub`` swaps the SentenceTransformer for a
+hashing encoder with injected per-call and per-text latency:
+
+    python -m benchmarks.evaluation_batching
+    python -m benchmarks.evaluation_batching --pairs 512 --batch-sizes 8 32 128
+    python -m benchmarks.evaluation_batching --stub --call-latency-ms 4 --text-latency-ms 0.5
+"""
+import argparse
+import importlib.util
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.rag_bench.queries import load_catalog, perturb
+from benchmarks.rag_bench.stubs import StubEmbeddings
+
+EVALUATION_PATH = os.path.join('AI-interview-chatbot-main', 'src', 'evaluation.py')
+
+
+def load_evaluation():
+    spec = importlib.util.spec_from_file_location("evaluation", EVALUATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubEncoder:
+    """SentenceTransformer-shaped wrapper around the hashing stub embeddings"""
+
+    def __init__(self, size: int, call_seconds: float, text_seconds: float):
+        self.embeddings = StubEmbeddings(size)
+        self.call_seconds = call_seconds
+        self.text_seconds = text_seconds
+
+    def encode(self, texts, batch_size=32):
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            time.sleep(self.call_seconds + self.text_seconds * len(batch))
+            vectors.extend(self.embeddings._vector(text) for text in batch)
+        return np.array(vectors, dtype=np.float32)
+
+
+def load_pairs(count: int, dropout: float, seed: int):
+    rng = random.Random(seed)
+    references = [
+        item.get('answer') or item.get('model_answer', '')
+        for items in load_catalog().values() for item in items
+    ]
+    references = [reference for reference in references if reference]
+    return [
+        (perturb(references[i % len(references)], dropout, rng), references[i % len(references)])
+        for i in range(count)
+    ]
+
+
+def timed(evaluation, fn):
+    evaluation._scores.clear()
+    started_at = time.perf_counter()
+    results = fn()
+    return time.perf_counter() - started_at, results
+
+
+def run(args) -> dict:
+    evaluation = load_evaluation()
+    if args.stub:
+        model = StubEncoder(args.embedding_dim, args.call_latency_ms / 1000, args.text_latency_ms / 1000)
+        evaluation.get_model = lambda: model
+    model = evaluation.get_model()
+    evaluation._model_answer_embeddings = evaluation.ModelAnswerEmbeddings(tempfile.mkdtemp(prefix="eval-bench-"))
+
+    pairs = load_pairs(args.pairs, args.dropout, args.seed)
+    # Reference embeddings are precomputed at catalog load, outside the timed paths
+    evaluation._model_answer_embeddings.precompute([reference for _, reference in pairs], model=model)
+
+    rows = {}
+    try:
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        def original():
+            scores = []
+            for answer, reference in pairs:
+                embeddings = model.encode([answer, reference])
+                scores.append(round(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0] * 5, 2))
+            return scores
+        rows["original per pair"], _ = timed(evaluation, original)
+    except ImportError:
+        pass
+
+    rows["evaluate_answer"], per_pair = timed(
+        evaluation, lambda: [evaluation.evaluate_answer(answer, reference) for answer, reference in pairs]
+    )
+    max_drift = 0.0
+    for batch_size in args.batch_sizes:
+        rows[f"evaluate_answers bs={batch_size}"], batched = timed(
+            evaluation, lambda: evaluation.evaluate_answers(pairs, batch_size=batch_size)
+        )
+        max_drift = max(max_drift, max(abs(a[0] - b[0]) for a, b in zip(per_pair, batched)))
+
+    baseline = rows.get("original per pair", rows["evaluate_answer"])
+    return {
+        "pairs": len(pairs),
+        "max_score_drift": round(max_drift, 4),
+        "paths": {
+            name: {
+                "seconds": round(seconds, 3),
+                "pairs_per_second": round(len(pairs) / seconds, 1),
+                "speedup": round(baseline / seconds, 2)
+            }
+            for name, seconds in rows.items()
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--dropout", type=float, default=0.3, help="Fraction of model-answer words dropped")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub", action="store_true", help="Use a hashing encoder instead of the model")
+    parser.add_argument("--embedding-dim", type=int, default=384)
+    parser.add_argument("--call-latency-ms", type=float, default=4.0)
+    parser.add_argument("--text-latency-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    results = run(args)
+    print(f"{results['pairs']} pairs, max score drift vs per pair {results['max_score_drift']}")
+    print(f"{'path':26s} {'seconds':>8s} {'pairs/s':>9s} {'speedup':>8s}")
+    for name, row in results["paths"].items():
+        print(f"{name:26s} {row['seconds']:8.3f} {row['pairs_per_second']:9.1f} {row['speedup']:7.2f}x")
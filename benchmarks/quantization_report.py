@@ -0,0 +1,104 @@
+"""Report: index memory saved versus recall lost for each vector quantization.
+
+By default embeds the interview question data (question + answer chunks as the
+corpus, the questions themselves as queries) with a sentence-transformers
+model through the shared embedding cache. Alternatively reuse the vectors of
+a saved index, or synthetic vectors:
+
+    python -m benchmarks.quantization_report
+    python -m benchmarks.quantization_report --index-dir backend/data/index/<key>
+    python -m benchmarks.quantization_report --synthetic 200000 --dim 1536
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from backend.services.metrics import percentile
+from backend.services.vector_index import (
+    QUANTIZATIONS, build_index, choose_index_spec, index_memory_bytes
+)
+from benchmarks.ann_recall import (
+    load_index_vectors, make_queries, normalize, recall_at_k, synthetic_vectors, time_queries
+)
+
+QUESTION_FILES = [
+    os.path.join('AI-interview-chatbot-main', 'data', name)
+    for name in ('technical_questions.json', 'behavioral_questions.json', 'hr_questions.json')
+]
+
+
+def load_question_pairs():
+    pairs = []
+    for path in QUESTION_FILES:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = data if isinstance(data, list) else next(iter(data.values()))
+        for item in items:
+            answer = item.get('answer') or item.get('model_answer', '')
+            pairs.append((item['question'], f"Question: {item['question']}\nAnswer: {answer}"))
+    return pairs
+
+
+def embed_question_data(model_name: str):
+    from langchain.embeddings import HuggingFaceEmbeddings
+    from backend.services.embedding_cache import CachedEmbeddings
+
+    embeddings = CachedEmbeddings(HuggingFaceEmbeddings(model_name=model_name), model_name=model_name)
+    pairs = load_question_pairs()
+    corpus = normalize(embeddings.embed_documents([text for _, text in pairs]))
+    queries = normalize(embeddings.embed_documents([question for question, _ in pairs]))
+    return corpus, queries
+
+
+def run(vectors: np.ndarray, queries: np.ndarray, k: int, index_type: str, rerank_factor: int) -> list:
+    exact = build_index(vectors, choose_index_spec(len(vectors), "flat", quantization="none"))
+    truth, _ = time_queries(exact, queries, k)
+    baseline_bytes = index_memory_bytes(exact)
+
+    rows = []
+    for quantization in QUANTIZATIONS:
+        spec = choose_index_spec(len(vectors), index_type, quantization=quantization, rerank_factor=rerank_factor)
+        variants = [("-", build_index(vectors, spec, rerank=False))]
+        if spec.quantization != "none":
+            variants.append((f"x{rerank_factor}", build_index(vectors, spec)))
+        for rerank, index in variants:
+            results, latencies = time_queries(index, queries, k)
+            memory = index_memory_bytes(index)
+            rows.append((
+                spec.quantization if spec.quantization == quantization else f"{quantization}->{spec.quantization}",
+                rerank, memory, 1 - memory / baseline_bytes, recall_at_k(results, truth, k),
+                1000 * percentile(latencies, 50), 1000 * percentile(latencies, 99)
+            ))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index-dir", help="Saved FAISS index directory to take vectors from")
+    parser.add_argument("--synthetic", type=int, help="Use this many synthetic vectors instead")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--embedding-model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--index-type", default="flat", choices=["flat", "hnsw", "ivf"])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.index_dir or args.synthetic:
+        vectors = (
+            load_index_vectors(args.index_dir) if args.index_dir
+            else synthetic_vectors(args.synthetic, args.dim)
+        )
+        queries = make_queries(vectors, args.queries)
+    else:
+        vectors, queries = embed_question_data(args.embedding_model)
+
+    print(f"{len(vectors)} vectors, dim {vectors.shape[1]}, {len(queries)} queries, "
+          f"{args.index_type} index, k={args.k}")
+    print(f"{'codes':10s} {'rerank':>6s} {'index MB':>9s} {'saved':>6s} {'recall@k':>9s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for codes, rerank, memory, saved, recall, p50, p99 in run(
+        vectors, queries, args.k, args.index_type, args.rerank_factor
+    ):
+        print(f"{codes:10s} {rerank:>6s} {memory / 1e6:9.2f} {saved:6.0%} {recall:9.3f} {p50:8.3f} {p99:8.3f}")
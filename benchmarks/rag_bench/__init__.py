@@ -0,0 +1 @@
+"""Offline RAG benchmark harness; run with ``python -m benchmarks.rag_bench``."""
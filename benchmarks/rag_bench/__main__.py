@@ -0,0 +1,160 @@
+"""Offline RAG benchmark: retrieval quality, stage timings and throughput.
+
+Drives the backend, src and rag_pipeline RAG paths with deterministic stub
+embeddings and LLM (with injected latency) over a labeled query set drawn
+from the interview question JSON. Needs no network or API keys, so it runs
+in CI; ``--baseline`` fails the run when recall or MRR regress:
+
+    python -m benchmarks.rag_bench
+    python -m benchmarks.rag_bench --pipelines backend --concurrency 1 8 32 --llm-latency-ms 300
+    python -m benchmarks.rag_bench --baseline benchmarks/rag_bench/baseline.json --output rag_bench.json
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from backend.services.metrics import percentile
+from .pipelines import PIPELINES
+from .queries import LabeledQuery, first_relevant_rank, load_queries, mean_reciprocal_rank, recall_at_k
+from .stages import STAGES, trace_request
+from .stubs import StubEmbeddings, StubLLM
+
+
+def ms(seconds: float) -> float:
+    return round(1000 * seconds, 2)
+
+
+def evaluate(pipeline, queries: List[LabeledQuery], ks: List[int]) -> Dict:
+    """One sequential pass: retrieval quality and where each request's time goes"""
+    ranks, traces = [], []
+    for query in queries:
+        with trace_request() as trace:
+            pipeline.run(query)
+        ranks.append(first_relevant_rank(trace.documents, query))
+        traces.append(trace)
+
+    def p50(values):
+        return ms(percentile(sorted(values), 50))
+
+    return {
+        **{f"recall@{k}": round(recall_at_k(ranks, k), 4) for k in ks},
+        "mrr": round(mean_reciprocal_rank(ranks), 4),
+        "stages_p50_ms": {
+            **{name: p50([trace.stages[name] for trace in traces]) for name in STAGES},
+            "other": p50([trace.other for trace in traces])
+        },
+        "latency_p50_ms": p50([trace.total for trace in traces]),
+        "latency_p99_ms": ms(percentile(sorted(trace.total for trace in traces), 99))
+    }
+
+
+def throughput(pipeline, queries: List[LabeledQuery], concurrency: int, requests: int) -> Dict:
+    """Requests per second with ``concurrency`` requests in flight"""
+    def timed_run(query):
+        started_at = time.perf_counter()
+        pipeline.run(query)
+        return time.perf_counter() - started_at
+
+    batch = [queries[i % len(queries)] for i in range(requests)]
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(timed_run, batch))
+    elapsed = time.perf_counter() - started_at
+    return {
+        "concurrency": concurrency,
+        "requests_per_second": round(requests / elapsed, 2),
+        "latency_p50_ms": ms(percentile(latencies, 50)),
+        "latency_p99_ms": ms(percentile(latencies, 99))
+    }
+
+
+def run(args) -> Dict:
+    queries = load_queries(args.queries, args.dropout, args.seed)
+    results = {"queries": len(queries), "config": {
+        "embed_latency_ms": args.embed_latency_ms,
+        "llm_latency_ms": args.llm_latency_ms,
+        "dropout": args.dropout,
+        "with_caches": args.with_caches
+    }, "pipelines": {}}
+    for name in args.pipelines:
+        embeddings = StubEmbeddings(args.embedding_dim, args.embed_latency_ms / 1000)
+        llm = StubLLM(latency_seconds=args.llm_latency_ms / 1000)
+        started_at = time.perf_counter()
+        pipeline = PIPELINES[name](embeddings, llm, tempfile.mkdtemp(prefix=f"rag-bench-{name}-"), args.with_caches)
+        result = {"setup_ms": ms(time.perf_counter() - started_at)}
+        result.update(evaluate(pipeline, queries, args.k))
+        result["throughput"] = [
+            throughput(pipeline, queries, concurrency, args.requests or len(queries))
+            for concurrency in args.concurrency
+        ]
+        results["pipelines"][name] = result
+    return results
+
+
+def report(results: Dict, ks: List[int]) -> None:
+    print(f"{results['queries']} labeled queries, config {results['config']}")
+    header = " ".join(f"{f'R@{k}':>6s}" for k in ks)
+    print(f"{'pipeline':13s} {header} {'MRR':>6s}  " + " ".join(f"{name:>7s}" for name in STAGES + ("other",))
+          + f" {'p50 ms':>8s} {'p99 ms':>8s}")
+    for name, result in results["pipelines"].items():
+        recalls = " ".join(f"{result[f'recall@{k}']:6.3f}" for k in ks)
+        stages = " ".join(f"{result['stages_p50_ms'][stage]:7.2f}" for stage in STAGES + ("other",))
+        print(f"{name:13s} {recalls} {result['mrr']:6.3f}  {stages} "
+              f"{result['latency_p50_ms']:8.2f} {result['latency_p99_ms']:8.2f}")
+    print(f"\n{'pipeline':13s} {'in flight':>9s} {'req/s':>8s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for name, result in results["pipelines"].items():
+        for row in result["throughput"]:
+            print(f"{name:13s} {row['concurrency']:9d} {row['requests_per_second']:8.2f} "
+                  f"{row['latency_p50_ms']:8.2f} {row['latency_p99_ms']:8.2f}")
+
+
+def regressions(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Quality metrics that fell more than ``tolerance`` below the baseline.
+
+    Latencies are reported but not gated, as CI runners are too noisy.
+    """
+    if results["queries"] != baseline["queries"]:
+        return [f"ran {results['queries']} queries, baseline has {baseline['queries']}"]
+    failures = []
+    for name, actual in results["pipelines"].items():
+        expected = baseline["pipelines"].get(name, {})
+        for metric, value in expected.items():
+            if (metric.startswith("recall@") or metric == "mrr") and metric in actual:
+                if actual[metric] < value - tolerance:
+                    failures.append(f"{name}: {metric} {actual[metric]:.3f} < baseline {value:.3f}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pipelines", nargs="+", default=list(PIPELINES), choices=list(PIPELINES))
+    parser.add_argument("--queries", type=int, default=0, help="Limit the labeled query set (0: all)")
+    parser.add_argument("--dropout", type=float, default=0.2, help="Fraction of question words dropped per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--embedding-dim", type=int, default=256)
+    parser.add_argument("--embed-latency-ms", type=float, default=5.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=0, help="Requests per concurrency level (0: one per query)")
+    parser.add_argument("--with-caches", action="store_true", help="Keep the semantic and pre-generated answer caches")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Fail if recall or MRR fall below this results file")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    args = parser.parse_args()
+
+    results = run(args)
+    report(results, args.k)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
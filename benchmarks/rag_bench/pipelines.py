@@ -0,0 +1,147 @@
+"""The three RAG entry points, wired to stub models and instrumented by stage.
+
+Each pipeline builds its real service or chain, swaps in the stub embeddings
+and LLM, and wraps the calls that embed, search and assemble the prompt, so
+the benchmark measures the repository's code path rather than a copy of it.
+"""
+import importlib.util
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from langchain.docstore.document import Document
+
+from backend.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+from .queries import LabeledQuery, load_catalog
+from .stages import instrument
+
+RAG_PIPELINE_PATH = os.path.join('AI-interview-chatbot-main', 'src', 'rag_pipeline.py')
+BENCH_ROLE = "backend"
+
+
+def _offline_environment() -> None:
+    # The OpenAI clients are constructed, then replaced by stubs before any call
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+    # Role stores load on first request instead of in a background warm-up
+    os.environ.setdefault("RAG_WARM_ROLES", "")
+
+
+def catalog_documents() -> List[Document]:
+    return [
+        Document(
+            page_content=f"Question: {item['question']}\nAnswer: {item.get('answer', '')}",
+            metadata={"source": category, "type": category}
+        )
+        for category, items in load_catalog().items()
+        for item in items
+    ]
+
+
+class BackendPipeline:
+    """``backend.services.rag_service.RAGService.get_response``"""
+    name = "backend"
+
+    def __init__(self, embeddings, llm, work_dir: str, use_caches: bool = False):
+        _offline_environment()
+        from backend.services.index_store import IndexArtifactStore
+        from backend.services.rag_service import RAGService
+
+        service = RAGService(load_index=False)
+        service.llm = llm
+        service.embeddings = CachedEmbeddings(embeddings, cache=EmbeddingCache(os.path.join(work_dir, "embeddings")))
+        service.index_store = IndexArtifactStore(os.path.join(work_dir, "index"))
+        if not use_caches:
+            service.answer_cache = None
+            service.pregenerated = None
+        service.initialize_vector_store()
+
+        instrument(service.embeddings, "embed_query", "embed")
+        # Keyword match, query embedding and vector search; the embedding is charged to "embed"
+        instrument(service, "prepare", "search", capture=lambda result: result[1].documents if result[1] else [])
+        instrument(service, "assemble_context", "prompt")
+        instrument(service, "build_prompt", "prompt")
+        self.service = service
+
+    def run(self, query: LabeledQuery) -> Dict[str, Any]:
+        return self.service.get_response(query.query, BENCH_ROLE, query.question_type)
+
+
+def load_src_rag_service():
+    # src/services/rag_service.py imports "models" top-level, as when run from src/
+    import src.models
+    sys.modules.setdefault("models", src.models)
+    from src.services import rag_service
+    return rag_service
+
+
+class SrcPipeline:
+    """``src.services.rag_service.RAGService.process_question``"""
+    name = "src"
+
+    def __init__(self, embeddings, llm, work_dir: str, use_caches: bool = False):
+        _offline_environment()
+        rag_service = load_src_rag_service()
+        from backend.services.vector_index import build_vector_store, choose_index_spec
+
+        service = rag_service.RAGService()
+        service.llm = llm
+        service.memory.llm = llm
+        service.embeddings = CachedEmbeddings(embeddings, cache=EmbeddingCache(os.path.join(work_dir, "embeddings")))
+
+        def load_store(role):
+            # The catalog stands in for the role's document directory
+            texts = service.text_splitter.split_documents(catalog_documents())
+            for chunk in texts:
+                chunk.metadata["topics"] = service.topic_tagger.tag(chunk.page_content)
+            return build_vector_store(texts, service.embeddings, choose_index_spec(len(texts)))
+
+        service.vector_stores.loader = load_store
+        self.role = rag_service.RoleType(BENCH_ROLE)
+        self.question_types = rag_service.QuestionType
+        chain = service.get_chat_chain(self.role)
+
+        instrument(service.embeddings, "embed_query", "embed")
+        instrument(chain.retriever, "get_relevant_documents", "search", capture=list)
+        instrument(chain, "_reduce_tokens_below_limit", "prompt")
+        self.service = service
+
+    def run(self, query: LabeledQuery) -> Dict[str, Any]:
+        return self.service.process_question(query.query, self.role, self.question_types(query.question_type))
+
+
+def load_rag_pipeline():
+    spec = importlib.util.spec_from_file_location("rag_pipeline", RAG_PIPELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class RagPipeline:
+    """``AI-interview-chatbot-main/src/rag_pipeline.answer_query``"""
+    name = "rag_pipeline"
+
+    def __init__(self, embeddings, llm, work_dir: str, use_caches: bool = False):
+        module = load_rag_pipeline()
+        # rag_pipeline reads flat lists of {question, model_answer}
+        paths = []
+        for category, items in load_catalog().items():
+            path = os.path.join(work_dir, f"{category}_questions.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([
+                    {"question": item['question'], "model_answer": item.get('answer', '')} for item in items
+                ], f)
+            paths.append(path)
+        vector_store = module.build_vector_store_from_json(paths, embeddings=embeddings)
+        chain = module.get_rag_chain(vector_store, llm=llm)
+
+        instrument(chain.retriever, "get_relevant_documents", "search", capture=list)
+        instrument(chain.combine_documents_chain, "_get_inputs", "prompt")
+        self.module = module
+        self.chain = chain
+
+    def run(self, query: LabeledQuery):
+        return self.module.answer_query(self.chain, query.query)
+
+
+PIPELINES = {pipeline.name: pipeline for pipeline in (BackendPipeline, SrcPipeline, RagPipeline)}
@@ -0,0 +1,92 @@
+"""Labeled query set drawn from the interview question JSON.
+
+Each catalog question becomes a query whose relevant documents are the
+chunks holding that question. Queries drop a fraction of the question's
+words (deterministically) so retrieval is not a verbatim lookup.
+"""
+import json
+import os
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+from backend.services.semantic_cache import normalize_question
+
+QUESTION_FILES = {
+    "technical": os.path.join('AI-interview-chatbot-main', 'data', 'technical_questions.json'),
+    "behavioral": os.path.join('AI-interview-chatbot-main', 'data', 'behavioral_questions.json'),
+    "hr": os.path.join('AI-interview-chatbot-main', 'data', 'hr_questions.json')
+}
+
+# Chat question type a catalog question is asked under
+CHAT_QUESTION_TYPES = {"technical": "technical", "behavioral": "behavioral", "hr": "resume"}
+
+QUESTION_LINE_RE = re.compile(r"Question: (.*)")
+
+
+@dataclass
+class LabeledQuery:
+    query: str
+    question: str
+    category: str
+    answer: str
+
+    @property
+    def question_type(self) -> str:
+        return CHAT_QUESTION_TYPES[self.category]
+
+
+def load_catalog() -> Dict[str, List[Dict]]:
+    catalog = {}
+    for category, path in QUESTION_FILES.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        catalog[category] = data if isinstance(data, list) else next(iter(data.values()))
+    return catalog
+
+
+def perturb(question: str, dropout: float, rng: random.Random) -> str:
+    words = question.split()
+    kept = [word for word in words if rng.random() >= dropout]
+    return " ".join(kept or words)
+
+
+def load_queries(limit: int = 0, dropout: float = 0.2, seed: int = 0) -> List[LabeledQuery]:
+    rng = random.Random(seed)
+    queries, seen = [], set()
+    for category, items in load_catalog().items():
+        for item in items:
+            key = normalize_question(item['question'])
+            if key in seen:
+                continue
+            seen.add(key)
+            queries.append(LabeledQuery(
+                query=perturb(item['question'], dropout, rng),
+                question=item['question'],
+                category=category,
+                answer=item.get('answer') or item.get('model_answer', '')
+            ))
+    return queries[:limit] if limit else queries
+
+
+def is_relevant(document, query: LabeledQuery) -> bool:
+    content = getattr(document, "page_content", document)
+    match = QUESTION_LINE_RE.search(content)
+    return match is not None and normalize_question(match.group(1)) == normalize_question(query.question)
+
+
+def first_relevant_rank(documents: Sequence, query: LabeledQuery) -> int:
+    """1-based rank of the first relevant document, 0 if none was retrieved"""
+    for rank, document in enumerate(documents, start=1):
+        if is_relevant(document, query):
+            return rank
+    return 0
+
+
+def recall_at_k(ranks: Sequence[int], k: int) -> float:
+    return sum(1 for rank in ranks if 0 < rank <= k) / len(ranks) if ranks else 0.0
+
+
+def mean_reciprocal_rank(ranks: Sequence[int]) -> float:
+    return sum(1 / rank for rank in ranks if rank) / len(ranks) if ranks else 0.0
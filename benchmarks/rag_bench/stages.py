@@ -0,0 +1,89 @@
+"""Per-request stage timing for code we do not own.
+
+A ``Trace`` is bound to the current thread for the duration of one request.
+Wrapped callables add their time to a named stage; time spent in a nested
+wrapped call is charged to the inner stage only, so stages never overlap
+(e.g. the query embedding done inside a search counts as "embed").
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+STAGES = ("embed", "search", "prompt", "llm")
+
+_local = threading.local()
+
+
+@dataclass
+class Trace:
+    stages: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    total: float = 0.0
+    documents: List[Any] = field(default_factory=list)
+    # Child time accumulated by the enclosing stage frames
+    _stack: List[float] = field(default_factory=list)
+
+    @property
+    def other(self) -> float:
+        """Time outside every instrumented stage: framework and glue code"""
+        return max(0.0, self.total - sum(self.stages.values()))
+
+
+def current_trace() -> Optional[Trace]:
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def trace_request():
+    trace = Trace()
+    _local.trace = trace
+    started_at = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.total = time.perf_counter() - started_at
+        _local.trace = None
+
+
+@contextmanager
+def stage(name: str):
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    trace._stack.append(0.0)
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        children = trace._stack.pop()
+        trace.stages[name] += elapsed - children
+        if trace._stack:
+            trace._stack[-1] += elapsed
+
+
+def timed(fn: Callable, name: str, capture: Optional[Callable[[Any], List[Any]]] = None) -> Callable:
+    """``fn`` timed as stage ``name``; ``capture`` maps its result to the
+    retrieved documents recorded on the trace"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with stage(name):
+            result = fn(*args, **kwargs)
+        trace = current_trace()
+        if capture is not None and trace is not None:
+            documents = capture(result)
+            if documents:
+                trace.documents = list(documents)
+        return result
+    return wrapper
+
+
+def instrument(obj: Any, attribute: str, name: str, capture: Optional[Callable[[Any], List[Any]]] = None) -> None:
+    """Replace a bound method on ``obj`` with its timed version.
+
+    Uses ``object.__setattr__`` so LangChain's pydantic models accept it.
+    """
+    object.__setattr__(obj, attribute, timed(getattr(obj, attribute), name, capture))
@@ -0,0 +1,67 @@
+"""Deterministic stand-ins for the embedding model and the LLM.
+
+Both sleep for a configurable latency so concurrency and queueing behave as
+with the real services, but never touch the network. The embeddings are
+signed feature hashes of the text's words, so lexically similar texts land
+close together and retrieval quality is meaningful, and reproducible.
+"""
+import hashlib
+import re
+import time
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.llms.base import LLM
+
+from .stages import stage
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class StubEmbeddings(Embeddings):
+    def __init__(self, size: int = 256, latency_seconds: float = 0.0, per_text_seconds: float = 0.0):
+        self.size = size
+        self.latency_seconds = latency_seconds
+        self.per_text_seconds = per_text_seconds
+        # Read by CachedEmbeddings to key its on-disk cache
+        self.model = f"stub-hash-{size}"
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in WORD_RE.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.size
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _sleep(self, num_texts: int) -> None:
+        time.sleep(self.latency_seconds + self.per_text_seconds * num_texts)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with stage("embed"):
+            self._sleep(len(texts))
+            return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        with stage("embed"):
+            self._sleep(1)
+            return self._vector(text)
+
+
+class StubLLM(LLM):
+    """Answers with the first words of the prompt's question after a fixed delay"""
+    latency_seconds: float = 0.0
+    answer_words: int = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        with stage("llm"):
+            time.sleep(self.latency_seconds)
+            question = prompt.rsplit("Question:", 1)[-1]
+            words = WORD_RE.findall(question.lower())[:self.answer_words]
+            return "Stub answer: " + " ".join(words)
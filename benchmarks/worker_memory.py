@@ -0,0 +1,99 @@
+"""Benchmark: per-worker memory of a shared, memory-mapped index artifact.
+
+Starts several worker processes that each load the same artifact and run
+queries, like uvicorn workers, then reports each worker's private (anonymous)
+memory, its mapped file pages and its proportional share (PSS) of both.
+Linux only, as it reads /proc. Uses a synthetic artifact by default:
+
+    python -m benchmarks.worker_memory --workers 8 --num-vectors 200000 --dim 384
+    python -m benchmarks.worker_memory --index-root backend/data/index --key <key>
+"""
+import argparse
+import multiprocessing
+import tempfile
+
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.embeddings.fake import FakeEmbeddings
+from langchain.vectorstores import FAISS
+
+from backend.services.index_store import IndexArtifactStore
+from backend.services.vector_index import build_index, choose_index_spec
+from benchmarks.ann_recall import make_queries, synthetic_vectors
+
+
+def memory_kb() -> dict:
+    usage = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon", "RssFile")):
+                name, value, _ = line.split()
+                usage[name.rstrip(':')] = int(value)
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                usage["Pss"] = int(line.split()[1])
+    return usage
+
+
+def build_artifact(root: str, num_vectors: int, dim: int) -> str:
+    vectors = synthetic_vectors(num_vectors, dim)
+    index = build_index(vectors, choose_index_spec(num_vectors))
+    ids = [str(i) for i in range(num_vectors)]
+    documents = [Document(page_content=f"Synthetic chunk {i} " * 20) for i in range(num_vectors)]
+    store = FAISS(FakeEmbeddings(size=dim), index, InMemoryDocstore(dict(zip(ids, documents))), dict(enumerate(ids)))
+    IndexArtifactStore(root).save("synthetic", store)
+    return "synthetic"
+
+
+def worker(root: str, key: str, use_mmap: bool, num_queries: int, barrier, results) -> None:
+    store = IndexArtifactStore(root, mmap=use_mmap).load(key, FakeEmbeddings(size=1))
+    index = store.index
+    queries = make_queries(index.reconstruct_n(0, min(index.ntotal, 1000)), num_queries)
+    for query in queries:
+        _, positions = index.search(query[None, :], 5)
+        [store.docstore.search(store.index_to_docstore_id[p]) for p in positions[0] if p >= 0]
+    # Measure while every worker still holds its mapping
+    barrier.wait()
+    results.put(memory_kb())
+    barrier.wait()
+
+
+def run(root: str, key: str, workers: int, use_mmap: bool, num_queries: int) -> list:
+    barrier = multiprocessing.Barrier(workers)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(root, key, use_mmap, num_queries, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    usage = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return usage
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index-root", help="Artifact root directory (default: build a synthetic one)")
+    parser.add_argument("--key", help="Artifact key under --index-root")
+    parser.add_argument("--num-vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    root, key = args.index_root, args.key
+    if root is None:
+        root = tempfile.mkdtemp(prefix="rag-worker-memory-")
+        key = build_artifact(root, args.num_vectors, args.dim)
+
+    print(f"{args.workers} workers, {args.queries} queries each")
+    print(f"{'load':6s} {'anon MB/worker':>15s} {'file MB/worker':>15s} {'PSS MB/worker':>14s} {'PSS MB total':>13s}")
+    for use_mmap in (False, True):
+        usage = run(root, key, args.workers, use_mmap, args.queries)
+        anon, mapped, pss = (np.mean([u[name] for u in usage]) / 1024 for name in ("RssAnon", "RssFile", "Pss"))
+        print(f"{'mmap' if use_mmap else 'copy':6s} {anon:15.1f} {mapped:15.1f} {pss:14.1f} "
+              f"{sum(u['Pss'] for u in usage) / 1024:13.1f}")
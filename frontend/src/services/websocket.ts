@@ -10,7 +10,8 @@ class WebSocketService {
     this.socket = io(process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000', {
       path: '/ws/chat',
       query: {
-        userId: userId.toString()
+        userId: userId.toString(),
+        token: localStorage.getItem('token') || ''
       }
     });
 
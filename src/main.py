@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
+import asyncio
 import jwt
 from jwt.exceptions import PyJWTError
 from passlib.context import CryptContext
@@ -384,12 +385,16 @@ async def process_chat(
     db.refresh(chat_session)
     
     # Process the question
-    response = rag_service.process_question(
-        question=chat_request.chat_history[-1]["content"],
-        role=user.selected_role,
-        question_type=chat_request.question_type,
-        chat_history=chat_request.chat_history[:-1]
-    )
+    try:
+        response = await rag_service.aprocess_question(
+            question=chat_request.chat_history[-1]["content"],
+            role=user.selected_role,
+            question_type=chat_request.question_type,
+            chat_history=chat_request.chat_history[:-1],
+            session_id=(user_id, chat_request.question_type.value)
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out processing the question")
     
     # Update progress
     progress_service = ProgressService(db)
@@ -400,6 +405,11 @@ async def process_chat(
     
     return response
 
+@app.get("/rag/stats")
+def get_rag_stats():
+    """Report RAG executor, vector store and embedding cache statistics"""
+    return rag_service.get_stats()
+
 @app.get("/users/{user_id}/progress", response_model=Dict[str, float])
 def get_progress(
     user_id: int,
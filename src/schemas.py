@@ -183,4 +183,5 @@ class ChatResponse(BaseModel):
     answer: str
     context_used: Optional[List[str]] = None
     confidence_score: Optional[float] = None
-    suggested_topics: Optional[List[str]] = None 
\ No newline at end of file
+    suggested_topics: Optional[List[str]] = None
+    prompt_tokens: Optional[int] = None
\ No newline at end of file
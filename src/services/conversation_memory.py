@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain.schema import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from backend.services.token_counter import count_tokens, truncate_to_tokens
+
+MEMORY_MODE = os.getenv("CHAT_MEMORY_MODE", "rolling_summary")  # or "buffer"
+MAX_RECENT_MESSAGES = int(os.getenv("CHAT_MEMORY_RECENT_MESSAGES", "6"))
+MAX_HISTORY_TOKENS = int(os.getenv("CHAT_MEMORY_MAX_TOKENS", "1500"))
+MAX_CACHED_SESSIONS = int(os.getenv("CHAT_MEMORY_MAX_SESSIONS", "1000"))
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+
+def to_messages(chat_history: List[Dict[str, Any]]) -> List[BaseMessage]:
+    """Convert API chat history entries to LangChain messages"""
+    return [
+        HumanMessage(content=msg["content"]) if msg["role"] == "user"
+        else AIMessage(content=msg["content"])
+        for msg in chat_history
+    ]
+
+
+def _fingerprint(messages: List[BaseMessage]) -> str:
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(message.type.encode())
+        digest.update(message.content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _format_lines(messages: List[BaseMessage]) -> str:
+    return "\n".join(
+        f"{'Human' if message.type == 'human' else 'AI'}: {message.content}"
+        for message in messages
+    )
+
+
+class RollingSummaryMemory:
+    """Bounded conversation history for chat prompts.
+
+    The most recent ``max_recent_messages`` messages are kept verbatim and
+    older ones are folded into a running summary, cached per chat session so
+    each turn only summarizes the messages that just left the window. The
+    summary plus verbatim messages never exceed ``max_history_tokens``.
+    """
+
+    def __init__(
+        self,
+        llm,
+        max_recent_messages: int = MAX_RECENT_MESSAGES,
+        max_history_tokens: int = MAX_HISTORY_TOKENS,
+        max_sessions: int = MAX_CACHED_SESSIONS,
+        model_name: Optional[str] = None,
+        mode: str = MEMORY_MODE
+    ):
+        self.llm = llm
+        self.mode = mode
+        self.max_recent_messages = max_recent_messages
+        self.max_history_tokens = max_history_tokens
+        self.max_sessions = max_sessions
+        self.model_name = model_name or getattr(llm, "model_name", "gpt-3.5-turbo")
+        # session -> (messages folded, fingerprint of those messages, summary)
+        self._summaries: "OrderedDict[Hashable, Tuple[int, str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.summarize_calls = 0
+
+    def _tokens(self, messages: List[BaseMessage]) -> int:
+        return sum(count_tokens(message.content, self.model_name) + 4 for message in messages)
+
+    def _summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        self.summarize_calls += 1
+        prompt = SUMMARY_PROMPT.format(summary=summary, new_lines=_format_lines(messages))
+        return self.llm.predict(prompt).strip()
+
+    def _summary_for(self, session_id: Hashable, folded: List[BaseMessage]) -> str:
+        if not folded:
+            return ""
+        with self._lock:
+            cached = self._summaries.get(session_id)
+
+        count, summary = 0, ""
+        # Extend the cached summary only if the history it covers is unchanged
+        if cached and cached[0] <= len(folded) and cached[1] == _fingerprint(folded[:cached[0]]):
+            count, _, summary = cached
+        if count < len(folded):
+            summary = self._summarize(summary, folded[count:])
+
+        with self._lock:
+            self._summaries[session_id] = (len(folded), _fingerprint(folded), summary)
+            self._summaries.move_to_end(session_id)
+            while len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def build_history(
+        self,
+        chat_history: List[Dict[str, Any]],
+        session_id: Optional[Hashable] = None
+    ) -> List[BaseMessage]:
+        messages = to_messages(chat_history or [])
+        if self.mode == "buffer":
+            return messages
+
+        # Fold messages out of the verbatim window until it fits the budget,
+        # leaving a quarter of the budget for the summary once anything is folded
+        split = max(0, len(messages) - self.max_recent_messages)
+        while split < len(messages):
+            budget = self.max_history_tokens - (self.max_history_tokens // 4 if split else 0)
+            if self._tokens(messages[split:]) <= budget:
+                break
+            split += 1
+        recent = messages[split:]
+
+        summary = self._summary_for(session_id, messages[:split])
+        if not summary:
+            return recent
+
+        remaining = (
+            self.max_history_tokens - self._tokens(recent)
+            - self._tokens([SystemMessage(content=SUMMARY_PREFIX)])
+        )
+        summary = truncate_to_tokens(summary, remaining, self.model_name)
+        if not summary:
+            return recent
+        return [SystemMessage(content=SUMMARY_PREFIX + summary)] + recent
+
+    def clear(self, session_id: Hashable) -> None:
+        with self._lock:
+            self._summaries.pop(session_id, None)
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from langchain.docstore.document import Document
+from langchain.document_loaders import UnstructuredFileLoader
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing changes so every file is parsed again
+INGESTION_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.getenv("RAG_INGEST_CACHE_DIR", os.path.join("data", ".ingest_cache"))
+# Parser processes; PDF/DOCX parsing is CPU bound
+INGEST_WORKERS = int(os.getenv("RAG_INGEST_WORKERS", "0")) or os.cpu_count() or 1
+# Files slower than this are logged as warnings
+SLOW_PARSE_SECONDS = float(os.getenv("RAG_SLOW_PARSE_SECONDS", "5"))
+
+MANIFEST_FILE = "manifest.json"
+# Same files DirectoryLoader picks up by default
+FILE_GLOB = "**/[!.]*"
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_json(path: str, data, **kwargs) -> None:
+    """Write ``data`` through a temp file so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def parse_file(path: str, loader_cls: Type = UnstructuredFileLoader) -> Tuple[str, List[Dict], float]:
+    """Parse one file in a worker process; documents come back as plain dicts"""
+    started_at = time.perf_counter()
+    documents = loader_cls(path).load()
+    return path, [
+        {"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents
+    ], time.perf_counter() - started_at
+
+
+@dataclass
+class IngestionResult:
+    documents: List[Document]
+    parsed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.documents),
+            "parsed": len(self.parsed),
+            "unchanged": len(self.unchanged),
+            "removed": len(self.removed),
+            "failed": len(self.failed),
+            "seconds": round(self.seconds, 2)
+        }
+
+
+class DocumentIngestor:
+    """Parses a corpus directory in a process pool, re-parsing only what changed.
+
+    A manifest records each file's size, mtime and content hash along with
+    its parsed documents. Later runs parse new and modified files only,
+    reuse the stored documents for the rest and drop those of deleted files.
+    Embeddings of unchanged chunks then come from the embedding cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_workers: int = INGEST_WORKERS,
+        loader_cls: Type = UnstructuredFileLoader
+    ):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.loader_cls = loader_cls
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+
+    def _corpus_dir(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _documents_path(self, name: str, path: str) -> str:
+        key = hashlib.sha256(path.encode()).hexdigest()[:24]
+        return os.path.join(self._corpus_dir(name), "documents", f"{key}.json")
+
+    def load_manifest(self, name: str) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self._corpus_dir(name), MANIFEST_FILE), 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if manifest.get("version") != INGESTION_VERSION or manifest.get("loader") != self.loader_cls.__name__:
+            return {}
+        return manifest["files"]
+
+    def _save_manifest(self, name: str, files: Dict[str, Dict]) -> None:
+        write_json(
+            os.path.join(self._corpus_dir(name), MANIFEST_FILE),
+            {"version": INGESTION_VERSION, "loader": self.loader_cls.__name__, "files": files},
+            indent=2
+        )
+
+    def _is_unchanged(self, path: str, stat: os.stat_result, entry: Optional[Dict]) -> bool:
+        if entry is None:
+            return False
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return True
+        # Touched but identical content, e.g. after a checkout; keep the parse
+        if entry["size"] == stat.st_size and entry["sha256"] == file_hash(path):
+            entry["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def _parse_all(self, paths: List[str]):
+        if self.max_workers <= 1 or len(paths) <= 1:
+            for path in paths:
+                try:
+                    yield parse_file(path, self.loader_cls), None
+                except Exception as exc:
+                    yield (path, None, 0.0), exc
+            return
+        # Spawned, not forked: role stores are loaded from background threads
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(paths)),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = {path: pool.submit(parse_file, path, self.loader_cls) for path in paths}
+            for path, future in futures.items():
+                try:
+                    yield future.result(), None
+                except Exception as exc:
+                    yield (path, None, 0.0), exc
+
+    def ingest(self, name: str, data_path: str) -> IngestionResult:
+        """Documents of every file under ``data_path``, parsed or from the manifest"""
+        started_at = time.perf_counter()
+        os.makedirs(os.path.join(self._corpus_dir(name), "documents"), exist_ok=True)
+        manifest = self.load_manifest(name)
+        paths = sorted(str(p) for p in Path(data_path).glob(FILE_GLOB) if p.is_file())
+        result = IngestionResult(documents=[])
+
+        files, to_parse = {}, []
+        for path in paths:
+            stat = os.stat(path)
+            entry = manifest.get(path)
+            if self._is_unchanged(path, stat, entry):
+                files[path] = entry
+                result.unchanged.append(path)
+            else:
+                to_parse.append(path)
+
+        for (path, documents, seconds), error in self._parse_all(to_parse):
+            if error is not None:
+                # Left out of the manifest so the next run tries again
+                logger.error("Failed to parse %s: %s", path, error)
+                result.failed.append(path)
+                continue
+            log = logger.warning if seconds >= SLOW_PARSE_SECONDS else logger.info
+            log("Parsed %s in %.2fs (%d documents)", path, seconds, len(documents))
+            write_json(self._documents_path(name, path), documents, default=str)
+            stat = os.stat(path)
+            files[path] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "sha256": file_hash(path),
+                "parse_seconds": round(seconds, 3),
+                "documents": len(documents)
+            }
+            result.parsed.append(path)
+
+        for path in manifest:
+            if path not in files:
+                if path not in result.failed:
+                    result.removed.append(path)
+                try:
+                    os.remove(self._documents_path(name, path))
+                except FileNotFoundError:
+                    pass
+
+        for path in paths:
+            if path in files:
+                with open(self._documents_path(name, path), 'r') as f:
+                    result.documents.extend(Document(**doc) for doc in json.load(f))
+
+        self._save_manifest(name, files)
+        result.seconds = time.perf_counter() - started_at
+        self.last_results[name] = result.summary()
+        logger.info("Ingested %s: %s", name, result.summary())
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.last_results)
@@ -4,89 +4,163 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chat_models import ChatOpenAI
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
-from langchain.document_loaders import DirectoryLoader, TextLoader
-from typing import List, Dict, Any, Optional
+from langchain.document_loaders import TextLoader
+from typing import List, Dict, Any, Optional, Tuple
+import json
 import os
 from models import RoleType, QuestionType
+from backend.services.bm25_index import HybridRetriever
+from backend.services.concurrency import BoundedExecutor
+from backend.services.context_assembler import ContextAssembler
+from backend.services.embedding_cache import CachedEmbeddings
+from backend.services.semantic_cache import normalize_question
+from backend.services.single_flight import SingleFlight
+from backend.services.topic_tagger import get_default_tagger
+from backend.services.vector_index import build_vector_store, choose_index_spec
+from .conversation_memory import RollingSummaryMemory
+from .ingestion import DocumentIngestor
+from .vector_store_registry import RoleVectorStoreRegistry
+
+ROLE_DATA_PATHS = {
+    RoleType.FRONTEND: "data/frontend",
+    RoleType.BACKEND: "data/backend",
+    RoleType.FULLSTACK: "data/fullstack",
+    RoleType.DATA_SCIENTIST: "data/data_science",
+    RoleType.DEVOPS: "data/devops",
+    RoleType.AI_ML: "data/ai_ml",
+    RoleType.QA: "data/qa"
+}
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# Total resident size allowed for loaded role stores before cold roles are evicted
+MEMORY_BUDGET_MB = int(os.getenv("RAG_MEMORY_BUDGET_MB", "512"))
+# Roles loaded in the background at startup; the rest load on first use
+WARM_ROLES = [
+    RoleType(role.strip())
+    for role in os.getenv("RAG_WARM_ROLES", "frontend,backend").split(",")
+    if role.strip()
+]
+
+class BudgetedConversationalRetrievalChain(ConversationalRetrievalChain):
+    """Conversational chain whose retrieved documents are deduplicated and
+    trimmed to the role's context token budget before being stuffed"""
+    context_assembler: Optional[Any] = None
+    role: Optional[Any] = None
+
+    def _reduce_tokens_below_limit(self, docs):
+        if self.context_assembler is None:
+            return super()._reduce_tokens_below_limit(docs)
+        return self.context_assembler.assemble(docs, role=self.role).documents
 
 class RAGService:
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings()
+        self.embeddings = CachedEmbeddings(OpenAIEmbeddings())
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP
         )
         self.llm = ChatOpenAI(temperature=0.7)
-        self.vector_stores = {}
+        self.context_assembler = ContextAssembler(chunk_overlap=CHUNK_OVERLAP)
+        self.topic_tagger = get_default_tagger()
+        self.memory = RollingSummaryMemory(ChatOpenAI(temperature=0))
+        # Parses role documents in a process pool, only files changed since the last run
+        self.ingestor = DocumentIngestor()
+        # Chains are stateless once memory is passed per request, so build one per role
+        self._chains: Dict[Tuple[RoleType, str], ConversationalRetrievalChain] = {}
+        self.vector_stores = RoleVectorStoreRegistry(
+            loader=self._load_role_store,
+            memory_budget_bytes=MEMORY_BUDGET_MB * 1024 * 1024,
+            on_evict=self._drop_chains
+        )
+        self.executor = BoundedExecutor()
+        self.single_flight = SingleFlight()
         self.initialize_vector_stores()
 
     def initialize_vector_stores(self):
-        """Initialize vector stores for different roles and question types"""
-        roles_data = {
-            RoleType.FRONTEND: "data/frontend",
-            RoleType.BACKEND: "data/backend",
-            RoleType.FULLSTACK: "data/fullstack",
-            RoleType.DATA_SCIENTIST: "data/data_science",
-            RoleType.DEVOPS: "data/devops",
-            RoleType.AI_ML: "data/ai_ml",
-            RoleType.QA: "data/qa"
+        """Warm the most used role stores in the background; others load lazily"""
+        self.vector_stores.warm(WARM_ROLES)
+
+    def _load_role_store(self, role: RoleType) -> Optional[FAISS]:
+        """Load, split and embed the documents for a single role"""
+        data_path = ROLE_DATA_PATHS.get(role)
+        if not data_path or not os.path.exists(data_path):
+            return None
+        documents = self.ingestor.ingest(role.value, data_path).documents
+        # Chunks of unchanged files are served from the embedding cache
+        texts = self.text_splitter.split_documents(documents)
+        for chunk in texts:
+            chunk.metadata["topics"] = self.topic_tagger.tag(chunk.page_content)
+        # RAG_INDEX_TYPE_<ROLE> overrides the size-based index choice per role
+        spec = choose_index_spec(len(texts), os.getenv(f"RAG_INDEX_TYPE_{role.name}"))
+        return build_vector_store(texts, self.embeddings, spec)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor.stats(),
+            "single_flight": self.single_flight.stats(),
+            "vector_stores": self.vector_stores.stats(),
+            "ingestion": self.ingestor.stats(),
+            "context": self.context_assembler.stats(),
+            "embedding_cache": self.embeddings.cache.stats()
         }
-        
-        for role, data_path in roles_data.items():
-            if os.path.exists(data_path):
-                documents = DirectoryLoader(data_path).load()
-                texts = self.text_splitter.split_documents(documents)
-                self.vector_stores[role] = FAISS.from_documents(texts, self.embeddings)
 
     def get_chat_chain(self, role: RoleType, memory: Optional[ConversationBufferMemory] = None) -> ConversationalRetrievalChain:
-        """Create a conversational chain for the specified role"""
-        if memory is None:
-            memory = ConversationBufferMemory(
-                memory_key="chat_history",
-                return_messages=True
-            )
-        
+        """Return the cached conversational chain for the specified role.
+
+        Passing ``memory`` builds a dedicated chain bound to that memory instead.
+        """
         vector_store = self.vector_stores.get(role)
         if not vector_store:
             raise ValueError(f"No vector store found for role: {role}")
-        
-        return ConversationalRetrievalChain.from_llm(
+
+        if memory is not None:
+            return self._build_chain(role, vector_store, memory=memory)
+
+        key = (role, "conversational_retrieval")
+        chain = self._chains.get(key)
+        if chain is None or chain.retriever.vectorstore is not vector_store:
+            chain = self._build_chain(role, vector_store)
+            self._chains[key] = chain
+        return chain
+
+    def _build_chain(self, role: RoleType, vector_store: FAISS, **kwargs) -> ConversationalRetrievalChain:
+        return BudgetedConversationalRetrievalChain.from_llm(
             llm=self.llm,
-            retriever=vector_store.as_retriever(),
-            memory=memory,
-            return_source_documents=True
+            # BM25 over the role's chunks fused with vector similarity
+            retriever=HybridRetriever.from_vector_store(vector_store),
+            return_source_documents=True,
+            return_generated_question=True,
+            context_assembler=self.context_assembler,
+            role=role,
+            **kwargs
         )
 
+    def _drop_chains(self, role: RoleType) -> None:
+        """Release cached chains so an evicted role store can be freed"""
+        for key in [key for key in self._chains if key[0] == role]:
+            del self._chains[key]
+
     def process_question(
         self,
         question: str,
         role: RoleType,
         question_type: QuestionType,
-        chat_history: List[Dict[str, Any]] = None
+        chat_history: List[Dict[str, Any]] = None,
+        session_id: Optional[Any] = None
     ) -> Dict[str, Any]:
         """Process a question and return an answer with context"""
-        # Convert chat history to the format expected by LangChain
-        formatted_history = []
-        if chat_history:
-            for msg in chat_history:
-                if msg["role"] == "user":
-                    formatted_history.append(("human", msg["content"]))
-                else:
-                    formatted_history.append(("assistant", msg["content"]))
-
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True,
-            chat_memory=formatted_history
-        )
+        # Recent turns verbatim plus a rolling summary of older ones, within a token budget
+        formatted_history = self.memory.build_history(chat_history, session_id)
 
-        chain = self.get_chat_chain(role, memory)
+        chain = self.get_chat_chain(role)
         
         # Prepare the prompt based on question type
         prompt = self._prepare_prompt(question, question_type)
         
-        # Get the response
-        response = chain({"question": prompt})
+        # Get the response; only the history and question vary per request
+        response = chain({"question": prompt, "chat_history": formatted_history})
         
         # Extract relevant information
         answer = response["answer"]
@@ -94,14 +168,47 @@ class RAGService:
         
         # Get context references
         context_used = [doc.metadata.get("source", "") for doc in source_documents]
+
+        # Size of the answer prompt actually sent, after context assembly
+        answer_prompt = chain.combine_docs_chain.llm_chain.prompt.format(
+            context="\n\n".join(doc.page_content for doc in source_documents),
+            question=response["generated_question"]
+        )
         
         return {
             "answer": answer,
             "context_used": context_used,
             "confidence_score": self._calculate_confidence(response),
-            "suggested_topics": self._suggest_related_topics(question, role, source_documents)
+            "suggested_topics": self._suggest_related_topics(question, role, source_documents),
+            "prompt_tokens": self.context_assembler.count_tokens(answer_prompt)
         }
 
+    async def aprocess_question(
+        self,
+        question: str,
+        role: RoleType,
+        question_type: QuestionType,
+        chat_history: List[Dict[str, Any]] = None,
+        session_id: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Process a question without blocking the event loop.
+
+        Concurrent requests with the same question and history share one call.
+        """
+        key = (
+            role, question_type, normalize_question(question),
+            json.dumps(chat_history or [], sort_keys=True, default=str)
+        )
+        response = await self.single_flight.do(key, lambda: self.executor.run(
+            self.process_question,
+            question=question,
+            role=role,
+            question_type=question_type,
+            chat_history=chat_history,
+            session_id=session_id
+        ))
+        return dict(response)
+
     def _prepare_prompt(self, question: str, question_type: QuestionType) -> str:
         """Prepare the prompt based on question type"""
         prompts = {
@@ -126,6 +233,9 @@ class RAGService:
         source_documents: List[Any]
     ) -> List[str]:
         """Suggest related topics based on the question and context"""
-        # Implement topic suggestion logic
-        # This is a placeholder implementation
-        return ["Data Structures", "Algorithms", "System Design Patterns"] 
\ No newline at end of file
+        # Topics were tagged into chunk metadata when the role store was loaded
+        topics = {}
+        for doc in source_documents:
+            for topic in doc.metadata.get("topics", []):
+                topics[topic] = None
+        return list(topics) 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+import numpy as np
+
+from backend.services.vector_index import RerankIndex, index_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_store_size(vector_store: Any) -> int:
+    """Approximate resident bytes of a FAISS store: index codes, re-rank vectors
+    held on the heap, plus docstore text"""
+    size = index_memory_bytes(vector_store.index)
+    if isinstance(vector_store.index, RerankIndex) and not isinstance(vector_store.index.vectors, np.memmap):
+        size += vector_store.index.vectors.nbytes
+    for doc in getattr(vector_store.docstore, "_dict", {}).values():
+        size += len(doc.page_content.encode("utf-8")) + len(str(doc.metadata))
+    return size
+
+
+class RoleVectorStoreRegistry:
+    """Per-role vector stores loaded on first use and kept under a memory budget.
+
+    When the resident size of all loaded stores exceeds ``memory_budget_bytes``
+    the least recently used roles are evicted; they are reloaded on next use.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Optional[Any]],
+        memory_budget_bytes: int,
+        size_fn: Callable[[Any], int] = estimate_store_size,
+        on_evict: Optional[Callable[[Hashable], None]] = None
+    ):
+        self.loader = loader
+        self.memory_budget_bytes = memory_budget_bytes
+        self.size_fn = size_fn
+        self.on_evict = on_evict
+        self._stores: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._load_seconds: Dict[Hashable, float] = {}
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def _role_lock(self, role: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(role, threading.Lock())
+
+    def get(self, role: Hashable) -> Optional[Any]:
+        with self._lock:
+            if role in self._stores:
+                self._stores.move_to_end(role)
+                return self._stores[role]
+
+        # Only one thread loads a given role; others wait for its result
+        with self._role_lock(role):
+            with self._lock:
+                if role in self._stores:
+                    self._stores.move_to_end(role)
+                    return self._stores[role]
+
+            started_at = time.perf_counter()
+            store = self.loader(role)
+            if store is None:
+                return None
+            load_seconds = time.perf_counter() - started_at
+            size = self.size_fn(store)
+            logger.info(
+                "Loaded vector store for %s in %.2fs (%.1f MB)",
+                role, load_seconds, size / 1024 / 1024
+            )
+
+            with self._lock:
+                self._stores[role] = store
+                self._sizes[role] = size
+                self._load_seconds[role] = load_seconds
+                self.loads += 1
+                self._evict(keep=role)
+            return store
+
+    def _evict(self, keep: Hashable) -> None:
+        while sum(self._sizes.values()) > self.memory_budget_bytes and len(self._stores) > 1:
+            role = next(r for r in self._stores if r != keep)
+            del self._stores[role]
+            size = self._sizes.pop(role)
+            self.evictions += 1
+            logger.info("Evicted vector store for %s (%.1f MB)", role, size / 1024 / 1024)
+            if self.on_evict is not None:
+                self.on_evict(role)
+
+    def warm(self, roles: Iterable[Hashable], background: bool = True) -> Optional[threading.Thread]:
+        """Load ``roles`` ahead of traffic, by default on a daemon thread"""
+        roles = list(roles)
+
+        def load_all():
+            for role in roles:
+                try:
+                    self.get(role)
+                except Exception:
+                    logger.exception("Failed to warm vector store for %s", role)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="vector-store-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def __contains__(self, role: Hashable) -> bool:
+        return role in self._stores
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": sum(self._sizes.values()),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "roles": {
+                    getattr(role, "value", str(role)): {
+                        "resident": role in self._stores,
+                        "resident_bytes": self._sizes.get(role, 0),
+                        "last_load_seconds": round(self._load_seconds[role], 3)
+                    }
+                    for role in self._load_seconds
+                }
+            }
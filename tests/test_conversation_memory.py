@@ -0,0 +1,44 @@
+from langchain.llms.fake import FakeListLLM
+
+from src.services.conversation_memory import RollingSummaryMemory
+
+
+def make_history(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i} " * 3})
+        history.append({"role": "assistant", "content": f"answer {i} " * 3})
+    return history
+
+
+class TestRollingSummaryMemory:
+    def test_short_history_is_kept_verbatim(self):
+        memory = RollingSummaryMemory(FakeListLLM(responses=["unused"]), max_recent_messages=4)
+        messages = memory.build_history(make_history(2), "session")
+
+        assert [m.content for m in messages] == [m["content"] for m in make_history(2)]
+        assert memory.summarize_calls == 0
+
+    def test_history_stays_within_token_budget(self):
+        llm = FakeListLLM(responses=[f"summary {i}" for i in range(20)])
+        memory = RollingSummaryMemory(llm, max_recent_messages=4, max_history_tokens=60)
+
+        for turns in range(3, 10):
+            messages = memory.build_history(make_history(turns), "session")
+            assert memory._tokens(messages) <= 60
+            assert messages[0].type == "system"
+
+    def test_summary_is_extended_incrementally(self):
+        llm = FakeListLLM(responses=[f"summary {i}" for i in range(20)])
+        memory = RollingSummaryMemory(llm, max_recent_messages=4, max_history_tokens=1000)
+
+        memory.build_history(make_history(3), "session")
+        memory.build_history(make_history(3), "session")
+        assert memory.summarize_calls == 1
+
+        memory.build_history(make_history(4), "session")
+        assert memory.summarize_calls == 2
+
+    def test_buffer_mode_returns_full_history(self):
+        memory = RollingSummaryMemory(FakeListLLM(responses=["unused"]), mode="buffer")
+        assert len(memory.build_history(make_history(10), "session")) == 20
@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+from langchain.document_loaders import TextLoader
+
+from src.services import ingestion
+from src.services.ingestion import DocumentIngestor
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    data = tmp_path / "data"
+    (data / "nested").mkdir(parents=True)
+    (data / "closures.txt").write_text("A closure captures variables from its enclosing scope.")
+    (data / "nested" / "gil.txt").write_text("The GIL serialises Python bytecode execution.")
+    (data / ".hidden").write_text("ignored")
+    return data
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    return DocumentIngestor(cache_dir=str(tmp_path / "cache"), max_workers=1, loader_cls=TextLoader)
+
+
+def contents(result):
+    return sorted(doc.page_content for doc in result.documents)
+
+
+class TestDocumentIngestor:
+    def test_first_run_parses_every_file(self, ingestor, corpus):
+        result = ingestor.ingest("backend", str(corpus))
+
+        assert len(result.parsed) == 2
+        assert contents(result) == [
+            "A closure captures variables from its enclosing scope.",
+            "The GIL serialises Python bytecode execution."
+        ]
+        assert all(entry["sha256"] for entry in ingestor.load_manifest("backend").values())
+
+    def test_second_run_reparses_only_changed_and_new_files(self, ingestor, corpus):
+        ingestor.ingest("backend", str(corpus))
+        (corpus / "closures.txt").write_text("Closures keep references to outer variables.")
+        (corpus / "decorators.txt").write_text("Decorators wrap functions.")
+
+        result = ingestor.ingest("backend", str(corpus))
+
+        assert sorted(os.path.basename(path) for path in result.parsed) == ["closures.txt", "decorators.txt"]
+        assert [os.path.basename(path) for path in result.unchanged] == ["gil.txt"]
+        assert "Closures keep references to outer variables." in contents(result)
+        assert len(result.documents) == 3
+
+    def test_touched_file_with_same_content_is_not_reparsed(self, ingestor, corpus):
+        ingestor.ingest("backend", str(corpus))
+        path = corpus / "closures.txt"
+        os.utime(path, (1, 1))
+
+        result = ingestor.ingest("backend", str(corpus))
+
+        assert result.parsed == []
+        assert ingestor.load_manifest("backend")[str(path)]["mtime"] == 1
+
+    def test_deleted_file_drops_its_documents(self, ingestor, corpus):
+        ingestor.ingest("backend", str(corpus))
+        (corpus / "nested" / "gil.txt").unlink()
+
+        result = ingestor.ingest("backend", str(corpus))
+
+        assert [os.path.basename(path) for path in result.removed] == ["gil.txt"]
+        assert contents(result) == ["A closure captures variables from its enclosing scope."]
+
+    def test_interrupted_write_keeps_previous_documents(self, ingestor, corpus, monkeypatch):
+        ingestor.ingest("backend", str(corpus))
+        (corpus / "closures.txt").write_text("Closures keep references to outer variables.")
+
+        def partial_dump(data, f, **kwargs):
+            f.write("[{")
+            raise OSError("disk full")
+        monkeypatch.setattr(ingestion.json, "dump", partial_dump)
+        with pytest.raises(OSError):
+            ingestor.ingest("backend", str(corpus))
+        monkeypatch.undo()
+
+        documents_dir = os.path.join(ingestor._corpus_dir("backend"), "documents")
+        for name in os.listdir(documents_dir):
+            with open(os.path.join(documents_dir, name)) as f:
+                assert json.load(f)
+
+    def test_parses_in_process_pool(self, tmp_path, corpus):
+        ingestor = DocumentIngestor(cache_dir=str(tmp_path / "cache"), max_workers=2, loader_cls=TextLoader)
+
+        result = ingestor.ingest("backend", str(corpus))
+
+        assert len(result.parsed) == 2
+        assert all(entry["parse_seconds"] >= 0 for entry in ingestor.load_manifest("backend").values())
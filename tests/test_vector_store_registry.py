@@ -0,0 +1,53 @@
+import pytest
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+
+from backend.services.vector_index import build_vector_store_from_texts, choose_index_spec
+from src.services.vector_store_registry import RoleVectorStoreRegistry, estimate_store_size
+
+
+@pytest.fixture
+def registry():
+    loaded = []
+
+    def loader(role):
+        loaded.append(role)
+        return None if role == "missing" else {"role": role}
+
+    registry = RoleVectorStoreRegistry(loader=loader, memory_budget_bytes=250, size_fn=lambda store: 100)
+    registry.loaded = loaded
+    return registry
+
+
+class TestRoleVectorStoreRegistry:
+    def test_loads_role_on_first_use_only(self, registry):
+        assert registry.get("frontend") == {"role": "frontend"}
+        assert registry.get("frontend") == {"role": "frontend"}
+        assert registry.loaded == ["frontend"]
+
+    def test_evicts_least_recently_used_role_over_budget(self, registry):
+        registry.get("frontend")
+        registry.get("backend")
+        registry.get("frontend")
+        registry.get("qa")
+
+        assert "frontend" in registry
+        assert "backend" not in registry
+        assert registry.stats()["evictions"] == 1
+        assert registry.stats()["resident_bytes"] == 200
+
+    def test_missing_role_returns_none(self, registry):
+        assert registry.get("missing") is None
+        assert "missing" not in registry
+
+    def test_warm_loads_roles_in_background(self, registry):
+        registry.warm(["frontend", "backend"]).join()
+        assert registry.loaded == ["frontend", "backend"]
+
+
+def test_store_size_counts_heap_rerank_vectors():
+    texts = [f"Interview question {i}" for i in range(50)]
+    spec = choose_index_spec(50, "flat", quantization="sq8")
+    plain = build_vector_store_from_texts(texts, DeterministicFakeEmbedding(size=16), spec=spec)
+    reranked = build_vector_store_from_texts(texts, DeterministicFakeEmbedding(size=16), spec=spec, rerank=True)
+
+    assert estimate_store_size(reranked) - estimate_store_size(plain) == 50 * 16 * 4